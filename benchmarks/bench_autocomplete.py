@@ -0,0 +1,99 @@
+"""Build time, memory and lookup latency of the in-memory autocomplete index.
+
+Builds a PrefixIndex over synthetic titles and authors and reports the build
+time, the memory it holds beyond the source strings (tracemalloc) and the
+latency of prefix lookups and single writes.
+
+    python benchmarks/bench_autocomplete.py [--books 1000000] [--lookups 10000]
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+
+from bson import ObjectId
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from books.infraestructure.autocomplete import PrefixIndex  # noqa: E402
+
+WORDS = (
+    "amor guerra noche sombra ciudad río tiempo memoria jardín viaje casa "
+    "silencio fuego mar camino sueño luz historia último primer perdido"
+).split()
+
+
+def iter_suggestions(count: int, seed: int = 7) -> Iterator[tuple[str, str, str]]:
+    """Fresh strings per book, as read from Mongo, with ~20 books per author."""
+    rng = random.Random(seed)
+    authors = [f"Autor {rng.choice(WORDS).title()} {i}" for i in range(count // 20 + 1)]
+    for i in range(count):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5)))
+        # A new copy of the author, as each Mongo document carries its own.
+        author = "".join(rng.choice(authors))
+        yield str(ObjectId()), f"{title.title()} {i}", author
+
+
+def percentile(samples: list[float], p: int) -> float:
+    return sorted(samples)[min(len(samples) - 1, len(samples) * p // 100)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    suggestions = list(iter_suggestions(args.books))
+    index = PrefixIndex()
+    start = time.perf_counter()
+    index.build(iter(suggestions))
+    build_s = time.perf_counter() - start
+
+    rng = random.Random(11)
+    titles = [title for _, title, _ in rng.sample(suggestions, min(1000, args.books))]
+    prefixes = [title[: rng.randint(1, 6)] for title in titles]
+    del index, suggestions
+    gc.collect()
+
+    # Built again from fresh strings under tracemalloc (which slows allocations
+    # down), so the held memory includes the titles, authors and IDs.
+    tracemalloc.start()
+    index = PrefixIndex()
+    index.build(iter_suggestions(args.books))
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    lookups = []
+    for i in range(args.lookups):
+        start = time.perf_counter()
+        index.search(prefixes[i % len(prefixes)], args.limit)
+        lookups.append(time.perf_counter() - start)
+
+    writes = []
+    for book_id, title, author in iter_suggestions(1000, seed=13):
+        start = time.perf_counter()
+        index.add(book_id, title, author)
+        writes.append(time.perf_counter() - start)
+
+    print(f"   books: {args.books:,} ({len(index):,} indexed)")
+    print(f"   build: {build_s:8.2f} s")
+    print(f"  memory: {current / 2**20:8.1f} MiB held, {peak / 2**20:.1f} MiB peak")
+    print(
+        f"  lookup: {percentile(lookups, 50) * 1e6:8.1f} µs p50  "
+        f"{percentile(lookups, 99) * 1e6:.1f} µs p99 (top {args.limit})"
+    )
+    print(
+        f"   write: {percentile(writes, 50) * 1e6:8.1f} µs p50  "
+        f"{percentile(writes, 99) * 1e6:.1f} µs p99"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Per-book cost of turning Mongo documents into a JSON list response.
+
+Compares the previous read path (doc -> Book -> model_dump -> BookOutputDTO ->
+model_dump -> BookResponse -> JSONRenderer) with the current one
+(doc -> Book -> BookOutputDTO from attributes -> PydanticJSONRenderer), then
+the two validations of the current path (doc -> Book in the repository,
+Book -> BookOutputDTO in the service) against one pass from the documents
+straight to the DTO, which the layering rules out (see the README), then the
+renderer alone (DRF JSONRenderer vs PydanticJSONRenderer on the same page)
+and the parser on a bulk create body (DRF JSONParser vs PydanticJSONParser).
+
+    python benchmarks/bench_serialization.py [--books 1000] [--repeat 20]
+"""
+
+import argparse
+import io
+import os
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated
+
+from bson import ObjectId
+from pydantic import BeforeValidator, Field, TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "bookmanager.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from books.application.dto import mappers, output_dto  # noqa: E402
+from books.domain.models import Book  # noqa: E402
+from books.interfaces.api import serializers  # noqa: E402
+from books.interfaces.api.parsers import PydanticJSONParser  # noqa: E402
+from books.interfaces.api.renderers import PydanticJSONRenderer  # noqa: E402
+
+
+def make_docs(count: int) -> list[dict]:
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Book {i}",
+            "author": f"Author {i % 97}",
+            "published_date": datetime(1990 + i % 35, 1 + i % 12, 1 + i % 28),
+            "genre": "Programming",
+            "price": round(10 + (i % 140) * 1.07, 2),
+        }
+        for i in range(count)
+    ]
+
+
+class DocumentBookOutputDTO(output_dto.BookOutputDTO):
+    """BookOutputDTO read from a Mongo document, ``_id`` included."""
+
+    id: Annotated[str, BeforeValidator(str), Field(validation_alias="_id")]
+
+
+DOCUMENT_LIST_ADAPTER = TypeAdapter(list[DocumentBookOutputDTO])
+
+
+def map_book(doc: dict) -> Book:
+    return Book(id=str(doc["_id"]), **{k: v for k, v in doc.items() if k != "_id"})
+
+
+def previous_path(docs: list[dict]) -> bytes:
+    books = [map_book(doc) for doc in docs]
+    dtos = [output_dto.BookOutputDTO.model_validate(b.model_dump()) for b in books]
+    data = serializers.BookResponse([d.model_dump() for d in dtos], many=True).data
+    return JSONRenderer().render({"results": data})
+
+
+def current_path(docs: list[dict]) -> bytes:
+    books = [map_book(doc) for doc in docs]
+    dtos = mappers.map_books_to_output_dto(books=books)
+    return PydanticJSONRenderer().render({"results": dtos})
+
+
+def render_page(renderer_class: type, page: dict) -> bytes:
+    return renderer_class().render(page)
+
+
+def parse_body(parser_class: type, body: bytes):
+    return parser_class().parse(io.BytesIO(body), parser_context={})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    docs = make_docs(args.books)
+    books = [map_book(doc) for doc in docs]
+    dtos = mappers.map_books_to_output_dto(books=books)
+    page = {"count": args.books, "results": dtos}
+    # DRF's encoder cannot take pydantic models, so it gets the dumped dicts.
+    dumped_page = {"count": args.books, "results": [d.model_dump() for d in dtos]}
+    body = current_path(docs)
+    sections = {
+        "doc -> response": {
+            "previous": lambda: previous_path(docs),
+            "current": lambda: current_path(docs),
+        },
+        "validation": {
+            "doc->Book": lambda: [map_book(doc) for doc in docs],
+            "Book->DTO": lambda: mappers.map_books_to_output_dto(books=books),
+            "one pass": lambda: DOCUMENT_LIST_ADAPTER.validate_python(docs),
+        },
+        "render page": {
+            "drf": lambda: render_page(JSONRenderer, dumped_page),
+            "pydantic": lambda: render_page(PydanticJSONRenderer, page),
+        },
+        "parse body": {
+            "drf": lambda: parse_body(JSONParser, body),
+            "pydantic": lambda: parse_body(PydanticJSONParser, body),
+        },
+    }
+    for section, paths in sections.items():
+        print(f"{section}:")
+        for name, path in paths.items():
+            best = min(timeit.repeat(path, number=1, repeat=args.repeat))
+            per_book_us = best / args.books * 1_000_000
+            print(
+                f"{name:>10}: {best * 1000:8.2f} ms/page  {per_book_us:6.2f} µs/book"
+                f"  {args.books / best:12,.0f} books/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
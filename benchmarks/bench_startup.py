@@ -0,0 +1,91 @@
+"""Cold start of a worker: time to set up Django and import the URLconf.
+
+Starts fresh interpreters with ``-X importtime`` that run ``django.setup()``
+and import ``bookmanager.urls`` (what a gunicorn worker does before its first
+request), then reports the wall time, the heaviest imports and whether the
+median stays within the budget.
+
+    python benchmarks/bench_startup.py [--runs 5] [--top 15] [--budget-ms 1500]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+WORKER_START = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_worker_start() -> tuple[float, str]:
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": "bookmanager.settings"}
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(ROOT), env.get("PYTHONPATH")])
+    )
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", WORKER_START],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return time.perf_counter() - start, result.stderr
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """(module, self µs, cumulative µs, nesting depth) per imported module."""
+    imports = []
+    for line in stderr.splitlines():
+        if match := IMPORTTIME_LINE.match(line):
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return imports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    args = parser.parse_args()
+
+    run_worker_start()  # Warms the bytecode and filesystem caches.
+    walls, imports = [], []
+    for _ in range(args.runs):
+        wall, stderr = run_worker_start()
+        walls.append(wall)
+        imports = parse_importtime(stderr)
+
+    total_us = sum(cumulative for _, _, cumulative, depth in imports if depth == 0)
+    project_us = sum(
+        self_us
+        for module, self_us, _, _ in imports
+        if module.split(".")[0] in ("books", "bookmanager")
+    )
+    wall_ms = statistics.median(walls) * 1000
+    print(
+        f"    wall: {wall_ms:8.1f} ms median of {args.runs} (budget {args.budget_ms:.0f})"
+    )
+    print(f" imports: {total_us / 1000:8.1f} ms, {len(imports)} modules")
+    print(f" project: {project_us / 1000:8.1f} ms self time in books/ and bookmanager/")
+    print(f"\n  top {args.top} imports by cumulative time (ms):")
+    top = sorted(imports, key=lambda item: item[2], reverse=True)[: args.top]
+    for module, self_us, cumulative_us, _ in top:
+        print(f"  {cumulative_us / 1000:8.1f}  {self_us / 1000:6.1f} self  {module}")
+
+    if wall_ms > args.budget_ms:
+        sys.exit(f"\nStartup over budget: {wall_ms:.0f} ms > {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "bookmanager.settings")
 
 application = get_asgi_application()
+
+# The ASGI lifespan opens and closes each worker's async MongoDB client and
+# starts building its autocomplete index.
+from books.interfaces.lifespan import with_lifespan  # noqa: E402
+
+application = with_lifespan(application)
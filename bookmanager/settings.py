@@ -68,15 +68,97 @@ DATABASES = {
     }
 }
 
+# ------------------------------
+# MONGODB
+# ------------------------------
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://mongo:27017")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "bookmanager")
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", 100)),
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", 0)),
+    "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 300000)),
+    "waitQueueTimeoutMS": int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 2000)),
+    "serverSelectionTimeoutMS": int(
+        os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000)
+    ),
+    "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", 5000)),
+    "socketTimeoutMS": int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", 10000)),
+}
+
+# ------------------------------
+# BOOKS
+# ------------------------------
+BOOKS_EXPORT_BATCH_SIZE = int(os.getenv("BOOKS_EXPORT_BATCH_SIZE", 1000))
+# /api/books/changes/ leaves out the last seconds of changes, in case a write
+# stamped then has not committed yet; covers write latency and clock skew.
+BOOKS_CHANGES_SETTLE_SECONDS = float(os.getenv("BOOKS_CHANGES_SETTLE_SECONDS", 5))
+BOOKS_BULK_MAX_ITEMS = int(os.getenv("BOOKS_BULK_MAX_ITEMS", 1000))
+# Authenticates book requests from the JWT claims alone instead of loading
+# the user from the database each time; revoked tokens are listed in Mongo and
+# each worker reloads that list every BOOKS_AUTH_REVOCATION_REFRESH_SECONDS.
+BOOKS_AUTH_STATELESS = os.getenv("BOOKS_AUTH_STATELESS", "False").lower() in (
+    "1",
+    "true",
+)
+BOOKS_AUTH_REVOCATION_REFRESH_SECONDS = float(
+    os.getenv("BOOKS_AUTH_REVOCATION_REFRESH_SECONDS", 30)
+)
+# How long a create response is replayed for retries with its Idempotency-Key.
+BOOKS_IDEMPOTENCY_TTL_SECONDS = float(
+    os.getenv("BOOKS_IDEMPOTENCY_TTL_SECONDS", 24 * 60 * 60)
+)
+# Directory with the OpenAPI schema written by `manage.py build_schema`; when
+# empty (or missing the files) each worker generates it on its first request.
+BOOKS_SCHEMA_DIR = os.getenv("BOOKS_SCHEMA_DIR", "")
+BOOKS_BATCH_MAX_IDS = int(os.getenv("BOOKS_BATCH_MAX_IDS", 500))
+# Searches count at most this many matches, which also bounds the last page.
+BOOKS_SEARCH_MAX_RESULTS = int(os.getenv("BOOKS_SEARCH_MAX_RESULTS", 1000))
+# Serves /api/books/autocomplete/ from an in-process prefix index per worker,
+# rebuilt in the background to pick up writes made by other workers.
+BOOKS_AUTOCOMPLETE_ENABLED = os.getenv(
+    "BOOKS_AUTOCOMPLETE_ENABLED", "False"
+).lower() in ("1", "true")
+BOOKS_AUTOCOMPLETE_REFRESH_SECONDS = float(
+    os.getenv("BOOKS_AUTOCOMPLETE_REFRESH_SECONDS", 300)
+)
+# Serves list/detail/average-price with async views and the PyMongo async API.
+# Requires an ASGI server, e.g. `uvicorn bookmanager.asgi:application`.
+BOOKS_ASYNC_VIEWS = os.getenv("BOOKS_ASYNC_VIEWS", "False").lower() in ("1", "true")
+# Read-through cache for book detail lookups, used by the sync and async views.
+# The in-process tier is per worker; BOOKS_CACHE_BACKEND names an entry of
+# CACHES shared by all workers.
+BOOKS_CACHE_ENABLED = os.getenv("BOOKS_CACHE_ENABLED", "False").lower() in ("1", "true")
+BOOKS_CACHE_MAX_ENTRIES = int(os.getenv("BOOKS_CACHE_MAX_ENTRIES", 1024))
+BOOKS_CACHE_TTL_SECONDS = float(os.getenv("BOOKS_CACHE_TTL_SECONDS", 30))
+BOOKS_CACHE_BACKEND = os.getenv("BOOKS_CACHE_BACKEND", "")
+BOOKS_CACHE_BACKEND_TTL_SECONDS = float(
+    os.getenv("BOOKS_CACHE_BACKEND_TTL_SECONDS", 300)
+)
+
 # ------------------------------
 # CONFIG REST FRAMEWORK / JWT
 # ------------------------------
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        (
+            "books.interfaces.api.authentication.StatelessJWTAuthentication"
+            if BOOKS_AUTH_STATELESS
+            else "rest_framework_simplejwt.authentication.JWTAuthentication"
+        ),
         # "rest_framework.authentication.SessionAuthentication",
     ),
+    # JSON is encoded and decoded by pydantic-core, which also handles the
+    # output DTOs, dates and ObjectIds without a DRF serializer pass.
+    "DEFAULT_RENDERER_CLASSES": (
+        "books.interfaces.api.renderers.PydanticJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "books.interfaces.api.parsers.PydanticJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "EXCEPTION_HANDLER": "books.interfaces.api.exceptions.custom_exception_handler",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
@@ -103,6 +185,8 @@ SPECTACULAR_SETTINGS = {
     "SWAGGER_UI_SETTINGS": {
         "deepLinking": True,
     },
+    # Loads the views' OpenAPI metadata only when a schema is generated.
+    "PREPROCESSING_HOOKS": ["books.interfaces.api.schema.register"],
 }
 
 
@@ -15,11 +15,28 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from functools import cache
+
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from django.utils.module_loading import import_string
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+
+def lazy_view(view_path: str, **initkwargs):
+    """A class-based view imported on its first request instead of at startup,
+    for views only a few requests use (drf-spectacular's, ~100 ms to import)."""
+
+    @cache
+    def load():
+        return import_string(view_path).as_view(**initkwargs)
+
+    def view(request, *args, **kwargs):
+        return load()(request, *args, **kwargs)
+
+    return view
+
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
@@ -27,10 +44,14 @@ urlpatterns = [
     # Apps
     path("api/books/", include("books.interfaces.api.urls")),
     # Swagger / ReDoc
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path(
+        "api/schema/",
+        lazy_view("books.interfaces.api.openapi.CachedSpectacularAPIView"),
+        name="schema",
+    ),
     path(
         "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
+        lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
         name="swagger-ui",
     ),
 ]
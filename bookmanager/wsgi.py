@@ -9,8 +9,18 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "bookmanager.settings")
 
 application = get_wsgi_application()
+
+# Under WSGI each async view call would run on a new event loop, with a new
+# MongoDB connection pool per request.
+if settings.BOOKS_ASYNC_VIEWS:
+    raise ImproperlyConfigured(
+        "BOOKS_ASYNC_VIEWS requiere un servidor ASGI, "
+        "p. ej. uvicorn bookmanager.asgi:application."
+    )
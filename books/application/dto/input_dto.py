@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Any
 
 from pydantic import BaseModel
 
@@ -21,3 +22,68 @@ class UpdateBookInputDTO(BaseModel):
     published_date: datetime | None = None
     genre: str | None = None
     price: float | None = None
+
+
+class BookFiltersInputDTO(BaseModel):
+    author: str | None = None
+    genre: str | None = None
+    min_price: float | None = None
+    max_price: float | None = None
+    published_year: int | None = None
+
+
+class ListBooksInputDTO(BookFiltersInputDTO):
+    page: int = 1
+    page_size: int = 10
+    sort: list[str] = []
+    fields: list[str] | None = None
+
+
+class SearchBooksInputDTO(BaseModel):
+    q: str
+    mode: str = "text"
+    page: int = 1
+    page_size: int = 10
+    max_results: int = 1000
+
+
+class SuggestBooksInputDTO(BaseModel):
+    q: str
+    limit: int = 10
+
+
+class ExportBooksInputDTO(BookFiltersInputDTO):
+    batch_size: int = 1000
+
+
+class BookChangesInputDTO(BaseModel):
+    since: datetime | None = None
+    after_id: str | None = None
+    batch_size: int = 1000
+    settle_seconds: float = 5
+
+
+class BookCursorInputDTO(BaseModel):
+    sort_value: Any = None
+    id: str
+
+
+class ListBooksCursorInputDTO(BookFiltersInputDTO):
+    page_size: int = 10
+    sort_field: str = "id"
+    descending: bool = False
+    cursor: BookCursorInputDTO | None = None
+    backwards: bool = False
+    fields: list[str] | None = None
+
+
+class PriceStatsInputDTO(BaseModel):
+    year: int | None = None
+    genre: str | None = None
+
+
+class PriceAnalyticsInputDTO(BaseModel):
+    from_year: int
+    to_year: int
+    group_by: str | None = None
+    percentiles: list[int] = [50, 90, 95]
@@ -1,15 +1,84 @@
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any
 
+from pydantic import BaseModel, TypeAdapter
+
 from books.application.dto import input_dto, output_dto
-from books.domain.models import Book
+from books.domain import exceptions
+from books.domain.models import (
+    Book,
+    BookChange,
+    BookChangesQuery,
+    BookFilters,
+    BookKeysetQuery,
+    BookQuery,
+    BookSearchMode,
+    BookSearchQuery,
+    BulkItemResult,
+    BulkItemStatus,
+    PriceAnalytics,
+    PriceAnalyticsQuery,
+    PriceStats,
+    PriceStatsDimension,
+    PriceSummary,
+)
+
+# Output DTOs are validated straight from the Book attributes; going through
+# model_dump() first would build and re-validate a dict per book.
+_BOOK_OUTPUT_LIST_ADAPTER = TypeAdapter(list[output_dto.BookOutputDTO])
+
+
+@lru_cache(maxsize=64)
+def _partial_book_output_list_adapter(fields: frozenset[str]) -> TypeAdapter:
+    return TypeAdapter(list[output_dto.partial_book_output_dto(fields)])
+
 
+def map_books_to_output_dto(
+    *, books: list[Book], fields: list[str] | None = None
+) -> list[BaseModel]:
+    if fields is None:
+        return _BOOK_OUTPUT_LIST_ADAPTER.validate_python(books, from_attributes=True)
+    return _partial_book_output_list_adapter(frozenset(fields)).validate_python(
+        books, from_attributes=True
+    )
 
-def map_books_to_output_dto(*, books: list[Book]) -> list[output_dto.BookOutputDTO]:
-    return [output_dto.BookOutputDTO.model_validate(b.model_dump()) for b in books]
 
+def map_book_to_output_dto(*, book: Book, fields: list[str] | None = None) -> BaseModel:
+    if fields is None:
+        return output_dto.BookOutputDTO.model_validate(book, from_attributes=True)
+    return output_dto.partial_book_output_dto(frozenset(fields)).model_validate(
+        book, from_attributes=True
+    )
 
-def map_book_to_output_dto(*, book: Book) -> output_dto.BookOutputDTO:
-    return output_dto.BookOutputDTO(**book.model_dump())
+
+def map_books_to_batch_output_dto(
+    *, books: list[Book], book_ids: list[str]
+) -> output_dto.BookBatchOutputDTO:
+    """Lays the found books out in request order, once per distinct ID."""
+    found = {book.id: book for book in books}
+    ordered, missing_ids = [], []
+    for book_id in dict.fromkeys(book_ids):
+        if book_id in found:
+            ordered.append(found[book_id])
+        else:
+            missing_ids.append(book_id)
+    return output_dto.BookBatchOutputDTO(
+        results=map_books_to_output_dto(books=ordered), missing_ids=missing_ids
+    )
+
+
+def map_books_to_suggestions_output_dto(
+    *, books: list[Book]
+) -> output_dto.BookSuggestionsOutputDTO:
+    return output_dto.BookSuggestionsOutputDTO(
+        results=[
+            output_dto.BookSuggestionOutputDTO.model_validate(
+                book, from_attributes=True
+            )
+            for book in books
+        ]
+    )
 
 
 def map_create_book_input_dto_to_book(
@@ -19,7 +88,7 @@ def map_create_book_input_dto_to_book(
 
 
 def map_create_book_to_output_dto(*, book: Book) -> output_dto.CreateBookOutputDTO:
-    return output_dto.CreateBookOutputDTO.model_validate(book.model_dump())
+    return output_dto.CreateBookOutputDTO.model_validate(book, from_attributes=True)
 
 
 def map_update_book_input_dto_to_data_book(
@@ -29,4 +98,185 @@ def map_update_book_input_dto_to_data_book(
 
 
 def map_update_book_to_output_dto(*, book: Book) -> output_dto.UpdateBookOutputDTO:
-    return output_dto.UpdateBookOutputDTO.model_validate(book.model_dump())
+    return output_dto.UpdateBookOutputDTO.model_validate(book, from_attributes=True)
+
+
+def map_list_books_input_dto_to_query(
+    *, list_books_input_dto: input_dto.ListBooksInputDTO
+) -> BookQuery:
+    return BookQuery(
+        filters=_map_filters(input_dto=list_books_input_dto),
+        sort=list_books_input_dto.sort,
+        skip=(list_books_input_dto.page - 1) * list_books_input_dto.page_size,
+        limit=list_books_input_dto.page_size,
+        fields=list_books_input_dto.fields,
+    )
+
+
+def map_search_books_input_dto_to_query(
+    *, search_books_input_dto: input_dto.SearchBooksInputDTO
+) -> BookSearchQuery:
+    return BookSearchQuery(
+        text=search_books_input_dto.q,
+        mode=BookSearchMode(search_books_input_dto.mode),
+        skip=(search_books_input_dto.page - 1) * search_books_input_dto.page_size,
+        limit=search_books_input_dto.page_size,
+    )
+
+
+def map_export_books_input_dto_to_filters(
+    *, export_books_input_dto: input_dto.ExportBooksInputDTO
+) -> BookFilters:
+    return _map_filters(input_dto=export_books_input_dto)
+
+
+def map_book_changes_input_dto_to_query(
+    *, book_changes_input_dto: input_dto.BookChangesInputDTO, now: datetime
+) -> BookChangesQuery:
+    # Writes stamp their documents just before they commit, so the window
+    # stops settle_seconds ago: a change dated earlier is committed by then
+    # and cannot appear behind a position already handed out.
+    return BookChangesQuery(
+        since=book_changes_input_dto.since,
+        after_id=book_changes_input_dto.after_id,
+        until=now - timedelta(seconds=book_changes_input_dto.settle_seconds),
+        batch_size=book_changes_input_dto.batch_size,
+    )
+
+
+def map_book_change_to_output_dto(
+    *, change: BookChange
+) -> output_dto.BookChangeOutputDTO:
+    return output_dto.BookChangeOutputDTO.model_validate(change, from_attributes=True)
+
+
+def map_list_books_cursor_input_dto_to_query(
+    *, list_books_cursor_input_dto: input_dto.ListBooksCursorInputDTO
+) -> BookKeysetQuery:
+    cursor = list_books_cursor_input_dto.cursor
+    fields = list_books_cursor_input_dto.fields
+    if fields is not None:
+        # The next/previous cursors are built from the sort key.
+        fields = [*fields, list_books_cursor_input_dto.sort_field]
+    return BookKeysetQuery(
+        filters=_map_filters(input_dto=list_books_cursor_input_dto),
+        sort_field=list_books_cursor_input_dto.sort_field,
+        descending=list_books_cursor_input_dto.descending,
+        after_value=cursor.sort_value if cursor else None,
+        after_id=cursor.id if cursor else None,
+        backwards=list_books_cursor_input_dto.backwards,
+        # One extra row tells whether another page exists.
+        limit=list_books_cursor_input_dto.page_size + 1,
+        fields=fields,
+    )
+
+
+def map_book_to_cursor_output_dto(
+    *, book: Book, sort_field: str
+) -> output_dto.BookCursorOutputDTO:
+    return output_dto.BookCursorOutputDTO(
+        sort_value=getattr(book, sort_field), id=book.id
+    )
+
+
+def map_keyset_books_to_cursor_page_output_dto(
+    *, books: list[Book], list_books_cursor_input_dto: input_dto.ListBooksCursorInputDTO
+) -> output_dto.BookCursorPageOutputDTO:
+    """Builds a cursor page from the ``page_size + 1`` books read by the query."""
+    dto = list_books_cursor_input_dto
+    has_more = len(books) > dto.page_size
+    books = books[: dto.page_size]
+    if dto.backwards:
+        books.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, dto.cursor is not None
+
+    first = books[0] if books and has_previous else None
+    last = books[-1] if books and has_next else None
+    return output_dto.BookCursorPageOutputDTO(
+        results=map_books_to_output_dto(books=books, fields=dto.fields),
+        next_cursor=(
+            map_book_to_cursor_output_dto(book=last, sort_field=dto.sort_field)
+            if last
+            else None
+        ),
+        previous_cursor=(
+            map_book_to_cursor_output_dto(book=first, sort_field=dto.sort_field)
+            if first
+            else None
+        ),
+    )
+
+
+def map_bulk_results_to_output_dto(
+    *, results: list[BulkItemResult], titles: list[str | None] | None = None
+) -> list[output_dto.BulkItemOutputDTO]:
+    output = []
+    for result in results:
+        detail = result.detail
+        if result.status == BulkItemStatus.DUPLICATE_TITLE and titles:
+            detail = exceptions.BookAlreadyExistsError(
+                title=titles[result.index]
+            ).message
+        elif result.status == BulkItemStatus.NOT_FOUND:
+            detail = exceptions.BookNotFoundError(book_id=result.id).message
+        output.append(
+            output_dto.BulkItemOutputDTO(
+                index=result.index,
+                status=result.status.value,
+                id=result.id,
+                detail=detail,
+            )
+        )
+    return output
+
+
+def map_price_stats_input_dto_to_group(
+    *, price_stats_input_dto: input_dto.PriceStatsInputDTO
+) -> tuple[PriceStatsDimension, int | str]:
+    if price_stats_input_dto.year is not None:
+        return PriceStatsDimension.YEAR, price_stats_input_dto.year
+    return PriceStatsDimension.GENRE, price_stats_input_dto.genre
+
+
+def map_price_stats_to_output_dto(
+    *, price_stats: PriceStats
+) -> output_dto.PriceStatsOutputDTO:
+    return output_dto.PriceStatsOutputDTO(
+        average_price=price_stats.average_price,
+        count=price_stats.count,
+        min_price=price_stats.min_price,
+        max_price=price_stats.max_price,
+    )
+
+
+def map_price_analytics_input_dto_to_query(
+    *, price_analytics_input_dto: input_dto.PriceAnalyticsInputDTO
+) -> PriceAnalyticsQuery:
+    return PriceAnalyticsQuery(**price_analytics_input_dto.model_dump())
+
+
+def map_price_analytics_to_output_dto(
+    *,
+    price_analytics: PriceAnalytics,
+    price_analytics_input_dto: input_dto.PriceAnalyticsInputDTO,
+) -> output_dto.PriceAnalyticsOutputDTO:
+    return output_dto.PriceAnalyticsOutputDTO(
+        from_year=price_analytics_input_dto.from_year,
+        to_year=price_analytics_input_dto.to_year,
+        group_by=price_analytics_input_dto.group_by,
+        series=[_map_price_summary(summary=s) for s in price_analytics.series],
+        totals=[_map_price_summary(summary=s) for s in price_analytics.totals],
+    )
+
+
+def _map_price_summary(*, summary: PriceSummary) -> output_dto.PriceSummaryOutputDTO:
+    return output_dto.PriceSummaryOutputDTO(
+        **summary.model_dump(exclude={"percentiles"}),
+        percentiles={f"p{p}": value for p, value in summary.percentiles.items()},
+    )
+
+
+def _map_filters(*, input_dto: input_dto.BookFiltersInputDTO) -> BookFilters:
+    return BookFilters(**input_dto.model_dump(include=set(BookFilters.model_fields)))
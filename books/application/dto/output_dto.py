@@ -1,6 +1,13 @@
-from datetime import date
+from datetime import UTC, date, datetime
+from functools import lru_cache
+from typing import Annotated, Any
 
-from pydantic import BaseModel
+from pydantic import AfterValidator, BaseModel, SerializeAsAny, create_model
+
+# Mongo returns naive UTC datetimes; they are rendered with their offset.
+UTCDateTime = Annotated[
+    datetime, AfterValidator(lambda value: value.replace(tzinfo=value.tzinfo or UTC))
+]
 
 
 class BookOutputDTO(BaseModel):
@@ -10,12 +17,105 @@ class BookOutputDTO(BaseModel):
     published_date: date
     genre: str
     price: float
+    # None only for books written before versions were introduced.
+    version: int | None = None
+    created_at: UTCDateTime | None = None
+    updated_at: UTCDateTime | None = None
 
     class Config:
         from_attributes = True
 
 
+# A BookOutputDTO or one of its sparse fieldsets, serialized by runtime type.
+BookResultDTO = SerializeAsAny[BaseModel]
+
+
+@lru_cache(maxsize=64)
+def partial_book_output_dto(fields: frozenset[str]) -> type[BaseModel]:
+    """BookOutputDTO reduced to ``fields``; ``id`` and ``version`` are always
+    kept."""
+    return create_model(
+        "PartialBookOutputDTO",
+        __config__=BookOutputDTO.model_config,
+        **{
+            name: (field.annotation, field.default)
+            for name, field in BookOutputDTO.model_fields.items()
+            if name in ("id", "version") or name in fields
+        },
+    )
+
+
+class BookChangeOutputDTO(BaseModel):
+    type: str
+    id: str
+    changed_at: UTCDateTime
+    book: BookOutputDTO | None = None
+
+
 class CreateBookOutputDTO(BookOutputDTO): ...
 
 
 class UpdateBookOutputDTO(BookOutputDTO): ...
+
+
+class BookPageOutputDTO(BaseModel):
+    count: int
+    results: list[BookResultDTO]
+
+
+class BookCursorOutputDTO(BaseModel):
+    sort_value: Any = None
+    id: str
+
+
+class BookCursorPageOutputDTO(BaseModel):
+    results: list[BookResultDTO]
+    next_cursor: BookCursorOutputDTO | None = None
+    previous_cursor: BookCursorOutputDTO | None = None
+
+
+class BulkItemOutputDTO(BaseModel):
+    index: int
+    status: str
+    id: str | None = None
+    detail: str | None = None
+
+
+class PriceStatsOutputDTO(BaseModel):
+    average_price: float
+    count: int
+    min_price: float
+    max_price: float
+
+
+class PriceSummaryOutputDTO(BaseModel):
+    year: int | None = None
+    group: str | None = None
+    count: int
+    average_price: float
+    min_price: float
+    max_price: float
+    percentiles: dict[str, float]
+
+
+class PriceAnalyticsOutputDTO(BaseModel):
+    from_year: int
+    to_year: int
+    group_by: str | None = None
+    series: list[PriceSummaryOutputDTO]
+    totals: list[PriceSummaryOutputDTO]
+
+
+class BookSuggestionOutputDTO(BaseModel):
+    id: str
+    title: str | None
+    author: str | None
+
+
+class BookSuggestionsOutputDTO(BaseModel):
+    results: list[BookSuggestionOutputDTO]
+
+
+class BookBatchOutputDTO(BaseModel):
+    results: list[BookOutputDTO]
+    missing_ids: list[str]
@@ -1,21 +1,99 @@
+from collections.abc import Iterator
+from datetime import UTC, datetime
+
 from books.application.dto import input_dto, mappers, output_dto
 from books.domain import exceptions
-from books.domain.ports import BookRepository
+from books.domain.ports import AsyncBookRepository, BookRepository
 
 
 class BookService:
     def __init__(self, repository: BookRepository):
         self.repository = repository
 
-    def list_books(self) -> list[output_dto.BookOutputDTO]:
-        return mappers.map_books_to_output_dto(books=self.repository.list_books())
+    def list_books(
+        self, list_books_input_dto: input_dto.ListBooksInputDTO
+    ) -> output_dto.BookPageOutputDTO:
+        query = mappers.map_list_books_input_dto_to_query(
+            list_books_input_dto=list_books_input_dto
+        )
+        count = self.repository.count_books(filters=query.filters)
+        books = self.repository.list_books(query=query) if count > query.skip else []
+        return output_dto.BookPageOutputDTO(
+            count=count,
+            results=mappers.map_books_to_output_dto(books=books, fields=query.fields),
+        )
+
+    def search_books(
+        self, search_books_input_dto: input_dto.SearchBooksInputDTO
+    ) -> output_dto.BookPageOutputDTO:
+        query = mappers.map_search_books_input_dto_to_query(
+            search_books_input_dto=search_books_input_dto
+        )
+        count = self.repository.count_search_results(
+            query=query, limit=search_books_input_dto.max_results
+        )
+        books = self.repository.search_books(query=query) if count > query.skip else []
+        return output_dto.BookPageOutputDTO(
+            count=count, results=mappers.map_books_to_output_dto(books=books)
+        )
 
-    def get_book(self, book_id: str) -> output_dto.BookOutputDTO:
-        book = self.repository.get_book(book_id=book_id)
+    def list_books_by_cursor(
+        self, list_books_cursor_input_dto: input_dto.ListBooksCursorInputDTO
+    ) -> output_dto.BookCursorPageOutputDTO:
+        dto = list_books_cursor_input_dto
+        query = mappers.map_list_books_cursor_input_dto_to_query(
+            list_books_cursor_input_dto=dto
+        )
+        books = self.repository.list_books_after(query=query)
+        return mappers.map_keyset_books_to_cursor_page_output_dto(
+            books=books, list_books_cursor_input_dto=dto
+        )
+
+    def export_books(
+        self, export_books_input_dto: input_dto.ExportBooksInputDTO
+    ) -> Iterator[output_dto.BookOutputDTO]:
+        filters = mappers.map_export_books_input_dto_to_filters(
+            export_books_input_dto=export_books_input_dto
+        )
+        books = self.repository.iter_books(
+            filters=filters, batch_size=export_books_input_dto.batch_size
+        )
+        for book in books:
+            yield mappers.map_book_to_output_dto(book=book)
+
+    def list_changes(
+        self, book_changes_input_dto: input_dto.BookChangesInputDTO
+    ) -> Iterator[output_dto.BookChangeOutputDTO]:
+        query = mappers.map_book_changes_input_dto_to_query(
+            book_changes_input_dto=book_changes_input_dto,
+            now=datetime.now(UTC).replace(tzinfo=None),
+        )
+        for change in self.repository.iter_changes(query=query):
+            yield mappers.map_book_change_to_output_dto(change=change)
+
+    def get_book(
+        self, book_id: str, fields: list[str] | None = None
+    ) -> output_dto.BookOutputDTO:
+        book = self.repository.get_book(book_id=book_id, fields=fields)
 
         if book is None:
             raise exceptions.BookNotFoundError(book_id=book_id)
-        return mappers.map_book_to_output_dto(book=book)
+        return mappers.map_book_to_output_dto(book=book, fields=fields)
+
+    def get_version(self) -> int:
+        return self.repository.get_version()
+
+    def get_books(self, book_ids: list[str]) -> output_dto.BookBatchOutputDTO:
+        books = self.repository.get_books(book_ids)
+        return mappers.map_books_to_batch_output_dto(books=books, book_ids=book_ids)
+
+    def suggest_books(
+        self, suggest_books_input_dto: input_dto.SuggestBooksInputDTO
+    ) -> output_dto.BookSuggestionsOutputDTO:
+        books = self.repository.suggest_books(
+            prefix=suggest_books_input_dto.q, limit=suggest_books_input_dto.limit
+        )
+        return mappers.map_books_to_suggestions_output_dto(books=books)
 
     def create_book(
         self, create_book_input_dto: input_dto.CreateBookInputDTO
@@ -31,13 +109,157 @@ class BookService:
             raise exceptions.BookAlreadyExistsError(title=create_book_input_dto.title)
 
     def update_book(
-        self, update_book_input_dto: input_dto.UpdateBookInputDTO
+        self,
+        update_book_input_dto: input_dto.UpdateBookInputDTO,
+        expected_version: int | None = None,
+    ) -> output_dto.UpdateBookOutputDTO | None:
+        data_book = mappers.map_update_book_input_dto_to_data_book(
+            update_book_input_dto=update_book_input_dto
+        )
+        try:
+            updated_book = self.repository.update_book(
+                data=data_book, expected_version=expected_version
+            )
+        except ValueError:
+            raise exceptions.BookAlreadyExistsError(title=update_book_input_dto.title)
+
+        if updated_book is None:
+            raise exceptions.BookNotFoundError(book_id=update_book_input_dto.id)
+        return mappers.map_update_book_to_output_dto(book=updated_book)
+
+    def delete_book(self, book_id: str, expected_version: int | None = None) -> None:
+        book_exists = self.repository.delete_book(
+            book_id=book_id, expected_version=expected_version
+        )
+        if not book_exists:
+            raise exceptions.BookNotFoundError(book_id=book_id)
+
+    def bulk_create_books(
+        self, create_book_input_dtos: list[input_dto.CreateBookInputDTO]
+    ) -> list[output_dto.BulkItemOutputDTO]:
+        books = [
+            mappers.map_create_book_input_dto_to_book(create_book_input_dto=dto)
+            for dto in create_book_input_dtos
+        ]
+        results = self.repository.bulk_create(books)
+        return mappers.map_bulk_results_to_output_dto(
+            results=results, titles=[book.title for book in books]
+        )
+
+    def bulk_update_books(
+        self, update_book_input_dtos: list[input_dto.UpdateBookInputDTO]
+    ) -> list[output_dto.BulkItemOutputDTO]:
+        items = [
+            mappers.map_update_book_input_dto_to_data_book(update_book_input_dto=dto)
+            for dto in update_book_input_dtos
+        ]
+        results = self.repository.bulk_update(items)
+        return mappers.map_bulk_results_to_output_dto(
+            results=results, titles=[item.get("title") for item in items]
+        )
+
+    def bulk_delete_books(
+        self, book_ids: list[str]
+    ) -> list[output_dto.BulkItemOutputDTO]:
+        results = self.repository.bulk_delete(book_ids)
+        return mappers.map_bulk_results_to_output_dto(results=results)
+
+    def get_price_stats(
+        self, price_stats_input_dto: input_dto.PriceStatsInputDTO
+    ) -> output_dto.PriceStatsOutputDTO:
+        dimension, key = mappers.map_price_stats_input_dto_to_group(
+            price_stats_input_dto=price_stats_input_dto
+        )
+        price_stats = self.repository.get_price_stats(dimension, key)
+        if price_stats is None:
+            raise exceptions.BooksArentNotFound()
+        return mappers.map_price_stats_to_output_dto(price_stats=price_stats)
+
+    def get_price_analytics(
+        self, price_analytics_input_dto: input_dto.PriceAnalyticsInputDTO
+    ) -> output_dto.PriceAnalyticsOutputDTO:
+        query = mappers.map_price_analytics_input_dto_to_query(
+            price_analytics_input_dto=price_analytics_input_dto
+        )
+        price_analytics = self.repository.get_price_analytics(query)
+        return mappers.map_price_analytics_to_output_dto(
+            price_analytics=price_analytics,
+            price_analytics_input_dto=price_analytics_input_dto,
+        )
+
+    def rebuild_price_stats(self) -> int:
+        return self.repository.rebuild_price_stats()
+
+
+class AsyncBookService:
+    """Coroutine counterpart of ``BookService`` used by the async views."""
+
+    def __init__(self, repository: AsyncBookRepository):
+        self.repository = repository
+
+    async def list_books(
+        self, list_books_input_dto: input_dto.ListBooksInputDTO
+    ) -> output_dto.BookPageOutputDTO:
+        query = mappers.map_list_books_input_dto_to_query(
+            list_books_input_dto=list_books_input_dto
+        )
+        count = await self.repository.count_books(filters=query.filters)
+        books = (
+            await self.repository.list_books(query=query) if count > query.skip else []
+        )
+        return output_dto.BookPageOutputDTO(
+            count=count,
+            results=mappers.map_books_to_output_dto(books=books, fields=query.fields),
+        )
+
+    async def list_books_by_cursor(
+        self, list_books_cursor_input_dto: input_dto.ListBooksCursorInputDTO
+    ) -> output_dto.BookCursorPageOutputDTO:
+        query = mappers.map_list_books_cursor_input_dto_to_query(
+            list_books_cursor_input_dto=list_books_cursor_input_dto
+        )
+        books = await self.repository.list_books_after(query=query)
+        return mappers.map_keyset_books_to_cursor_page_output_dto(
+            books=books, list_books_cursor_input_dto=list_books_cursor_input_dto
+        )
+
+    async def get_version(self) -> int:
+        return await self.repository.get_version()
+
+    async def get_book(
+        self, book_id: str, fields: list[str] | None = None
+    ) -> output_dto.BookOutputDTO:
+        book = await self.repository.get_book(book_id=book_id, fields=fields)
+
+        if book is None:
+            raise exceptions.BookNotFoundError(book_id=book_id)
+        return mappers.map_book_to_output_dto(book=book, fields=fields)
+
+    async def create_book(
+        self, create_book_input_dto: input_dto.CreateBookInputDTO
+    ) -> output_dto.CreateBookOutputDTO:
+        book = mappers.map_create_book_input_dto_to_book(
+            create_book_input_dto=create_book_input_dto
+        )
+
+        try:
+            saved_book = await self.repository.create_book(book)
+            return mappers.map_create_book_to_output_dto(book=saved_book)
+        except ValueError:
+            raise exceptions.BookAlreadyExistsError(title=create_book_input_dto.title)
+
+    async def update_book(
+        self,
+        update_book_input_dto: input_dto.UpdateBookInputDTO,
+        expected_version: int | None = None,
     ) -> output_dto.UpdateBookOutputDTO | None:
         data_book = mappers.map_update_book_input_dto_to_data_book(
             update_book_input_dto=update_book_input_dto
         )
         try:
-            updated_book = self.repository.update_book(data=data_book)
+            updated_book = await self.repository.update_book(
+                data=data_book, expected_version=expected_version
+            )
         except ValueError:
             raise exceptions.BookAlreadyExistsError(title=update_book_input_dto.title)
 
@@ -45,13 +267,22 @@ class BookService:
             raise exceptions.BookNotFoundError(book_id=update_book_input_dto.id)
         return mappers.map_update_book_to_output_dto(book=updated_book)
 
-    def delete_book(self, book_id: str) -> None:
-        book_exists = self.repository.delete_book(book_id)
+    async def delete_book(
+        self, book_id: str, expected_version: int | None = None
+    ) -> None:
+        book_exists = await self.repository.delete_book(
+            book_id=book_id, expected_version=expected_version
+        )
         if not book_exists:
             raise exceptions.BookNotFoundError(book_id=book_id)
 
-    def get_average_price_by_year(self, year: int) -> float:
-        average_price = self.repository.get_average_price_by_year(year)
-        if average_price is None:
+    async def get_price_stats(
+        self, price_stats_input_dto: input_dto.PriceStatsInputDTO
+    ) -> output_dto.PriceStatsOutputDTO:
+        dimension, key = mappers.map_price_stats_input_dto_to_group(
+            price_stats_input_dto=price_stats_input_dto
+        )
+        price_stats = await self.repository.get_price_stats(dimension, key)
+        if price_stats is None:
             raise exceptions.BooksArentNotFound()
-        return average_price
+        return mappers.map_price_stats_to_output_dto(price_stats=price_stats)
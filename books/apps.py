@@ -1,10 +1,4 @@
-import logging
-import os
-
 from django.apps import AppConfig
-from django.contrib.auth import get_user_model
-
-logger = logging.getLogger(__name__)
 
 
 class BooksConfig(AppConfig):
@@ -12,20 +6,16 @@ class BooksConfig(AppConfig):
     name = "books"
 
     def ready(self):
-        from django.db.utils import OperationalError
+        # No queries here: ready() runs in every worker and management command.
+        # The admin user is created by the bootstrap_admin command.
+        from django.conf import settings
+
+        if settings.BOOKS_AUTH_STATELESS:
+            from django.contrib.auth import get_user_model
+            from django.db.models.signals import post_delete, pre_save
 
-        User = get_user_model()
-        username = os.getenv("DEFAULT_ADMIN_USER", "admin")
-        email = os.getenv("DEFAULT_ADMIN_EMAIL", "admin@example.com")
-        password = os.getenv("DEFAULT_ADMIN_PASSWORD", "admin123")
+            from books.interfaces.api import authentication
 
-        try:
-            if not User.objects.filter(username=username).exists():
-                User.objects.create_superuser(
-                    username=username, email=email, password=password
-                )
-                logger.info("Usuario admin creado automáticamente.")
-            else:
-                logger.info("Usuario admin ya existe.")
-        except OperationalError:
-            pass
+            User = get_user_model()
+            pre_save.connect(authentication.revoke_on_credentials_change, sender=User)
+            post_delete.connect(authentication.revoke_on_delete, sender=User)
@@ -17,6 +17,13 @@ class BookAlreadyExistsError(BookException):
         super().__init__(f"Ya existe un libro con el título '{title}'.")
 
 
+class BookVersionMismatchError(BookException):
+    def __init__(self, book_id: str):
+        super().__init__(
+            f"El libro con id '{book_id}' fue modificado; vuelva a leerlo e intente de nuevo."
+        )
+
+
 class BooksArentNotFound(BookException):
     def __init__(self, details: str = "No hay libros creados."):
         super().__init__(details)
@@ -1,15 +1,149 @@
 from datetime import datetime
+from enum import StrEnum
+from typing import Any
 
 from pydantic import BaseModel, Field
 
 
 class Book(BaseModel):
+    # Fields left out of a projection stay None.
     id: str | None = Field(default=None)
-    title: str | None
-    author: str | None
-    published_date: datetime | None
-    genre: str | None
-    price: float | None
+    title: str | None = None
+    author: str | None = None
+    published_date: datetime | None = None
+    genre: str | None = None
+    price: float | None = None
+    # Incremented on every write; compared by conditional updates and deletes.
+    version: int | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
 
     class Config:
         json_encoders = {datetime: lambda v: v.strftime("%Y-%m-%d")}
+
+
+class BookFilters(BaseModel):
+    author: str | None = None
+    genre: str | None = None
+    min_price: float | None = None
+    max_price: float | None = None
+    published_year: int | None = None
+
+
+class BookQuery(BaseModel):
+    filters: BookFilters = Field(default_factory=BookFilters)
+    sort: list[str] = Field(default_factory=list)
+    skip: int = 0
+    limit: int = 10
+    fields: list[str] | None = None
+
+
+class BookKeysetQuery(BaseModel):
+    filters: BookFilters = Field(default_factory=BookFilters)
+    sort_field: str = "id"
+    descending: bool = False
+    after_value: Any = None
+    after_id: str | None = None
+    backwards: bool = False
+    limit: int = 10
+    fields: list[str] | None = None
+
+
+class BookSearchMode(StrEnum):
+    TEXT = "text"
+    PREFIX = "prefix"
+
+
+class BookSearchQuery(BaseModel):
+    text: str
+    mode: BookSearchMode = BookSearchMode.TEXT
+    skip: int = 0
+    limit: int = 10
+
+
+class BookChangeType(StrEnum):
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+class BookChange(BaseModel):
+    type: BookChangeType
+    id: str
+    changed_at: datetime
+    # The current book for an upsert, None for a deletion.
+    book: Book | None = None
+
+
+class BookChangesQuery(BaseModel):
+    """Changes after the position ``(since, after_id)`` up to ``until``.
+
+    Without ``after_id`` the changes made at ``since`` itself are included; with
+    it, only those of a greater ID, so a position taken from the last change
+    read resumes right after it. Without ``since`` every book is a change.
+    """
+
+    since: datetime | None = None
+    after_id: str | None = None
+    until: datetime
+    batch_size: int = 1000
+
+
+class BulkItemStatus(StrEnum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    DUPLICATE_TITLE = "duplicate_title"
+    NOT_FOUND = "not_found"
+    INVALID = "invalid"
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    status: BulkItemStatus
+    id: str | None = None
+    detail: str | None = None
+
+
+class PriceStatsDimension(StrEnum):
+    YEAR = "year"
+    GENRE = "genre"
+
+
+class PriceStats(BaseModel):
+    dimension: PriceStatsDimension
+    key: int | str
+    count: int
+    total: float
+    min_price: float
+    max_price: float
+
+    @property
+    def average_price(self) -> float:
+        return self.total / self.count
+
+
+class PriceAnalyticsGroupBy(StrEnum):
+    GENRE = "genre"
+    AUTHOR = "author"
+
+
+class PriceAnalyticsQuery(BaseModel):
+    from_year: int
+    to_year: int
+    group_by: PriceAnalyticsGroupBy | None = None
+    percentiles: list[int] = Field(default_factory=lambda: [50, 90, 95])
+
+
+class PriceSummary(BaseModel):
+    year: int | None = None
+    group: str | None = None
+    count: int
+    average_price: float
+    min_price: float
+    max_price: float
+    percentiles: dict[int, float] = Field(default_factory=dict)
+
+
+class PriceAnalytics(BaseModel):
+    series: list[PriceSummary]
+    totals: list[PriceSummary]
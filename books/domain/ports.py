@@ -1,29 +1,156 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import Any
 
-from books.domain.models import Book
+from books.domain.models import (
+    Book,
+    BookChange,
+    BookChangesQuery,
+    BookFilters,
+    BookKeysetQuery,
+    BookQuery,
+    BookSearchQuery,
+    BulkItemResult,
+    PriceAnalytics,
+    PriceAnalyticsQuery,
+    PriceStats,
+    PriceStatsDimension,
+)
 
 
 class BookRepository(ABC):
     @abstractmethod
-    def list_books(self) -> list[Book]:
-        """List all books.
+    def list_books(self, query: BookQuery) -> list[Book]:
+        """Lists one page of books matching the query.
+
+        Args:
+            query (BookQuery): Filters, sort keys, offset and page size.
+
+        Returns:
+            list[Book]: The books of the requested page.
+        """
+
+    @abstractmethod
+    def iter_books(
+        self, filters: BookFilters, batch_size: int, fields: list[str] | None = None
+    ) -> Iterator[Book]:
+        """Iterates every book matching the filters without loading them all.
+
+        Args:
+            filters (BookFilters): The filters to apply.
+            batch_size (int): Documents fetched per round trip to the database.
+            fields (list[str] | None): Fields to read; every field when None.
+
+        Returns:
+            Iterator[Book]: The matching books in insertion order.
+        """
+
+    @abstractmethod
+    def iter_changes(self, query: BookChangesQuery) -> Iterator[BookChange]:
+        """Iterates the books created, updated or deleted in a window of time.
+
+        Args:
+            query (BookChangesQuery): The position to start after and the end
+                of the window.
+
+        Returns:
+            Iterator[BookChange]: The changes in ``(changed_at, id)`` order, a
+                book appearing once with its current state.
+        """
+
+    @abstractmethod
+    def count_books(self, filters: BookFilters) -> int:
+        """Counts the books matching the filters.
+
+        Args:
+            filters (BookFilters): The filters to apply.
+
+        Returns:
+            int: Number of matching books.
+        """
+
+    @abstractmethod
+    def list_books_after(self, query: BookKeysetQuery) -> list[Book]:
+        """Lists books positioned after (or before) a keyset cursor.
+
+        Args:
+            query (BookKeysetQuery): Filters, sort key and the cursor position.
 
         Returns:
-            list[Book]: List of books.
+            list[Book]: Up to ``query.limit`` books in scan order, which is
+                        reversed when ``query.backwards`` is set.
         """
 
     @abstractmethod
-    def get_book(self, book_id: str) -> Book | None:
+    def search_books(self, query: BookSearchQuery) -> list[Book]:
+        """Lists one page of books whose title or author match the search.
+
+        Args:
+            query (BookSearchQuery): Search text, mode, offset and page size.
+
+        Returns:
+            list[Book]: The books of the requested page, by relevance in text
+                        mode and by the matching normalized field in prefix
+                        mode.
+        """
+
+    @abstractmethod
+    def get_version(self) -> int:
+        """Gets the change counter of the books.
+
+        Returns:
+            int: A number bumped by every write to the books, so equal values
+                 mean that no book changed in between.
+        """
+
+    @abstractmethod
+    def suggest_books(self, prefix: str, limit: int) -> list[Book]:
+        """Lists books whose title or author start with a prefix (type-ahead).
+
+        Args:
+            prefix (str): Start of the title or author, in any case or accents.
+            limit (int): Maximum number of books.
+
+        Returns:
+            list[Book]: Up to ``limit`` books with at least id, title and author.
+        """
+
+    @abstractmethod
+    def count_search_results(self, query: BookSearchQuery, limit: int) -> int:
+        """Counts the books matching the search, stopping at ``limit``.
+
+        Args:
+            query (BookSearchQuery): Search text and mode.
+            limit (int): Upper bound of the count, so broad searches stay cheap.
+
+        Returns:
+            int: Number of matching books, at most ``limit``.
+        """
+
+    @abstractmethod
+    def get_book(self, book_id: str, fields: list[str] | None = None) -> Book | None:
         """Gets a book by ID.
 
         Args:
             book_id (str): The book ID.
+            fields (list[str] | None): Fields to read; the rest stay None.
+                                       Every field is read when None.
 
         Returns:
             Book | None: The book, or None if it does not exist.
         """
 
+    @abstractmethod
+    def get_books(self, book_ids: list[str]) -> list[Book]:
+        """Gets the existing books among the given IDs in one query.
+
+        Args:
+            book_ids (list[str]): The book IDs. Malformed IDs are ignored.
+
+        Returns:
+            list[Book]: The books found, in no particular order.
+        """
+
     @abstractmethod
     def create_book(self, book: Book) -> Book:
         """Creates a book.
@@ -36,35 +163,145 @@ class BookRepository(ABC):
         """
 
     @abstractmethod
-    def update_book(self, data: dict[str, Any]) -> Book | None:
-        """Updates a book.
+    def update_book(
+        self, data: dict[str, Any], expected_version: int | None = None
+    ) -> Book | None:
+        """Updates a book and increments its version.
 
         Args:
             data (dict): The book data.
+            expected_version (int | None): Only update the book if it is still at
+                this version. None updates it unconditionally.
 
         Returns:
             Book | None: The book, or None if it does not exist.
+
+        Raises:
+            BookVersionMismatchError: If the book is at another version.
         """
 
     @abstractmethod
-    def delete_book(self, book_id: str) -> bool:
+    def delete_book(self, book_id: str, expected_version: int | None = None) -> bool:
         """Deletes a book by ID.
 
         Args:
             book_id (str): The book ID.
+            expected_version (int | None): Only delete the book if it is still at
+                this version. None deletes it unconditionally.
 
         Returns:
             bool: True if the book was successfully deleted, False otherwise
+
+        Raises:
+            BookVersionMismatchError: If the book is at another version.
+        """
+
+    @abstractmethod
+    def bulk_create(self, books: list[Book]) -> list[BulkItemResult]:
+        """Creates many books in one unordered write.
+
+        Args:
+            books (list[Book]): The books to create.
+
+        Returns:
+            list[BulkItemResult]: One result per book, indexed like ``books``.
+        """
+
+    @abstractmethod
+    def bulk_update(self, items: list[dict[str, Any]]) -> list[BulkItemResult]:
+        """Updates many books in one unordered write.
+
+        Args:
+            items (list[dict]): The book data, each one with its ``id``.
+
+        Returns:
+            list[BulkItemResult]: One result per item, indexed like ``items``.
         """
 
     @abstractmethod
-    def get_average_price_by_year(self, year: int) -> float | None:
-        """Calculates the average price of books published in a given year.
+    def bulk_delete(self, book_ids: list[str]) -> list[BulkItemResult]:
+        """Deletes many books by ID.
 
         Args:
-            year (int): The publication year to filter books.
+            book_ids (list[str]): The book IDs.
 
         Returns:
-            float | None: The average price of books for the specified year,
-                          or None if no books are found.
+            list[BulkItemResult]: One result per ID, indexed like ``book_ids``.
         """
+
+    @abstractmethod
+    def get_price_stats(
+        self, dimension: PriceStatsDimension, key: int | str
+    ) -> PriceStats | None:
+        """Gets the maintained price statistics of a year or genre.
+
+        Args:
+            dimension (PriceStatsDimension): Whether ``key`` is a year or a genre.
+            key (int | str): The publication year or the genre.
+
+        Returns:
+            PriceStats | None: The statistics, or None if no priced book
+                               belongs to the group.
+        """
+
+    @abstractmethod
+    def get_price_analytics(self, query: PriceAnalyticsQuery) -> PriceAnalytics:
+        """Summarizes prices per year (and group) over a range of years.
+
+        Args:
+            query (PriceAnalyticsQuery): Year range, optional grouping and the
+                                         percentiles to compute.
+
+        Returns:
+            PriceAnalytics: The per-year series and the totals of the range.
+        """
+
+    @abstractmethod
+    def rebuild_price_stats(self) -> int:
+        """Recomputes every price statistic from the stored books.
+
+        Returns:
+            int: Number of year and genre groups written.
+        """
+
+
+class AsyncBookRepository(ABC):
+    """Coroutine counterpart of ``BookRepository`` for the async request path.
+
+    Methods share the semantics documented on ``BookRepository``.
+    """
+
+    @abstractmethod
+    async def list_books(self, query: BookQuery) -> list[Book]: ...
+
+    @abstractmethod
+    async def list_books_after(self, query: BookKeysetQuery) -> list[Book]: ...
+
+    @abstractmethod
+    async def count_books(self, filters: BookFilters) -> int: ...
+
+    @abstractmethod
+    async def get_version(self) -> int: ...
+
+    @abstractmethod
+    async def get_book(
+        self, book_id: str, fields: list[str] | None = None
+    ) -> Book | None: ...
+
+    @abstractmethod
+    async def create_book(self, book: Book) -> Book: ...
+
+    @abstractmethod
+    async def update_book(
+        self, data: dict[str, Any], expected_version: int | None = None
+    ) -> Book | None: ...
+
+    @abstractmethod
+    async def delete_book(
+        self, book_id: str, expected_version: int | None = None
+    ) -> bool: ...
+
+    @abstractmethod
+    async def get_price_stats(
+        self, dimension: PriceStatsDimension, key: int | str
+    ) -> PriceStats | None: ...
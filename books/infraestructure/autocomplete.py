@@ -0,0 +1,150 @@
+import bisect
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+
+from books.infraestructure.repositories.search import normalize
+
+# (book id, title, author)
+Suggestion = tuple[str, str | None, str | None]
+
+
+class PrefixIndex:
+    """Thread-safe in-process index of normalized titles and authors.
+
+    Keys and book IDs are parallel lists kept in key order, so the matches of
+    a prefix are one ``bisect`` range. Single writes insert or delete in place
+    (a pointer move over the lists); ``build`` replaces everything at once.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._keys: list[str] = []
+        self._ids: list[str] = []
+        self._labels: dict[str, tuple[str | None, str | None]] = {}
+        self._pending: list[Callable[[], None]] | None = None
+        self._lock = threading.Lock()
+        self.built_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    @property
+    def age(self) -> float | None:
+        """Seconds since the last build, or None if never built."""
+        return None if self.built_at is None else self._clock() - self.built_at
+
+    def build(self, suggestions: Iterable[Suggestion]) -> None:
+        """Replaces the index with ``suggestions``, which may be read lazily.
+
+        Writes made while ``suggestions`` is consumed are recorded and applied
+        again on the new lists; every write is idempotent, so applying one the
+        source already reflected is harmless.
+        """
+        with self._lock:
+            self._pending = []
+        labels: dict[str, tuple[str | None, str | None]] = {}
+        unsorted_keys: list[str] = []
+        unsorted_ids: list[str] = []
+        try:
+            for book_id, title, author in suggestions:
+                labels[book_id] = (title, _intern(author))
+                for key in _keys_of(title, author):
+                    unsorted_keys.append(key)
+                    unsorted_ids.append(book_id)
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+        # Sorting positions by key is cheaper than sorting (key, id) tuples.
+        order = sorted(range(len(unsorted_keys)), key=unsorted_keys.__getitem__)
+        keys = [unsorted_keys[i] for i in order]
+        ids = [unsorted_ids[i] for i in order]
+
+        with self._lock:
+            self._keys, self._ids, self._labels = keys, ids, labels
+            pending, self._pending = self._pending or [], None
+            for write in pending:
+                write()
+            self.built_at = self._clock()
+
+    def add(self, book_id: str, title: str | None, author: str | None) -> None:
+        with self._lock:
+            self._write(lambda: self._add(book_id, title, _intern(author)))
+
+    def remove(self, book_id: str) -> None:
+        with self._lock:
+            self._write(lambda: self._remove(book_id))
+
+    def label(self, book_id: str) -> tuple[str | None, str | None] | None:
+        return self._labels.get(book_id)
+
+    def search(self, prefix: str, limit: int) -> list[Suggestion]:
+        """Up to ``limit`` books with a title or author starting with ``prefix``,
+        in order of the first matching normalized key."""
+        prefix = normalize(prefix)
+        results: list[Suggestion] = []
+        with self._lock:
+            seen: set[str] = set()
+            i = bisect.bisect_left(self._keys, prefix)
+            while (
+                len(results) < limit
+                and i < len(self._keys)
+                and self._keys[i].startswith(prefix)
+            ):
+                book_id = self._ids[i]
+                if book_id not in seen:
+                    seen.add(book_id)
+                    results.append((book_id, *self._labels[book_id]))
+                i += 1
+        return results
+
+    def _write(self, write: Callable[[], None]) -> None:
+        write()
+        if self._pending is not None:
+            self._pending.append(write)
+
+    def _add(self, book_id: str, title: str | None, author: str | None) -> None:
+        self._remove(book_id)
+        self._labels[book_id] = (title, author)
+        for key in _keys_of(title, author):
+            i = bisect.bisect_right(self._keys, key)
+            self._keys.insert(i, key)
+            self._ids.insert(i, book_id)
+
+    def _remove(self, book_id: str) -> None:
+        label = self._labels.pop(book_id, None)
+        if label is None:
+            return
+        for key in _keys_of(*label):
+            i = bisect.bisect_left(self._keys, key)
+            while i < len(self._keys) and self._keys[i] == key:
+                if self._ids[i] == book_id:
+                    del self._keys[i], self._ids[i]
+                    break
+                i += 1
+
+
+def _keys_of(title: str | None, author: str | None) -> set[str]:
+    keys = set()
+    if title is not None:
+        keys.add(normalize(title))
+    if author is not None:
+        keys.add(_author_key(author))
+    return keys
+
+
+# Many books share an author, so its strings are normalized and stored once.
+@lru_cache(maxsize=65536)
+def _author_key(author: str) -> str:
+    return sys.intern(normalize(author))
+
+
+def _intern(value: str | None) -> str | None:
+    return None if value is None else sys.intern(value)
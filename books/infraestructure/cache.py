@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class LRUTTLCache:
+    """Thread-safe in-process cache bounded by size and entry age.
+
+    Entries past ``ttl`` seconds are dropped on access; when ``max_entries``
+    is reached the least recently used entry is evicted.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every invalidation.
+
+        Callers that load a value outside the lock pass the generation read
+        before loading to ``set`` so a concurrent invalidation is not undone
+        by storing the value it replaced.
+        """
+        return self._generation
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.stats.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, *keys: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._entries.pop(key, _MISSING) is not _MISSING:
+                    self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
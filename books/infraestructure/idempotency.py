@@ -0,0 +1,123 @@
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from pydantic import BaseModel
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
+
+from books.infraestructure import mongodb
+from books.infraestructure.indexes import (
+    IDEMPOTENCY_KEY_INDEXES,
+    IDEMPOTENCY_KEYS_COLLECTION,
+)
+
+
+class IdempotencyRecord(BaseModel):
+    fingerprint: str
+    # None while the request that claimed the key is still running.
+    status_code: int | None = None
+    body: Any = None
+
+
+class MongoIdempotencyStore:
+    """Responses stored by idempotency key until a TTL index removes them.
+
+    A key is claimed by inserting its record, so of two concurrent requests
+    with the same key only one runs. The claim lasts ``lease_seconds`` until
+    the response is stored, so a worker dying mid-request frees the key soon
+    (the TTL monitor runs every minute) instead of after ``ttl_seconds``.
+    """
+
+    collection_name = IDEMPOTENCY_KEYS_COLLECTION
+    indexes = IDEMPOTENCY_KEY_INDEXES
+
+    def __init__(self, ttl_seconds: float, lease_seconds: float = 60) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+
+    @property
+    def collection(self) -> Collection:
+        collection = mongodb.get_mongo_collection(self.collection_name)
+        mongodb.ensure_indexes(collection, self.indexes)
+        return collection
+
+    def reserve(self, key: str, fingerprint: str) -> IdempotencyRecord | None:
+        """Claims ``key``: None if the caller now owns it, otherwise the record
+        of the request that claimed it first."""
+        try:
+            self.collection.insert_one(_claim(key, fingerprint, self.lease_seconds))
+            return None
+        except DuplicateKeyError:
+            doc = self.collection.find_one({"_id": key})
+        if doc is None:
+            # Expired between the insert and the read.
+            return self.reserve(key, fingerprint)
+        return IdempotencyRecord(**doc)
+
+    def complete(self, key: str, status_code: int, body: Any) -> None:
+        self.collection.update_one(
+            {"_id": key}, _completion(status_code, body, self.ttl_seconds)
+        )
+
+    def release(self, key: str) -> None:
+        """Frees a claimed key whose request failed, so it can be retried."""
+        self.collection.delete_one({"_id": key, "status_code": None})
+
+
+class AsyncMongoIdempotencyStore:
+    collection_name = MongoIdempotencyStore.collection_name
+    indexes = MongoIdempotencyStore.indexes
+
+    def __init__(self, ttl_seconds: float, lease_seconds: float = 60) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+
+    async def get_collection(self) -> AsyncCollection:
+        collection = mongodb.get_async_mongo_collection(self.collection_name)
+        await mongodb.ensure_indexes_async(collection, self.indexes)
+        return collection
+
+    async def reserve(self, key: str, fingerprint: str) -> IdempotencyRecord | None:
+        collection = await self.get_collection()
+        try:
+            await collection.insert_one(_claim(key, fingerprint, self.lease_seconds))
+            return None
+        except DuplicateKeyError:
+            doc = await collection.find_one({"_id": key})
+        if doc is None:
+            return await self.reserve(key, fingerprint)
+        return IdempotencyRecord(**doc)
+
+    async def complete(self, key: str, status_code: int, body: Any) -> None:
+        collection = await self.get_collection()
+        await collection.update_one(
+            {"_id": key}, _completion(status_code, body, self.ttl_seconds)
+        )
+
+    async def release(self, key: str) -> None:
+        collection = await self.get_collection()
+        await collection.delete_one({"_id": key, "status_code": None})
+
+
+def _claim(key: str, fingerprint: str, lease_seconds: float) -> dict[str, Any]:
+    return {
+        "_id": key,
+        "fingerprint": fingerprint,
+        "status_code": None,
+        "expires_at": _expiry(lease_seconds),
+    }
+
+
+def _completion(status_code: int, body: Any, ttl_seconds: float) -> dict[str, Any]:
+    return {
+        "$set": {
+            "status_code": status_code,
+            "body": body,
+            "expires_at": _expiry(ttl_seconds),
+        }
+    }
+
+
+def _expiry(seconds: float) -> datetime:
+    return datetime.now(UTC) + timedelta(seconds=seconds)
@@ -0,0 +1,85 @@
+"""Index plan of the Mongo collections.
+
+Repositories create these once per process on first use and the migrations
+create them on deploy, so this module is the only place indexes are declared.
+"""
+
+from pymongo import ASCENDING, TEXT, IndexModel
+from pymongo.database import Database
+
+BOOKS_COLLECTION = "books"
+BOOK_TOMBSTONES_COLLECTION = "book_tombstones"
+IDEMPOTENCY_KEYS_COLLECTION = "idempotency_keys"
+TOKEN_REVOCATIONS_COLLECTION = "token_revocations"
+
+BOOK_INDEXES = [
+    IndexModel([("title", ASCENDING)], unique=True),
+    # A single index serves both sort directions, so no descending twins.
+    IndexModel([("price", ASCENDING), ("_id", ASCENDING)]),
+    # published_year filters (and the year statistics) are ranges on this key.
+    IndexModel([("published_date", ASCENDING), ("_id", ASCENDING)]),
+    # Equality first, then the range/sort key most used with each filter.
+    IndexModel([("genre", ASCENDING), ("price", ASCENDING), ("_id", ASCENDING)]),
+    IndexModel(
+        [("author", ASCENDING), ("published_date", ASCENDING), ("_id", ASCENDING)]
+    ),
+    # Relevance search. No language: titles and names are not stemmed.
+    IndexModel(
+        [("title", TEXT), ("author", TEXT)],
+        name="books_text",
+        weights={"title": 3, "author": 1},
+        default_language="none",
+    ),
+    # Prefix search: anchored regexes on these are range scans in sort order.
+    IndexModel([("title_normalized", ASCENDING), ("_id", ASCENDING)]),
+    IndexModel([("author_normalized", ASCENDING), ("_id", ASCENDING)]),
+    # Delta sync reads the books changed after a position in this order.
+    IndexModel([("updated_at", ASCENDING), ("_id", ASCENDING)]),
+]
+
+# {"_id": <id of the deleted book>, "deleted_at": <date>}, read like the books.
+BOOK_TOMBSTONE_INDEXES = [
+    IndexModel([("deleted_at", ASCENDING), ("_id", ASCENDING)]),
+]
+
+# Each record carries its own expiry, so the retention can change without
+# rebuilding the index.
+IDEMPOTENCY_KEY_INDEXES = [
+    IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+]
+
+# A revocation is dropped once every token it covers has expired.
+TOKEN_REVOCATION_INDEXES = [
+    IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+]
+
+INDEXES: dict[str, list[IndexModel]] = {
+    BOOKS_COLLECTION: BOOK_INDEXES,
+    BOOK_TOMBSTONES_COLLECTION: BOOK_TOMBSTONE_INDEXES,
+    IDEMPOTENCY_KEYS_COLLECTION: IDEMPOTENCY_KEY_INDEXES,
+    TOKEN_REVOCATIONS_COLLECTION: TOKEN_REVOCATION_INDEXES,
+}
+
+# Indexes earlier releases created, superseded by the plan above; dropped by
+# the migrations when present.
+OBSOLETE_INDEXES: dict[str, list[str]] = {
+    BOOKS_COLLECTION: [
+        # Descending twin of the price keyset index, built for cursor
+        # pagination sorted by -price; the ascending index serves both ways.
+        "price_-1__id_-1",
+        # Single-key indexes built for the price statistics recounts; the
+        # compound (published_date, _id) and (genre, price, _id) replace them.
+        "published_date_1",
+        "genre_1",
+    ],
+}
+
+
+def create_indexes(database: Database) -> None:
+    for name, index_models in INDEXES.items():
+        collection = database[name]
+        existing = set(collection.index_information())
+        for index_name in OBSOLETE_INDEXES.get(name, []):
+            if index_name in existing:
+                collection.drop_index(index_name)
+        collection.create_indexes(index_models)
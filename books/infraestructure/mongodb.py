@@ -1,11 +1,152 @@
+import asyncio
+import atexit
+import logging
 import os
+import threading
+from collections.abc import Iterable
 
-from pymongo import MongoClient
+from django.conf import settings
+from pymongo import AsyncMongoClient, IndexModel, MongoClient
+from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.collection import Collection
 from pymongo.database import Database
 
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_client: MongoClient | None = None
+_client_pid: int | None = None
+_collections: dict[str, Collection] = {}
+_indexed_collections: set[str] = set()
+# AsyncMongoClient is bound to the event loop it first runs on. An ASGI server
+# runs every request of a worker on one loop, so there is one client per
+# process, closed by the ASGI lifespan (see books.interfaces.lifespan).
+_async_client: AsyncMongoClient | None = None
+_async_client_pid: int | None = None
+_async_lock = asyncio.Lock()
+_async_indexed_collections: set[str] = set()
+
+
+def get_mongo_client() -> MongoClient:
+    """Returns the process-wide pooled client, creating it on first use.
+
+    The client is re-created when the current PID differs from the one that
+    built it, so workers forked from a preloaded master never share sockets.
+    """
+    global _client, _client_pid
+
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+
+    with _lock:
+        if _client is None or _client_pid != pid:
+            _collections.clear()
+            _indexed_collections.clear()
+            _client = MongoClient(
+                settings.MONGO_URI, connect=False, **settings.MONGO_CLIENT_OPTIONS
+            )
+            _client_pid = pid
+            logger.info("MongoClient creado para el proceso %s.", pid)
+    return _client
+
+
+def get_mongo_database() -> Database:
+    return get_mongo_client()[settings.MONGO_DB_NAME]
+
 
 def get_mongo_collection(name: str) -> Collection:
-    client = MongoClient(os.getenv("MONGO_URI", "mongodb://mongo:27017"))
-    db: Database = client["bookmanager"]
-    return db[name]
+    client = get_mongo_client()
+    collection = _collections.get(name)
+    if collection is None:
+        collection = client[settings.MONGO_DB_NAME][name]
+        _collections[name] = collection
+    return collection
+
+
+def ensure_indexes(collection: Collection, indexes: Iterable[IndexModel]) -> None:
+    """Creates the given indexes once per process and collection."""
+    if collection.name in _indexed_collections:
+        return
+
+    with _lock:
+        if collection.name not in _indexed_collections:
+            collection.create_indexes(list(indexes))
+            _indexed_collections.add(collection.name)
+
+
+def get_async_mongo_client() -> AsyncMongoClient:
+    """Returns the process-wide pooled async client, creating it on first use.
+
+    Like the sync client, it is re-created in a forked worker.
+    """
+    global _async_client, _async_client_pid
+
+    pid = os.getpid()
+    if _async_client is None or _async_client_pid != pid:
+        _async_indexed_collections.clear()
+        _async_client = AsyncMongoClient(
+            settings.MONGO_URI, connect=False, **settings.MONGO_CLIENT_OPTIONS
+        )
+        _async_client_pid = pid
+        logger.info("AsyncMongoClient creado para el proceso %s.", pid)
+    return _async_client
+
+
+def get_async_mongo_collection(name: str) -> AsyncCollection:
+    return get_async_mongo_client()[settings.MONGO_DB_NAME][name]
+
+
+async def ensure_indexes_async(
+    collection: AsyncCollection, indexes: Iterable[IndexModel]
+) -> None:
+    """Creates the given indexes once per process and collection."""
+    if collection.name in _async_indexed_collections:
+        return
+
+    async with _async_lock:
+        if collection.name not in _async_indexed_collections:
+            await collection.create_indexes(list(indexes))
+            _async_indexed_collections.add(collection.name)
+
+
+async def close_async_mongo_client() -> None:
+    global _async_client, _async_client_pid
+
+    if _async_client is not None and _async_client_pid == os.getpid():
+        await _async_client.close()
+    _async_client = None
+    _async_client_pid = None
+    _async_indexed_collections.clear()
+
+
+def close_mongo_client() -> None:
+    global _client, _client_pid
+
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+        _collections.clear()
+        _indexed_collections.clear()
+
+
+def _reset_after_fork() -> None:
+    # The parent's client must not be closed from the child: its sockets are
+    # shared with the parent process. Dropping the reference is enough.
+    global _client, _client_pid, _lock, _async_client, _async_client_pid, _async_lock
+
+    _lock = threading.Lock()
+    _client = None
+    _client_pid = None
+    _collections.clear()
+    _indexed_collections.clear()
+    _async_lock = asyncio.Lock()
+    _async_client = None
+    _async_client_pid = None
+    _async_indexed_collections.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+atexit.register(close_mongo_client)
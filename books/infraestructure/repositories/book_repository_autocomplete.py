@@ -0,0 +1,226 @@
+import logging
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+from books.domain.models import (
+    Book,
+    BookChange,
+    BookChangesQuery,
+    BookFilters,
+    BookKeysetQuery,
+    BookQuery,
+    BookSearchQuery,
+    BulkItemResult,
+    BulkItemStatus,
+    PriceAnalytics,
+    PriceAnalyticsQuery,
+    PriceStats,
+    PriceStatsDimension,
+)
+from books.domain.ports import AsyncBookRepository, BookRepository
+from books.infraestructure.autocomplete import PrefixIndex
+
+logger = logging.getLogger(__name__)
+
+
+class AutocompleteBookRepository(BookRepository):
+    """Serves ``suggest_books`` from an in-process prefix index.
+
+    The index is built in a background thread from the wrapped repository and
+    kept current by the writes made through this repository. Writes made by
+    other processes are picked up by the rebuild started once the index is
+    older than ``refresh_interval`` seconds. Until the first build finishes,
+    suggestions come from the wrapped repository.
+
+    ``AsyncAutocompleteBookRepository`` keeps the same index current for the
+    writes made through the async views.
+    """
+
+    fields = ["title", "author"]
+
+    def __init__(
+        self,
+        repository: BookRepository,
+        index: PrefixIndex,
+        refresh_interval: float,
+        batch_size: int = 5000,
+    ) -> None:
+        self.repository = repository
+        self.index = index
+        self.refresh_interval = refresh_interval
+        self.batch_size = batch_size
+        self._building = threading.Lock()
+
+    def start(self) -> None:
+        """Builds the index in a background thread unless a build is running."""
+        if self._building.acquire(blocking=False):
+            threading.Thread(target=self._build, daemon=True).start()
+
+    def suggest_books(self, prefix: str, limit: int) -> list[Book]:
+        if not self.index.ready:
+            self.start()
+            return self.repository.suggest_books(prefix, limit)
+
+        if self.index.age >= self.refresh_interval:
+            self.start()
+        return [
+            Book(id=book_id, title=title, author=author)
+            for book_id, title, author in self.index.search(prefix, limit)
+        ]
+
+    def create_book(self, book: Book) -> Book:
+        book = self.repository.create_book(book)
+        self.index.add(book.id, book.title, book.author)
+        return book
+
+    def update_book(
+        self, data: dict[str, Any], expected_version: int | None = None
+    ) -> Book | None:
+        book = self.repository.update_book(data, expected_version)
+        if book is not None:
+            self.index.add(book.id, book.title, book.author)
+        return book
+
+    def delete_book(self, book_id: str, expected_version: int | None = None) -> bool:
+        deleted = self.repository.delete_book(book_id, expected_version)
+        if deleted:
+            self.index.remove(book_id)
+        return deleted
+
+    def bulk_create(self, books: list[Book]) -> list[BulkItemResult]:
+        results = self.repository.bulk_create(books)
+        for result in results:
+            if result.status == BulkItemStatus.CREATED:
+                book = books[result.index]
+                self.index.add(result.id, book.title, book.author)
+        return results
+
+    def bulk_update(self, items: list[dict[str, Any]]) -> list[BulkItemResult]:
+        results = self.repository.bulk_update(items)
+        for result in results:
+            item = items[result.index]
+            if result.status == BulkItemStatus.UPDATED and (
+                "title" in item or "author" in item
+            ):
+                title, author = self.index.label(result.id) or (None, None)
+                self.index.add(
+                    result.id, item.get("title") or title, item.get("author") or author
+                )
+        return results
+
+    def bulk_delete(self, book_ids: list[str]) -> list[BulkItemResult]:
+        results = self.repository.bulk_delete(book_ids)
+        for result in results:
+            if result.status == BulkItemStatus.DELETED:
+                self.index.remove(result.id)
+        return results
+
+    def get_book(self, book_id: str, fields: list[str] | None = None) -> Book | None:
+        return self.repository.get_book(book_id, fields)
+
+    def get_books(self, book_ids: list[str]) -> list[Book]:
+        return self.repository.get_books(book_ids)
+
+    def list_books(self, query: BookQuery) -> list[Book]:
+        return self.repository.list_books(query)
+
+    def iter_books(
+        self, filters: BookFilters, batch_size: int, fields: list[str] | None = None
+    ) -> Iterator[Book]:
+        return self.repository.iter_books(filters, batch_size, fields)
+
+    def iter_changes(self, query: BookChangesQuery) -> Iterator[BookChange]:
+        return self.repository.iter_changes(query)
+
+    def count_books(self, filters: BookFilters) -> int:
+        return self.repository.count_books(filters)
+
+    def get_version(self) -> int:
+        return self.repository.get_version()
+
+    def list_books_after(self, query: BookKeysetQuery) -> list[Book]:
+        return self.repository.list_books_after(query)
+
+    def search_books(self, query: BookSearchQuery) -> list[Book]:
+        return self.repository.search_books(query)
+
+    def count_search_results(self, query: BookSearchQuery, limit: int) -> int:
+        return self.repository.count_search_results(query, limit)
+
+    def get_price_stats(
+        self, dimension: PriceStatsDimension, key: int | str
+    ) -> PriceStats | None:
+        return self.repository.get_price_stats(dimension, key)
+
+    def get_price_analytics(self, query: PriceAnalyticsQuery) -> PriceAnalytics:
+        return self.repository.get_price_analytics(query)
+
+    def rebuild_price_stats(self) -> int:
+        return self.repository.rebuild_price_stats()
+
+    def _build(self) -> None:
+        try:
+            books = self.repository.iter_books(
+                BookFilters(), self.batch_size, self.fields
+            )
+            self.index.build((book.id, book.title, book.author) for book in books)
+            logger.info(
+                "Índice de autocompletado construido: %d libros.", len(self.index)
+            )
+        except Exception:
+            logger.exception("No se pudo construir el índice de autocompletado.")
+        finally:
+            self._building.release()
+
+
+class AsyncAutocompleteBookRepository(AsyncBookRepository):
+    """Applies the writes of an async repository to the prefix index of an
+    ``AutocompleteBookRepository``, which builds the index and serves it."""
+
+    def __init__(self, repository: AsyncBookRepository, index: PrefixIndex) -> None:
+        self.repository = repository
+        self.index = index
+
+    async def create_book(self, book: Book) -> Book:
+        book = await self.repository.create_book(book)
+        self.index.add(book.id, book.title, book.author)
+        return book
+
+    async def update_book(
+        self, data: dict[str, Any], expected_version: int | None = None
+    ) -> Book | None:
+        book = await self.repository.update_book(data, expected_version)
+        if book is not None:
+            self.index.add(book.id, book.title, book.author)
+        return book
+
+    async def delete_book(
+        self, book_id: str, expected_version: int | None = None
+    ) -> bool:
+        deleted = await self.repository.delete_book(book_id, expected_version)
+        if deleted:
+            self.index.remove(book_id)
+        return deleted
+
+    async def get_book(
+        self, book_id: str, fields: list[str] | None = None
+    ) -> Book | None:
+        return await self.repository.get_book(book_id, fields)
+
+    async def list_books(self, query: BookQuery) -> list[Book]:
+        return await self.repository.list_books(query)
+
+    async def list_books_after(self, query: BookKeysetQuery) -> list[Book]:
+        return await self.repository.list_books_after(query)
+
+    async def count_books(self, filters: BookFilters) -> int:
+        return await self.repository.count_books(filters)
+
+    async def get_version(self) -> int:
+        return await self.repository.get_version()
+
+    async def get_price_stats(
+        self, dimension: PriceStatsDimension, key: int | str
+    ) -> PriceStats | None:
+        return await self.repository.get_price_stats(dimension, key)
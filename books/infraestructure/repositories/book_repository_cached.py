@@ -0,0 +1,318 @@
+from collections.abc import Iterator
+from typing import Any
+
+from django.core.cache import BaseCache
+
+from books.domain.models import (
+    Book,
+    BookChange,
+    BookChangesQuery,
+    BookFilters,
+    BookKeysetQuery,
+    BookQuery,
+    BookSearchQuery,
+    BulkItemResult,
+    BulkItemStatus,
+    PriceAnalytics,
+    PriceAnalyticsQuery,
+    PriceStats,
+    PriceStatsDimension,
+)
+from books.domain.ports import AsyncBookRepository, BookRepository
+from books.infraestructure.cache import CacheStats, LRUTTLCache
+
+
+class CachedBookRepository(BookRepository):
+    """Read-through cache for ``get_book`` in front of another repository.
+
+    Lookups go to the in-process LRU+TTL tier, then to the optional shared
+    Django cache tier, then to the wrapped repository. Writes go straight to
+    the wrapped repository and drop the affected IDs from both tiers. Other
+    processes only see an invalidation through the shared tier, so their
+    in-process copy may lag up to ``local.ttl`` seconds, or until a write
+    through this process fails on the stale version.
+
+    ``AsyncCachedBookRepository`` is the same cache for the async views; built
+    with the same ``local`` tier, a write on either path evicts the book for
+    both.
+    """
+
+    key_prefix = "books:book:"
+
+    def __init__(
+        self,
+        repository: BookRepository,
+        local: LRUTTLCache,
+        shared: BaseCache | None = None,
+        shared_timeout: float | None = None,
+    ) -> None:
+        self.repository = repository
+        self.local = local
+        self.shared = shared
+        self.shared_timeout = shared_timeout
+        self.shared_stats = CacheStats()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {"local": vars(self.local.stats), "shared": vars(self.shared_stats)}
+
+    def get_book(self, book_id: str, fields: list[str] | None = None) -> Book | None:
+        book = self.local.get(book_id)
+        if book is not None:
+            return book
+
+        generation = self.local.generation
+        book = self._get_shared(book_id)
+        if book is None:
+            if fields is not None:
+                # Partial books are not cached; a cached full book serves any fields.
+                return self.repository.get_book(book_id, fields)
+            book = self.repository.get_book(book_id)
+            if book is None:
+                return None
+            self._set_shared(book_id, book)
+
+        self.local.set(book_id, book, generation=generation)
+        return book
+
+    def get_books(self, book_ids: list[str]) -> list[Book]:
+        books, pending = [], []
+        for book_id in dict.fromkeys(book_ids):
+            book = self.local.get(book_id)
+            if book is None:
+                pending.append(book_id)
+            else:
+                books.append(book)
+        if not pending:
+            return books
+
+        generation = self.local.generation
+        shared_books = self._get_many_shared(pending)
+        pending = [book_id for book_id in pending if book_id not in shared_books]
+        fetched = self.repository.get_books(pending) if pending else []
+        self._set_many_shared(fetched)
+
+        for book in [*shared_books.values(), *fetched]:
+            self.local.set(book.id, book, generation=generation)
+            books.append(book)
+        return books
+
+    def update_book(
+        self, data: dict[str, Any], expected_version: int | None = None
+    ) -> Book | None:
+        # Also after a failed write: a version mismatch means the cached copy
+        # is stale, and the client re-reads it before retrying.
+        try:
+            return self.repository.update_book(data, expected_version)
+        finally:
+            self._invalidate(data["id"])
+
+    def delete_book(self, book_id: str, expected_version: int | None = None) -> bool:
+        try:
+            return self.repository.delete_book(book_id, expected_version)
+        finally:
+            self._invalidate(book_id)
+
+    def bulk_update(self, items: list[dict[str, Any]]) -> list[BulkItemResult]:
+        results = self.repository.bulk_update(items)
+        self._invalidate_results(results, BulkItemStatus.UPDATED)
+        return results
+
+    def bulk_delete(self, book_ids: list[str]) -> list[BulkItemResult]:
+        results = self.repository.bulk_delete(book_ids)
+        self._invalidate_results(results, BulkItemStatus.DELETED)
+        return results
+
+    def list_books(self, query: BookQuery) -> list[Book]:
+        return self.repository.list_books(query)
+
+    def iter_books(
+        self, filters: BookFilters, batch_size: int, fields: list[str] | None = None
+    ) -> Iterator[Book]:
+        return self.repository.iter_books(filters, batch_size, fields)
+
+    def iter_changes(self, query: BookChangesQuery) -> Iterator[BookChange]:
+        return self.repository.iter_changes(query)
+
+    def count_books(self, filters: BookFilters) -> int:
+        return self.repository.count_books(filters)
+
+    def get_version(self) -> int:
+        return self.repository.get_version()
+
+    def list_books_after(self, query: BookKeysetQuery) -> list[Book]:
+        return self.repository.list_books_after(query)
+
+    def search_books(self, query: BookSearchQuery) -> list[Book]:
+        return self.repository.search_books(query)
+
+    def suggest_books(self, prefix: str, limit: int) -> list[Book]:
+        return self.repository.suggest_books(prefix, limit)
+
+    def count_search_results(self, query: BookSearchQuery, limit: int) -> int:
+        return self.repository.count_search_results(query, limit)
+
+    def create_book(self, book: Book) -> Book:
+        return self.repository.create_book(book)
+
+    def bulk_create(self, books: list[Book]) -> list[BulkItemResult]:
+        return self.repository.bulk_create(books)
+
+    def get_price_stats(
+        self, dimension: PriceStatsDimension, key: int | str
+    ) -> PriceStats | None:
+        return self.repository.get_price_stats(dimension, key)
+
+    def get_price_analytics(self, query: PriceAnalyticsQuery) -> PriceAnalytics:
+        return self.repository.get_price_analytics(query)
+
+    def rebuild_price_stats(self) -> int:
+        return self.repository.rebuild_price_stats()
+
+    def _get_shared(self, book_id: str) -> Book | None:
+        if self.shared is None:
+            return None
+
+        book = self.shared.get(self.key_prefix + book_id)
+        if book is None:
+            self.shared_stats.misses += 1
+        else:
+            self.shared_stats.hits += 1
+        return book
+
+    def _set_shared(self, book_id: str, book: Book) -> None:
+        if self.shared is not None:
+            self.shared.set(self.key_prefix + book_id, book, self.shared_timeout)
+
+    def _get_many_shared(self, book_ids: list[str]) -> dict[str, Book]:
+        if self.shared is None:
+            return {}
+
+        cached = self.shared.get_many(
+            [self.key_prefix + book_id for book_id in book_ids]
+        )
+        self.shared_stats.hits += len(cached)
+        self.shared_stats.misses += len(book_ids) - len(cached)
+        return {book.id: book for book in cached.values()}
+
+    def _set_many_shared(self, books: list[Book]) -> None:
+        if self.shared is not None and books:
+            self.shared.set_many(
+                {self.key_prefix + book.id: book for book in books},
+                self.shared_timeout,
+            )
+
+    def _invalidate(self, *book_ids: str) -> None:
+        self.local.delete(*book_ids)
+        if self.shared is not None:
+            self.shared.delete_many([self.key_prefix + book_id for book_id in book_ids])
+            self.shared_stats.invalidations += len(book_ids)
+
+    def _invalidate_results(
+        self, results: list[BulkItemResult], status: BulkItemStatus
+    ) -> None:
+        book_ids = [r.id for r in results if r.status == status and r.id is not None]
+        if book_ids:
+            self._invalidate(*book_ids)
+
+
+class AsyncCachedBookRepository(AsyncBookRepository):
+    """Coroutine counterpart of ``CachedBookRepository``.
+
+    The in-process tier is a plain (thread-safe, non-blocking) ``LRUTTLCache``;
+    the shared tier is used through the async methods of the Django cache.
+    """
+
+    key_prefix = CachedBookRepository.key_prefix
+
+    def __init__(
+        self,
+        repository: AsyncBookRepository,
+        local: LRUTTLCache,
+        shared: BaseCache | None = None,
+        shared_timeout: float | None = None,
+    ) -> None:
+        self.repository = repository
+        self.local = local
+        self.shared = shared
+        self.shared_timeout = shared_timeout
+        self.shared_stats = CacheStats()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {"local": vars(self.local.stats), "shared": vars(self.shared_stats)}
+
+    async def get_book(
+        self, book_id: str, fields: list[str] | None = None
+    ) -> Book | None:
+        book = self.local.get(book_id)
+        if book is not None:
+            return book
+
+        generation = self.local.generation
+        book = await self._get_shared(book_id)
+        if book is None:
+            if fields is not None:
+                return await self.repository.get_book(book_id, fields)
+            book = await self.repository.get_book(book_id)
+            if book is None:
+                return None
+            await self._set_shared(book_id, book)
+
+        self.local.set(book_id, book, generation=generation)
+        return book
+
+    async def update_book(
+        self, data: dict[str, Any], expected_version: int | None = None
+    ) -> Book | None:
+        try:
+            return await self.repository.update_book(data, expected_version)
+        finally:
+            await self._invalidate(data["id"])
+
+    async def delete_book(
+        self, book_id: str, expected_version: int | None = None
+    ) -> bool:
+        try:
+            return await self.repository.delete_book(book_id, expected_version)
+        finally:
+            await self._invalidate(book_id)
+
+    async def list_books(self, query: BookQuery) -> list[Book]:
+        return await self.repository.list_books(query)
+
+    async def list_books_after(self, query: BookKeysetQuery) -> list[Book]:
+        return await self.repository.list_books_after(query)
+
+    async def count_books(self, filters: BookFilters) -> int:
+        return await self.repository.count_books(filters)
+
+    async def get_version(self) -> int:
+        return await self.repository.get_version()
+
+    async def create_book(self, book: Book) -> Book:
+        return await self.repository.create_book(book)
+
+    async def get_price_stats(
+        self, dimension: PriceStatsDimension, key: int | str
+    ) -> PriceStats | None:
+        return await self.repository.get_price_stats(dimension, key)
+
+    async def _get_shared(self, book_id: str) -> Book | None:
+        if self.shared is None:
+            return None
+
+        book = await self.shared.aget(self.key_prefix + book_id)
+        if book is None:
+            self.shared_stats.misses += 1
+        else:
+            self.shared_stats.hits += 1
+        return book
+
+    async def _set_shared(self, book_id: str, book: Book) -> None:
+        if self.shared is not None:
+            await self.shared.aset(self.key_prefix + book_id, book, self.shared_timeout)
+
+    async def _invalidate(self, book_id: str) -> None:
+        self.local.delete(book_id)
+        if self.shared is not None:
+            await self.shared.adelete_many([self.key_prefix + book_id])
+            self.shared_stats.invalidations += 1
@@ -1,74 +1,498 @@
+import heapq
+from collections.abc import Iterator
 from typing import Any
 
 from bson import ObjectId
+from pymongo import ASCENDING, ReplaceOne, ReturnDocument, UpdateOne
 from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
-from books.domain.models import Book
+from books.domain import exceptions
+from books.domain.models import (
+    Book,
+    BookChange,
+    BookChangesQuery,
+    BookFilters,
+    BookKeysetQuery,
+    BookQuery,
+    BookSearchMode,
+    BookSearchQuery,
+    BulkItemResult,
+    BulkItemStatus,
+    PriceAnalytics,
+    PriceAnalyticsQuery,
+    PriceStats,
+    PriceStatsDimension,
+)
 from books.domain.ports import BookRepository
 from books.infraestructure import mongodb
+from books.infraestructure.indexes import (
+    BOOK_INDEXES,
+    BOOK_TOMBSTONE_INDEXES,
+    BOOK_TOMBSTONES_COLLECTION,
+    BOOKS_COLLECTION,
+)
+from books.infraestructure.repositories import (
+    documents,
+    price_stats,
+    queries,
+    search,
+)
+
+DUPLICATE_KEY_ERROR = 11000
 
 
 class MongoBookRepository(BookRepository):
-    def __init__(self):
-        self.collection = mongodb.get_mongo_collection("books")
-        self.collection.create_index("title", unique=True)
+    collection_name = BOOKS_COLLECTION
+    indexes = BOOK_INDEXES
+    # One {"_id": <collection>, "seq": n} document per versioned collection.
+    counters_collection_name = "counters"
+
+    @property
+    def collection(self) -> Collection:
+        collection = mongodb.get_mongo_collection(self.collection_name)
+        mongodb.ensure_indexes(collection, self.indexes)
+        return collection
+
+    @property
+    def stats_collection(self) -> Collection:
+        return mongodb.get_mongo_collection(price_stats.STATS_COLLECTION)
+
+    @property
+    def tombstones_collection(self) -> Collection:
+        collection = mongodb.get_mongo_collection(BOOK_TOMBSTONES_COLLECTION)
+        mongodb.ensure_indexes(collection, BOOK_TOMBSTONE_INDEXES)
+        return collection
+
+    @property
+    def counters_collection(self) -> Collection:
+        return mongodb.get_mongo_collection(self.counters_collection_name)
+
+    def get_version(self) -> int:
+        doc = self.counters_collection.find_one({"_id": self.collection_name})
+        return 0 if doc is None else doc["seq"]
+
+    def list_books(self, query: BookQuery) -> list[Book]:
+        docs = (
+            self.collection.find(
+                queries.build_filter(query.filters),
+                queries.build_projection(query.fields),
+            )
+            .sort(queries.build_sort(query.sort))
+            .skip(query.skip)
+            .limit(query.limit)
+        )
+        return [documents.to_book(doc) for doc in docs]
+
+    def iter_books(
+        self, filters: BookFilters, batch_size: int, fields: list[str] | None = None
+    ) -> Iterator[Book]:
+        docs = (
+            self.collection.find(
+                queries.build_filter(filters), queries.build_projection(fields)
+            )
+            .sort("_id", ASCENDING)
+            .batch_size(batch_size)
+        )
+        with docs:
+            for doc in docs:
+                yield documents.to_book(doc)
+
+    def iter_changes(self, query: BookChangesQuery) -> Iterator[BookChange]:
+        books = (
+            self.collection.find(queries.build_changes_filter(query, "updated_at"))
+            .sort(queries.build_changes_sort("updated_at"))
+            .batch_size(query.batch_size)
+        )
+        tombstones = (
+            self.tombstones_collection.find(
+                queries.build_changes_filter(query, "deleted_at")
+            )
+            .sort(queries.build_changes_sort("deleted_at"))
+            .batch_size(query.batch_size)
+        )
+        with books, tombstones:
+            # Both cursors are in (date, _id) order, so merging them keeps
+            # the feed in that order with one batch of each in memory.
+            yield from heapq.merge(
+                map(documents.to_upsert_change, books),
+                map(documents.to_delete_change, tombstones),
+                key=lambda change: (change.changed_at, change.id),
+            )
+
+    def count_books(self, filters: BookFilters) -> int:
+        mongo_filter = queries.build_filter(filters)
+        if not mongo_filter:
+            return self.collection.estimated_document_count()
+        return self.collection.count_documents(mongo_filter)
 
-    def list_books(self) -> list[Book]:
-        docs = self.collection.find()
-        return [self._map_book(doc=doc) for doc in docs]
+    def list_books_after(self, query: BookKeysetQuery) -> list[Book]:
+        docs = (
+            self.collection.find(
+                queries.build_keyset_query(query),
+                queries.build_projection(query.fields),
+            )
+            .sort(
+                queries.build_keyset_sort(
+                    query.sort_field, query.descending, query.backwards
+                )
+            )
+            .limit(query.limit)
+        )
+        return [documents.to_book(doc) for doc in docs]
+
+    def search_books(self, query: BookSearchQuery) -> list[Book]:
+        if query.mode == BookSearchMode.TEXT:
+            docs = (
+                self.collection.find(search.build_filter(query))
+                .sort(search.build_text_sort())
+                .skip(query.skip)
+                .limit(query.limit)
+            )
+            return [documents.to_book(doc) for doc in docs]
 
-    def get_book(self, book_id: str) -> Book | None:
-        doc = self.collection.find_one({"_id": ObjectId(book_id)})
+        # Reading the first skip + limit matches of each field's index is
+        # enough to build the page, so no stage sorts every match.
+        branches = {
+            field: list(
+                self.collection.find(search.build_prefix_branch(field, query))
+                .sort(search.build_prefix_sort(field))
+                .limit(query.skip + query.limit)
+            )
+            for field in search.NORMALIZED_FIELDS.values()
+        }
+        docs = search.merge_prefix_matches(branches, query.skip, query.limit)
+        return [documents.to_book(doc) for doc in docs]
+
+    def suggest_books(self, prefix: str, limit: int) -> list[Book]:
+        return self.search_books(
+            BookSearchQuery(text=prefix, mode=BookSearchMode.PREFIX, limit=limit)
+        )
+
+    def count_search_results(self, query: BookSearchQuery, limit: int) -> int:
+        return self.collection.count_documents(search.build_filter(query), limit=limit)
+
+    def get_book(self, book_id: str, fields: list[str] | None = None) -> Book | None:
+        doc = self.collection.find_one(
+            {"_id": ObjectId(book_id)}, queries.build_projection(fields)
+        )
         if not doc:
             return None
-        return self._map_book(doc=doc)
+        return documents.to_book(doc)
+
+    def get_books(self, book_ids: list[str]) -> list[Book]:
+        object_ids = {self._to_object_id(book_id) for book_id in book_ids} - {None}
+        if not object_ids:
+            return []
+        docs = self.collection.find({"_id": {"$in": list(object_ids)}})
+        return [documents.to_book(doc) for doc in docs]
 
     def create_book(self, book: Book) -> Book:
-        self._validate_if_book_already_exists(book.title)
+        doc = documents.to_document(book)
+        try:
+            result = self.collection.insert_one(doc)
+        except DuplicateKeyError:
+            raise documents.book_already_exists(book.title)
 
-        result = self.collection.insert_one(book.model_dump(exclude={"id"}))
-        book.id = str(result.inserted_id)
-        return book
+        self._add_price_stats([doc])
+        self._bump_version()
+        return documents.to_book({**doc, "_id": result.inserted_id})
 
-    def update_book(self, data: dict[str, Any]) -> Book | None:
+    def update_book(
+        self, data: dict[str, Any], expected_version: int | None = None
+    ) -> Book | None:
         book_id = data["id"]
-        update_data = {k: v for k, v in data.items() if v is not None and k != "id"}
+        update_data = documents.build_update(data)
+        query = documents.by_id(book_id, expected_version)
 
-        if "title" in update_data:
-            self._validate_if_book_already_exists(update_data["title"])
+        if not update_data:
+            doc = self.collection.find_one(query)
+            if doc is None:
+                self._check_version(book_id, expected_version)
+                return None
+            return documents.to_book(doc)
 
-        res = self.collection.update_one(
-            {"_id": ObjectId(book_id)},
-            {"$set": update_data},
-        )
+        try:
+            old_doc = self.collection.find_one_and_update(
+                query,
+                {"$set": update_data, **documents.INCREMENT_VERSION},
+                return_document=ReturnDocument.BEFORE,
+            )
+        except DuplicateKeyError:
+            raise documents.book_already_exists(update_data.get("title"))
 
-        if res.matched_count == 0:
+        if old_doc is None:
+            self._check_version(book_id, expected_version)
             return None
 
-        doc = self.collection.find_one({"_id": ObjectId(book_id)})
-        return self._map_book(doc=doc)
+        doc = {**old_doc, **update_data}
+        if price_stats.affects_stats(old_doc, update_data):
+            self._replace_price_stats([old_doc], [doc])
+        self._bump_version()
+        return documents.to_book({**doc, "version": documents.updated_version(old_doc)})
+
+    def delete_book(self, book_id: str, expected_version: int | None = None) -> bool:
+        doc = self.collection.find_one_and_delete(
+            documents.by_id(book_id, expected_version),
+            projection=price_stats.STATS_FIELDS,
+        )
+        if doc is None:
+            self._check_version(book_id, expected_version)
+            return False
 
-    def delete_book(self, book_id: str) -> bool:
-        res = self.collection.delete_one({"_id": ObjectId(book_id)})
-        return res.deleted_count > 0
+        self.tombstones_collection.bulk_write(documents.build_tombstones([doc["_id"]]))
+        self._remove_price_stats([doc])
+        self._bump_version()
+        return True
 
-    def get_average_price_by_year(self, year: int) -> float | None:
-        start = f"{year:04d}-01-01"
-        end = f"{year + 1:04d}-01-01"
+    def bulk_create(self, books: list[Book]) -> list[BulkItemResult]:
+        if not books:
+            return []
 
-        pipeline = [
-            {"$match": {"published_date": {"$gte": start, "$lt": end}}},
-            {"$group": {"_id": None, "average_price": {"$avg": "$price"}}},
+        docs = [documents.to_document(book) for book in books]
+        failed = self._bulk_write_errors(
+            lambda: self.collection.insert_many(docs, ordered=False)
+        )
+        self._add_price_stats([doc for i, doc in enumerate(docs) if i not in failed])
+        if len(failed) < len(docs):
+            self._bump_version()
+        return [
+            failed.get(i)
+            or BulkItemResult(
+                index=i, status=BulkItemStatus.CREATED, id=str(doc["_id"])
+            )
+            for i, doc in enumerate(docs)
         ]
 
-        result = list(self.collection.aggregate(pipeline))
-        if result and "average_price" in result[0]:
-            return result[0]["average_price"]
-        return None
+    def bulk_update(self, items: list[dict[str, Any]]) -> list[BulkItemResult]:
+        object_ids = [self._to_object_id(item["id"]) for item in items]
+        existing = self._existing_docs(object_ids)
+
+        operations, positions, updates = [], [], []
+        for i, (item, object_id) in enumerate(zip(items, object_ids, strict=True)):
+            update_data = documents.build_update(item)
+            if object_id in existing and update_data:
+                operations.append(
+                    UpdateOne(
+                        {"_id": object_id},
+                        {"$set": update_data, **documents.INCREMENT_VERSION},
+                    )
+                )
+                positions.append(i)
+                updates.append((i, existing[object_id], update_data))
+
+        failed = {}
+        if operations:
+            failed = self._bulk_write_errors(
+                lambda: self.collection.bulk_write(operations, ordered=False),
+                positions=positions,
+            )
+
+        # The previous values were read before the write, so a concurrent
+        # update of the same books can skew the statistics until the next
+        # rebuild_price_stats.
+        changed = [
+            (old_doc, update_data)
+            for i, old_doc, update_data in updates
+            if i not in failed and price_stats.affects_stats(old_doc, update_data)
+        ]
+        if changed:
+            self._replace_price_stats(
+                [old_doc for old_doc, _ in changed],
+                [{**old_doc, **update_data} for old_doc, update_data in changed],
+            )
+        if len(failed) < len(operations):
+            self._bump_version()
+
+        return [
+            (
+                failed[i].model_copy(update={"id": item["id"]})
+                if i in failed
+                else BulkItemResult(
+                    index=i,
+                    status=(
+                        BulkItemStatus.UPDATED
+                        if object_ids[i] in existing
+                        else BulkItemStatus.NOT_FOUND
+                    ),
+                    id=item["id"],
+                )
+            )
+            for i, item in enumerate(items)
+        ]
+
+    def bulk_delete(self, book_ids: list[str]) -> list[BulkItemResult]:
+        # One find_one_and_delete per book: a delete_many only reports how
+        # many books it removed, so a book deleted by another writer in the
+        # meantime would be reported, tombstoned and uncounted as ours. A
+        # repeated ID is not found the second time.
+        removed = []
+        statuses = []
+        for book_id in book_ids:
+            object_id = self._to_object_id(book_id)
+            doc = (
+                None
+                if object_id is None
+                else self.collection.find_one_and_delete(
+                    {"_id": object_id}, projection=price_stats.STATS_FIELDS
+                )
+            )
+            if doc is None:
+                statuses.append(BulkItemStatus.NOT_FOUND)
+            else:
+                removed.append(doc)
+                statuses.append(BulkItemStatus.DELETED)
+
+        if removed:
+            self.tombstones_collection.bulk_write(
+                documents.build_tombstones([doc["_id"] for doc in removed]),
+                ordered=False,
+            )
+            self._remove_price_stats(removed)
+            self._bump_version()
+
+        return [
+            BulkItemResult(index=i, status=status, id=book_id)
+            for i, (book_id, status) in enumerate(zip(book_ids, statuses, strict=True))
+        ]
+
+    def get_price_stats(
+        self, dimension: PriceStatsDimension, key: int | str
+    ) -> PriceStats | None:
+        doc = self.stats_collection.find_one(
+            {"_id": price_stats.stats_id(dimension, key)}
+        )
+        if doc is None or doc["count"] <= 0:
+            return None
+        return price_stats.to_price_stats(doc)
+
+    def get_price_analytics(self, query: PriceAnalyticsQuery) -> PriceAnalytics:
+        # Pushed price arrays can outgrow the 100 MB stage limit on big ranges.
+        [result] = self.collection.aggregate(
+            queries.build_price_analytics_pipeline(query), allowDiskUse=True
+        )
+        return PriceAnalytics(
+            series=[documents.to_price_summary(row) for row in result["series"]],
+            totals=[documents.to_price_summary(row) for row in result["totals"]],
+        )
+
+    def rebuild_price_stats(self) -> int:
+        stats_docs = [
+            price_stats.to_stats_document(dimension, row)
+            for dimension in PriceStatsDimension
+            for row in self.collection.aggregate(
+                price_stats.build_group_pipeline(dimension)
+            )
+        ]
+        if stats_docs:
+            self.stats_collection.bulk_write(
+                [
+                    ReplaceOne({"_id": doc["_id"]}, doc, upsert=True)
+                    for doc in stats_docs
+                ],
+                ordered=False,
+            )
+        self.stats_collection.delete_many(
+            {"_id": {"$nin": [doc["_id"] for doc in stats_docs]}}
+        )
+        self._bump_version()
+        return len(stats_docs)
+
+    def _check_version(self, book_id: str, expected_version: int | None) -> None:
+        """Called when a write by ID matched nothing: tells a book at another
+        version (raised) from a missing one. Only the failed path reads."""
+        if expected_version is not None and self.collection.count_documents(
+            {"_id": ObjectId(book_id)}, limit=1
+        ):
+            raise exceptions.BookVersionMismatchError(book_id=book_id)
+
+    def _bump_version(self) -> None:
+        # Bumped after the write: a reader that saw the old version may tag
+        # newer content with it, which only costs a refetch, whereas bumping
+        # first could tag stale content with the new version.
+        self.counters_collection.update_one(
+            {"_id": self.collection_name}, {"$inc": {"seq": 1}}, upsert=True
+        )
+
+    def _add_price_stats(self, docs: list[dict[str, Any]]) -> None:
+        operations = price_stats.build_add_operations(price_stats.build_deltas(docs))
+        if operations:
+            self.stats_collection.bulk_write(operations, ordered=False)
+
+    def _remove_price_stats(self, docs: list[dict[str, Any]]) -> None:
+        for key, delta in price_stats.build_deltas(docs).items():
+            stats_doc = self.stats_collection.find_one_and_update(
+                {"_id": price_stats.stats_id(*key)},
+                price_stats.build_remove_update(delta),
+                return_document=ReturnDocument.AFTER,
+            )
+            if price_stats.needs_recompute(stats_doc, delta):
+                self._recompute_price_stats(key)
+
+    def _replace_price_stats(
+        self, old_docs: list[dict[str, Any]], new_docs: list[dict[str, Any]]
+    ) -> None:
+        # Adding first keeps a recompute triggered by the removal from being
+        # counted twice: it already sees the new values in the books.
+        self._add_price_stats(new_docs)
+        self._remove_price_stats(old_docs)
+
+    def _recompute_price_stats(self, *keys: price_stats.GroupKey) -> None:
+        for dimension, key in keys:
+            stats_id = price_stats.stats_id(dimension, key)
+            rows = list(
+                self.collection.aggregate(
+                    price_stats.build_group_pipeline(dimension, key)
+                )
+            )
+            if rows:
+                self.stats_collection.replace_one(
+                    {"_id": stats_id},
+                    price_stats.to_stats_document(dimension, rows[0]),
+                    upsert=True,
+                )
+            else:
+                self.stats_collection.delete_one({"_id": stats_id})
+
+    def _existing_docs(
+        self, object_ids: list[ObjectId | None]
+    ) -> dict[ObjectId, dict[str, Any]]:
+        valid_ids = [object_id for object_id in object_ids if object_id is not None]
+        if not valid_ids:
+            return {}
+        docs = self.collection.find(
+            {"_id": {"$in": valid_ids}}, price_stats.STATS_FIELDS
+        )
+        return {doc["_id"]: doc for doc in docs}
+
+    @staticmethod
+    def _to_object_id(book_id: str) -> ObjectId | None:
+        return ObjectId(book_id) if ObjectId.is_valid(book_id) else None
 
-    def _map_book(self, doc: Collection) -> Book:
-        return Book(id=str(doc["_id"]), **{k: v for k, v in doc.items() if k != "_id"})
+    @staticmethod
+    def _bulk_write_errors(
+        write, positions: list[int] | None = None
+    ) -> dict[int, BulkItemResult]:
+        """Runs an unordered bulk write and maps its write errors to results.
 
-    def _validate_if_book_already_exists(self, title: str) -> None:
-        if self.collection.find_one({"title": title}):
-            raise ValueError(f"El libro con título '{title}' ya existe")
+        ``positions`` translates operation indexes back to item indexes when
+        not every item produced an operation.
+        """
+        try:
+            write()
+        except BulkWriteError as exc:
+            failed = {}
+            for error in exc.details.get("writeErrors", []):
+                index = positions[error["index"]] if positions else error["index"]
+                duplicate = error.get("code") == DUPLICATE_KEY_ERROR
+                failed[index] = BulkItemResult(
+                    index=index,
+                    status=(
+                        BulkItemStatus.DUPLICATE_TITLE
+                        if duplicate
+                        else BulkItemStatus.INVALID
+                    ),
+                    detail=None if duplicate else error.get("errmsg"),
+                )
+            return failed
+        return {}
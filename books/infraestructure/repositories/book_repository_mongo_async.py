@@ -0,0 +1,224 @@
+from typing import Any
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import DuplicateKeyError
+
+from books.domain import exceptions
+from books.domain.models import (
+    Book,
+    BookFilters,
+    BookKeysetQuery,
+    BookQuery,
+    PriceStats,
+    PriceStatsDimension,
+)
+from books.domain.ports import AsyncBookRepository
+from books.infraestructure import mongodb
+from books.infraestructure.indexes import (
+    BOOK_TOMBSTONE_INDEXES,
+    BOOK_TOMBSTONES_COLLECTION,
+)
+from books.infraestructure.repositories import documents, price_stats, queries
+from books.infraestructure.repositories.book_repository_mongo import (
+    MongoBookRepository,
+)
+
+
+class AsyncMongoBookRepository(AsyncBookRepository):
+    collection_name = MongoBookRepository.collection_name
+    indexes = MongoBookRepository.indexes
+    counters_collection_name = MongoBookRepository.counters_collection_name
+
+    async def get_collection(self) -> AsyncCollection:
+        collection = mongodb.get_async_mongo_collection(self.collection_name)
+        await mongodb.ensure_indexes_async(collection, self.indexes)
+        return collection
+
+    def get_stats_collection(self) -> AsyncCollection:
+        return mongodb.get_async_mongo_collection(price_stats.STATS_COLLECTION)
+
+    async def get_tombstones_collection(self) -> AsyncCollection:
+        collection = mongodb.get_async_mongo_collection(BOOK_TOMBSTONES_COLLECTION)
+        await mongodb.ensure_indexes_async(collection, BOOK_TOMBSTONE_INDEXES)
+        return collection
+
+    def get_counters_collection(self) -> AsyncCollection:
+        return mongodb.get_async_mongo_collection(self.counters_collection_name)
+
+    async def get_version(self) -> int:
+        doc = await self.get_counters_collection().find_one(
+            {"_id": self.collection_name}
+        )
+        return 0 if doc is None else doc["seq"]
+
+    async def list_books(self, query: BookQuery) -> list[Book]:
+        collection = await self.get_collection()
+        docs = (
+            collection.find(
+                queries.build_filter(query.filters),
+                queries.build_projection(query.fields),
+            )
+            .sort(queries.build_sort(query.sort))
+            .skip(query.skip)
+            .limit(query.limit)
+        )
+        return [documents.to_book(doc) async for doc in docs]
+
+    async def list_books_after(self, query: BookKeysetQuery) -> list[Book]:
+        collection = await self.get_collection()
+        docs = (
+            collection.find(
+                queries.build_keyset_query(query),
+                queries.build_projection(query.fields),
+            )
+            .sort(
+                queries.build_keyset_sort(
+                    query.sort_field, query.descending, query.backwards
+                )
+            )
+            .limit(query.limit)
+        )
+        return [documents.to_book(doc) async for doc in docs]
+
+    async def count_books(self, filters: BookFilters) -> int:
+        collection = await self.get_collection()
+        mongo_filter = queries.build_filter(filters)
+        if not mongo_filter:
+            return await collection.estimated_document_count()
+        return await collection.count_documents(mongo_filter)
+
+    async def get_book(
+        self, book_id: str, fields: list[str] | None = None
+    ) -> Book | None:
+        collection = await self.get_collection()
+        doc = await collection.find_one(
+            {"_id": ObjectId(book_id)}, queries.build_projection(fields)
+        )
+        if not doc:
+            return None
+        return documents.to_book(doc)
+
+    async def create_book(self, book: Book) -> Book:
+        collection = await self.get_collection()
+        doc = documents.to_document(book)
+        try:
+            result = await collection.insert_one(doc)
+        except DuplicateKeyError:
+            raise documents.book_already_exists(book.title)
+
+        await self._add_price_stats([doc])
+        await self._bump_version()
+        return documents.to_book({**doc, "_id": result.inserted_id})
+
+    async def update_book(
+        self, data: dict[str, Any], expected_version: int | None = None
+    ) -> Book | None:
+        collection = await self.get_collection()
+        book_id = data["id"]
+        update_data = documents.build_update(data)
+        query = documents.by_id(book_id, expected_version)
+
+        if not update_data:
+            doc = await collection.find_one(query)
+            if doc is None:
+                await self._check_version(book_id, expected_version)
+                return None
+            return documents.to_book(doc)
+
+        try:
+            old_doc = await collection.find_one_and_update(
+                query,
+                {"$set": update_data, **documents.INCREMENT_VERSION},
+                return_document=ReturnDocument.BEFORE,
+            )
+        except DuplicateKeyError:
+            raise documents.book_already_exists(update_data.get("title"))
+
+        if old_doc is None:
+            await self._check_version(book_id, expected_version)
+            return None
+
+        doc = {**old_doc, **update_data}
+        if price_stats.affects_stats(old_doc, update_data):
+            # Same order as the sync repository: add, then remove.
+            await self._add_price_stats([doc])
+            await self._remove_price_stats([old_doc])
+        await self._bump_version()
+        return documents.to_book({**doc, "version": documents.updated_version(old_doc)})
+
+    async def delete_book(
+        self, book_id: str, expected_version: int | None = None
+    ) -> bool:
+        collection = await self.get_collection()
+        doc = await collection.find_one_and_delete(
+            documents.by_id(book_id, expected_version),
+            projection=price_stats.STATS_FIELDS,
+        )
+        if doc is None:
+            await self._check_version(book_id, expected_version)
+            return False
+
+        tombstones = await self.get_tombstones_collection()
+        await tombstones.bulk_write(documents.build_tombstones([doc["_id"]]))
+        await self._remove_price_stats([doc])
+        await self._bump_version()
+        return True
+
+    async def get_price_stats(
+        self, dimension: PriceStatsDimension, key: int | str
+    ) -> PriceStats | None:
+        doc = await self.get_stats_collection().find_one(
+            {"_id": price_stats.stats_id(dimension, key)}
+        )
+        if doc is None or doc["count"] <= 0:
+            return None
+        return price_stats.to_price_stats(doc)
+
+    async def _check_version(self, book_id: str, expected_version: int | None) -> None:
+        # Same as the sync repository: only a failed conditional write reads.
+        if expected_version is None:
+            return
+        collection = await self.get_collection()
+        if await collection.count_documents({"_id": ObjectId(book_id)}, limit=1):
+            raise exceptions.BookVersionMismatchError(book_id=book_id)
+
+    async def _bump_version(self) -> None:
+        # After the write, as in the sync repository.
+        await self.get_counters_collection().update_one(
+            {"_id": self.collection_name}, {"$inc": {"seq": 1}}, upsert=True
+        )
+
+    async def _add_price_stats(self, docs: list[dict[str, Any]]) -> None:
+        operations = price_stats.build_add_operations(price_stats.build_deltas(docs))
+        if operations:
+            await self.get_stats_collection().bulk_write(operations, ordered=False)
+
+    async def _remove_price_stats(self, docs: list[dict[str, Any]]) -> None:
+        stats_collection = self.get_stats_collection()
+        for key, delta in price_stats.build_deltas(docs).items():
+            stats_doc = await stats_collection.find_one_and_update(
+                {"_id": price_stats.stats_id(*key)},
+                price_stats.build_remove_update(delta),
+                return_document=ReturnDocument.AFTER,
+            )
+            if price_stats.needs_recompute(stats_doc, delta):
+                await self._recompute_price_stats(key)
+
+    async def _recompute_price_stats(self, key: price_stats.GroupKey) -> None:
+        collection = await self.get_collection()
+        dimension, value = key
+        stats_id = price_stats.stats_id(dimension, value)
+        cursor = await collection.aggregate(
+            price_stats.build_group_pipeline(dimension, value)
+        )
+        rows = await cursor.to_list()
+        if rows:
+            await self.get_stats_collection().replace_one(
+                {"_id": stats_id},
+                price_stats.to_stats_document(dimension, rows[0]),
+                upsert=True,
+            )
+        else:
+            await self.get_stats_collection().delete_one({"_id": stats_id})
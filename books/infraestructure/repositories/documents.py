@@ -0,0 +1,97 @@
+from datetime import UTC, datetime
+from typing import Any
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from books.domain.models import Book, BookChange, BookChangeType, PriceSummary
+from books.infraestructure.repositories import search
+
+# Maintained by the repositories, never taken from a payload.
+SERVER_FIELDS = {"id", "version", "created_at", "updated_at"}
+
+
+def to_book(doc: dict[str, Any]) -> Book:
+    return Book(id=str(doc["_id"]), **{k: v for k, v in doc.items() if k != "_id"})
+
+
+def to_document(book: Book) -> dict[str, Any]:
+    doc = book.model_dump(exclude=SERVER_FIELDS)
+    created_at = now()
+    return {
+        **doc,
+        **search.normalized_fields(doc),
+        "version": 1,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def build_update(data: dict[str, Any]) -> dict[str, Any]:
+    """Fields of an update payload that must be ``$set`` on the document."""
+    update = {k: v for k, v in data.items() if v is not None and k not in SERVER_FIELDS}
+    if not update:
+        return {}
+    return {**update, **search.normalized_fields(update), "updated_at": now()}
+
+
+def now() -> datetime:
+    """The current time as Mongo stores and returns it: naive UTC, in ms."""
+    current = datetime.now(UTC).replace(tzinfo=None)
+    return current.replace(microsecond=current.microsecond // 1000 * 1000)
+
+
+def build_tombstones(book_ids: list[ObjectId]) -> list[UpdateOne]:
+    """Upserts recording the deletion of ``book_ids`` for delta sync."""
+    deleted_at = now()
+    return [
+        UpdateOne({"_id": book_id}, {"$set": {"deleted_at": deleted_at}}, upsert=True)
+        for book_id in book_ids
+    ]
+
+
+def to_upsert_change(doc: dict[str, Any]) -> BookChange:
+    book = to_book(doc)
+    return BookChange(
+        type=BookChangeType.UPSERT, id=book.id, changed_at=book.updated_at, book=book
+    )
+
+
+def to_delete_change(tombstone: dict[str, Any]) -> BookChange:
+    return BookChange(
+        type=BookChangeType.DELETE,
+        id=str(tombstone["_id"]),
+        changed_at=tombstone["deleted_at"],
+    )
+
+
+INCREMENT_VERSION = {"$inc": {"version": 1}}
+
+
+def updated_version(old_doc: dict[str, Any]) -> int:
+    """Version a document reaches with ``INCREMENT_VERSION`` applied."""
+    return old_doc.get("version", 0) + 1
+
+
+def by_id(book_id: str, expected_version: int | None = None) -> dict[str, Any]:
+    """Filter on a book and, for a conditional write, on its current version,
+    so the version check and the write are one atomic operation."""
+    query: dict[str, Any] = {"_id": ObjectId(book_id)}
+    if expected_version is not None:
+        query["version"] = expected_version
+    return query
+
+
+def book_already_exists(title: str | None) -> ValueError:
+    # The unique index on title is the only duplicate check, so two concurrent
+    # writes with the same title cannot both succeed.
+    return ValueError(f"El libro con título '{title}' ya existe")
+
+
+def to_price_summary(row: dict[str, Any]) -> PriceSummary:
+    key = row["_id"] or {}
+    return PriceSummary(
+        year=key.get("year"),
+        group=key.get("group"),
+        **{k: v for k, v in row.items() if k != "_id"},
+    )
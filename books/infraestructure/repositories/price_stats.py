@@ -0,0 +1,152 @@
+"""Pure builders for the materialized price statistics.
+
+``book_price_stats`` holds one document per publication year and per genre
+with the count, sum, min and max of the book prices in that group. Writes to
+``books`` feed deltas through these helpers so the sync and async
+repositories keep the statistics identical.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from pymongo import UpdateOne
+
+from books.domain.models import PriceStats, PriceStatsDimension
+from books.infraestructure.repositories import queries
+
+STATS_COLLECTION = "book_price_stats"
+STATS_FIELDS = {"price": 1, "published_date": 1, "genre": 1}
+
+GroupKey = tuple[PriceStatsDimension, int | str]
+
+
+@dataclass
+class GroupDelta:
+    count: int = 0
+    total: float = 0
+    min_price: float | None = None
+    max_price: float | None = None
+
+    def add(self, price: float) -> None:
+        self.count += 1
+        self.total += price
+        self.min_price = price if self.min_price is None else min(self.min_price, price)
+        self.max_price = price if self.max_price is None else max(self.max_price, price)
+
+
+def stats_id(dimension: PriceStatsDimension, key: int | str) -> str:
+    return f"{dimension}:{key}"
+
+
+def group_keys(doc: dict[str, Any]) -> list[GroupKey]:
+    keys: list[GroupKey] = []
+    year = _year_of(doc.get("published_date"))
+    if year is not None:
+        keys.append((PriceStatsDimension.YEAR, year))
+    if doc.get("genre") is not None:
+        keys.append((PriceStatsDimension.GENRE, doc["genre"]))
+    return keys
+
+
+def affects_stats(old_doc: dict[str, Any], update_data: dict[str, Any]) -> bool:
+    return any(
+        field in update_data and update_data[field] != old_doc.get(field)
+        for field in STATS_FIELDS
+    )
+
+
+def build_deltas(docs: list[dict[str, Any]]) -> dict[GroupKey, GroupDelta]:
+    """Sums the priced documents per year and genre group."""
+    deltas: dict[GroupKey, GroupDelta] = {}
+    for doc in docs:
+        price = doc.get("price")
+        if not isinstance(price, int | float) or isinstance(price, bool):
+            continue
+        for key in group_keys(doc):
+            deltas.setdefault(key, GroupDelta()).add(price)
+    return deltas
+
+
+def build_add_operations(deltas: dict[GroupKey, GroupDelta]) -> list[UpdateOne]:
+    return [
+        UpdateOne(
+            {"_id": stats_id(*key)},
+            {
+                "$inc": {"count": delta.count, "total": delta.total},
+                "$min": {"min_price": delta.min_price},
+                "$max": {"max_price": delta.max_price},
+                "$setOnInsert": {"dimension": str(key[0]), "key": key[1]},
+            },
+            upsert=True,
+        )
+        for key, delta in deltas.items()
+    ]
+
+
+def build_remove_update(delta: GroupDelta) -> dict[str, Any]:
+    return {"$inc": {"count": -delta.count, "total": -delta.total}}
+
+
+def needs_recompute(stats_doc: dict[str, Any] | None, delta: GroupDelta) -> bool:
+    """Whether a removal invalidated the group's min/max (or emptied it).
+
+    Counts and sums can be decremented, but a removed extremum can only be
+    replaced by looking at the remaining books of the group.
+    """
+    if stats_doc is None or stats_doc["count"] <= 0:
+        return True
+    return (
+        delta.min_price <= stats_doc["min_price"]
+        or delta.max_price >= stats_doc["max_price"]
+    )
+
+
+def build_group_pipeline(
+    dimension: PriceStatsDimension, key: int | str | None = None
+) -> list[dict[str, Any]]:
+    """Aggregates the statistics of one group, or of every group if no key."""
+    match: dict[str, Any] = {"price": {"$type": "number"}}
+    if dimension == PriceStatsDimension.YEAR:
+        match["published_date"] = {"$type": "date"}
+        if key is not None:
+            match.update(queries.build_year_filter(key))
+        group_by: Any = {"$year": "$published_date"}
+    else:
+        match["genre"] = {"$ne": None} if key is None else key
+        group_by = "$genre"
+
+    return [
+        {"$match": match},
+        {
+            "$group": {
+                "_id": group_by,
+                "count": {"$sum": 1},
+                "total": {"$sum": "$price"},
+                "min_price": {"$min": "$price"},
+                "max_price": {"$max": "$price"},
+            }
+        },
+    ]
+
+
+def to_stats_document(
+    dimension: PriceStatsDimension, row: dict[str, Any]
+) -> dict[str, Any]:
+    return {
+        "_id": stats_id(dimension, row["_id"]),
+        "dimension": str(dimension),
+        "key": row["_id"],
+        "count": row["count"],
+        "total": row["total"],
+        "min_price": row["min_price"],
+        "max_price": row["max_price"],
+    }
+
+
+def to_price_stats(doc: dict[str, Any]) -> PriceStats:
+    return PriceStats(**{k: v for k, v in doc.items() if k != "_id"})
+
+
+def _year_of(value: Any) -> int | None:
+    return value.year if isinstance(value, date) else None
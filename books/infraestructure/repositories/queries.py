@@ -0,0 +1,214 @@
+from datetime import datetime
+from typing import Any
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+from books.domain.models import (
+    BookChangesQuery,
+    BookFilters,
+    BookKeysetQuery,
+    PriceAnalyticsQuery,
+)
+
+SORT_FIELDS = {
+    "id": "_id",
+    "title": "title",
+    "author": "author",
+    "genre": "genre",
+    "price": "price",
+    "published_date": "published_date",
+}
+
+UNIQUE_SORT_FIELDS = {"_id", "title"}
+
+
+def build_filter(filters: BookFilters) -> dict[str, Any]:
+    query: dict[str, Any] = {}
+
+    if filters.author is not None:
+        query["author"] = filters.author
+    if filters.genre is not None:
+        query["genre"] = filters.genre
+
+    price: dict[str, float] = {}
+    if filters.min_price is not None:
+        price["$gte"] = filters.min_price
+    if filters.max_price is not None:
+        price["$lte"] = filters.max_price
+    if price:
+        query["price"] = price
+
+    if filters.published_year is not None:
+        query.update(build_year_filter(filters.published_year))
+
+    return query
+
+
+def build_year_filter(year: int) -> dict[str, Any]:
+    return {
+        "published_date": {
+            "$gte": datetime(year, 1, 1),
+            "$lt": datetime(year + 1, 1, 1),
+        }
+    }
+
+
+def build_projection(fields: list[str] | None) -> dict[str, int] | None:
+    """Mongo projection reading only ``fields``; ``_id`` and ``version`` are
+    always returned."""
+    if fields is None:
+        return None
+    return {"version": 1, **{SORT_FIELDS.get(field, field): 1 for field in fields}}
+
+
+def build_sort(sort: list[str]) -> list[tuple[str, int]]:
+    """Translates ``["-price", "title"]`` style keys into a Mongo sort spec.
+
+    ``_id`` is always appended as a tie-breaker so pages are stable.
+    """
+    spec: list[tuple[str, int]] = []
+    for key in sort:
+        direction = DESCENDING if key.startswith("-") else ASCENDING
+        field = SORT_FIELDS[key.lstrip("-")]
+        spec.append((field, direction))
+
+    if not any(field == "_id" for field, _ in spec):
+        spec.append(("_id", ASCENDING))
+    return spec
+
+
+def build_keyset_sort(
+    sort_field: str, descending: bool, backwards: bool
+) -> list[tuple[str, int]]:
+    field = SORT_FIELDS[sort_field]
+    direction = DESCENDING if descending != backwards else ASCENDING
+    spec = [(field, direction)]
+    if field not in UNIQUE_SORT_FIELDS:
+        spec.append(("_id", direction))
+    return spec
+
+
+def build_keyset_filter(
+    sort_field: str,
+    after_value: Any,
+    after_id: str,
+    descending: bool,
+    backwards: bool,
+) -> dict[str, Any]:
+    """Range condition selecting the documents past the cursor position."""
+    field = SORT_FIELDS[sort_field]
+    op = "$lt" if descending != backwards else "$gt"
+
+    if field == "_id":
+        return {"_id": {op: ObjectId(after_id)}}
+    if field in UNIQUE_SORT_FIELDS:
+        return {field: {op: after_value}}
+    return {
+        "$or": [
+            {field: {op: after_value}},
+            {field: after_value, "_id": {op: ObjectId(after_id)}},
+        ]
+    }
+
+
+def build_keyset_query(query: BookKeysetQuery) -> dict[str, Any]:
+    mongo_filter = build_filter(query.filters)
+    if query.after_id is None:
+        return mongo_filter
+
+    keyset = build_keyset_filter(
+        query.sort_field,
+        query.after_value,
+        query.after_id,
+        query.descending,
+        query.backwards,
+    )
+    return {"$and": [mongo_filter, keyset]} if mongo_filter else keyset
+
+
+def build_changes_filter(query: BookChangesQuery, field: str) -> dict[str, Any]:
+    """Documents whose ``(field, _id)`` is after the query position and whose
+    ``field`` is at most ``until``, a range of the ``(field, _id)`` index."""
+    window: dict[str, Any] = {field: {"$lte": query.until}}
+    if query.since is None:
+        return window
+    if query.after_id is None:
+        return {field: {"$gte": query.since, "$lte": query.until}}
+    return {
+        "$and": [
+            window,
+            {
+                "$or": [
+                    {field: {"$gt": query.since}},
+                    {field: query.since, "_id": {"$gt": ObjectId(query.after_id)}},
+                ]
+            },
+        ]
+    }
+
+
+def build_changes_sort(field: str) -> list[tuple[str, int]]:
+    return [(field, ASCENDING), ("_id", ASCENDING)]
+
+
+def build_price_analytics_pipeline(query: PriceAnalyticsQuery) -> list[dict[str, Any]]:
+    """One round trip for the per-year series and the totals of the range.
+
+    MongoDB 6 has no $percentile accumulator, so each group pushes its prices,
+    sorts them with $sortArray and picks the nearest-rank element.
+    """
+    group_key: dict[str, Any] = {}
+    if query.group_by is not None:
+        group_key["group"] = f"${query.group_by}"
+
+    def summarize(key: dict[str, Any]) -> list[dict[str, Any]]:
+        return [
+            {
+                "$group": {
+                    "_id": key or None,
+                    "count": {"$sum": 1},
+                    "average_price": {"$avg": "$price"},
+                    "min_price": {"$min": "$price"},
+                    "max_price": {"$max": "$price"},
+                    "prices": {"$push": "$price"},
+                }
+            },
+            {"$set": {"prices": {"$sortArray": {"input": "$prices", "sortBy": 1}}}},
+            {
+                "$set": {
+                    "percentiles": {
+                        str(p): {"$arrayElemAt": ["$prices", _nearest_rank_index(p)]}
+                        for p in query.percentiles
+                    }
+                }
+            },
+            {"$project": {"prices": 0}},
+            {"$sort": {"_id": 1}},
+        ]
+
+    return [
+        {
+            "$match": {
+                "published_date": {
+                    "$gte": datetime(query.from_year, 1, 1),
+                    "$lt": datetime(query.to_year + 1, 1, 1),
+                },
+                "price": {"$type": "number"},
+            }
+        },
+        {
+            "$facet": {
+                "series": summarize(
+                    {"year": {"$year": "$published_date"}, **group_key}
+                ),
+                "totals": summarize(group_key),
+            }
+        },
+    ]
+
+
+def _nearest_rank_index(percentile: int) -> dict[str, Any]:
+    # ceil(p / 100 * n) - 1, clamped to the first element.
+    rank = {"$ceil": {"$multiply": [percentile / 100, "$count"]}}
+    return {"$toInt": {"$max": [{"$subtract": [rank, 1]}, 0]}}
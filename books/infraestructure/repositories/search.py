@@ -0,0 +1,91 @@
+"""Pure builders for the book search.
+
+Relevance search uses the ``books_text`` text index over title and author.
+Prefix search (autocomplete) matches ``title_normalized`` and
+``author_normalized``, case-folded copies of those fields written with every
+book, with anchored regexes so each one is a bounded range scan of its index.
+"""
+
+import heapq
+import re
+import unicodedata
+from typing import Any
+
+from pymongo import ASCENDING
+
+from books.domain.models import BookSearchMode, BookSearchQuery
+
+NORMALIZED_FIELDS = {"title": "title_normalized", "author": "author_normalized"}
+
+
+# Combining diacritical mark blocks, i.e. accents once decomposed.
+_DIACRITICS = re.compile(
+    "[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]"
+)
+
+
+def normalize(value: str) -> str:
+    """Case-folds ``value`` and strips its accents and repeated whitespace."""
+    if not value.isascii():
+        value = _DIACRITICS.sub("", unicodedata.normalize("NFKD", value))
+    return " ".join(value.casefold().split())
+
+
+def normalized_fields(data: dict[str, Any]) -> dict[str, str]:
+    """Normalized copies of the searchable fields present in ``data``."""
+    return {
+        normalized: normalize(data[field])
+        for field, normalized in NORMALIZED_FIELDS.items()
+        if isinstance(data.get(field), str)
+    }
+
+
+def build_filter(query: BookSearchQuery) -> dict[str, Any]:
+    if query.mode == BookSearchMode.TEXT:
+        return {"$text": {"$search": query.text}}
+    return {
+        "$or": [
+            build_prefix_branch(field, query) for field in NORMALIZED_FIELDS.values()
+        ]
+    }
+
+
+def build_text_sort() -> list[tuple[str, Any]]:
+    return [("score", {"$meta": "textScore"}), ("_id", ASCENDING)]
+
+
+def build_prefix_sort(field: str) -> list[tuple[str, int]]:
+    return [(field, ASCENDING), ("_id", ASCENDING)]
+
+
+def build_prefix_branch(field: str, query: BookSearchQuery) -> dict[str, Any]:
+    # Anchored and case-sensitive, so the regex becomes index bounds.
+    return {field: {"$regex": f"^{re.escape(normalize(query.text))}"}}
+
+
+def merge_prefix_matches(
+    branches: dict[str, list[dict[str, Any]]], skip: int, limit: int
+) -> list[dict[str, Any]]:
+    """Merges the per-field matches, each sorted by (field, _id), into one page.
+
+    A book is placed by the first of its fields that matches, so fetching the
+    first ``skip + limit`` matches of every field is enough for any page.
+    """
+    merged = heapq.merge(
+        *(
+            [((doc[field], doc["_id"]), doc) for doc in docs]
+            for field, docs in branches.items()
+        ),
+        key=lambda item: item[0],
+    )
+    seen: set[Any] = set()
+    page: list[dict[str, Any]] = []
+    for _, doc in merged:
+        if doc["_id"] in seen:
+            continue
+        seen.add(doc["_id"])
+        if len(seen) > skip:
+            page.append(doc)
+            if len(page) == limit:
+                break
+    return page
@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from pymongo.collection import Collection
+
+from books.infraestructure import mongodb
+from books.infraestructure.indexes import (
+    TOKEN_REVOCATION_INDEXES,
+    TOKEN_REVOCATIONS_COLLECTION,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRevocationList:
+    """In-process copy of the revoked access tokens, shared through Mongo.
+
+    A token is revoked by its ``jti``, or with every token of a user issued up
+    to a moment. Checks read the copy, which is reloaded at most once per
+    ``refresh_interval`` seconds, so a revocation made by another process
+    takes effect within that interval.
+    """
+
+    collection_name = TOKEN_REVOCATIONS_COLLECTION
+    indexes = TOKEN_REVOCATION_INDEXES
+
+    def __init__(
+        self, refresh_interval: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._tokens: frozenset[str] = frozenset()
+        # User ID -> tokens issued at or before this Unix time are revoked.
+        self._users: dict[str, int] = {}
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def collection(self) -> Collection:
+        collection = mongodb.get_mongo_collection(self.collection_name)
+        mongodb.ensure_indexes(collection, self.indexes)
+        return collection
+
+    def is_revoked(self, user_id: str, jti: str | None, issued_at: int | None) -> bool:
+        self._refresh()
+        if jti is not None and jti in self._tokens:
+            return True
+        revoked_until = self._users.get(user_id)
+        return revoked_until is not None and (
+            issued_at is None or issued_at <= revoked_until
+        )
+
+    def revoke_token(self, jti: str, expires_at: datetime) -> None:
+        self.collection.update_one(
+            {"_id": f"jti:{jti}"}, {"$set": {"expires_at": expires_at}}, upsert=True
+        )
+        self._tokens |= {jti}
+
+    def revoke_user(self, user_id: str, expires_at: datetime) -> None:
+        """Revokes every token of the user issued up to now; ``expires_at`` is
+        when the last of them expires."""
+        revoked_until = int(datetime.now(UTC).timestamp())
+        self.collection.update_one(
+            {"_id": f"user:{user_id}"},
+            {"$set": {"revoked_until": revoked_until, "expires_at": expires_at}},
+            upsert=True,
+        )
+        self._users = {**self._users, user_id: revoked_until}
+
+    def _refresh(self) -> None:
+        if not self._is_stale():
+            return
+        with self._lock:
+            if not self._is_stale():
+                return
+            try:
+                self._load()
+            except Exception:
+                # Kept until the next interval rather than retried per request.
+                logger.exception("No se pudo recargar la lista de tokens revocados.")
+            self._loaded_at = self._clock()
+
+    def _is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or self._clock() - self._loaded_at >= self.refresh_interval
+        )
+
+    def _load(self) -> None:
+        tokens, users = set(), {}
+        for doc in self.collection.find({}, {"revoked_until": 1}):
+            kind, _, value = doc["_id"].partition(":")
+            if kind == "jti":
+                tokens.add(value)
+            elif kind == "user":
+                users[value] = doc["revoked_until"]
+        # Swapped whole, so concurrent checks see one snapshot or the other.
+        self._tokens, self._users = frozenset(tokens), users
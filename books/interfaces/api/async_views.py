@@ -0,0 +1,115 @@
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from books.interfaces import dependencies
+from books.interfaces.api.conditional import (
+    book_response,
+    conditional_get,
+    expected_version,
+)
+from books.interfaces.api.idempotency import idempotent
+from books.interfaces.api.views import (
+    AveragePriceAPIView,
+    BookDetailAPIView,
+    BookListCreateAPIView,
+)
+
+
+class _AsyncAPIViewMixin:
+    """Runs the DRF request pipeline around coroutine handlers.
+
+    Authentication, permissions, exception handling and rendering behave as in
+    ``APIView.dispatch``; only the handler is awaited, so Mongo calls do not
+    hold a thread while they are in flight.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.service = dependencies.get_async_book_service()
+        self.idempotency_store = dependencies.get_async_idempotency_store()
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            # Authenticators may query the user table, which is sync-only.
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if not isinstance(response, Response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def options(self, request, *args, **kwargs):
+        return super().options(request, *args, **kwargs)
+
+
+class AsyncBookListCreateAPIView(_AsyncAPIViewMixin, BookListCreateAPIView):
+    @conditional_get
+    async def get(self, request: Request) -> Response:
+        if self.cursor_pagination_class.is_requested(request):
+            paginator = self.cursor_pagination_class()
+            list_books_dto = self._get_list_books_cursor_dto(request, paginator)
+            books_page = await self.service.list_books_by_cursor(list_books_dto)
+            return paginator.get_paginated_response(books_page.results, page=books_page)
+
+        paginator = self.pagination_class()
+        books_page = await self.service.list_books(
+            self._get_list_books_dto(request, paginator)
+        )
+        return paginator.get_paginated_response(
+            books_page.results, count=books_page.count
+        )
+
+    @idempotent
+    async def post(self, request: Request) -> Response:
+        book = await self.service.create_book(self._get_create_book_dto(request))
+        return Response(book, status=status.HTTP_201_CREATED)
+
+
+class AsyncBookDetailAPIView(_AsyncAPIViewMixin, BookDetailAPIView):
+    async def get(self, request: Request, book_id: str) -> Response:
+        book = await self.service.get_book(
+            book_id=book_id, fields=self._get_book_fields(request)
+        )
+        return book_response(request, book)
+
+    async def patch(self, request: Request, book_id: str) -> Response:
+        book = await self.service.update_book(
+            self._get_update_book_dto(request, book_id),
+            expected_version=expected_version(request, book_id),
+        )
+        return book_response(request, book)
+
+    async def delete(self, request: Request, book_id: str) -> Response:
+        await self.service.delete_book(book_id, expected_version(request, book_id))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AsyncAveragePriceAPIView(_AsyncAPIViewMixin, AveragePriceAPIView):
+    @conditional_get
+    async def get(self, request: Request) -> Response:
+        price_stats = await self.service.get_price_stats(
+            self._get_price_stats_dto(request)
+        )
+        return Response(price_stats, status=status.HTTP_200_OK)
@@ -0,0 +1,59 @@
+from datetime import UTC, datetime
+
+from django.contrib.auth.base_user import AbstractBaseUser
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from books.interfaces import dependencies
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """JWT authentication that trusts the claims of a valid access token.
+
+    ``request.user`` is a ``TokenUser`` built from the claims, so no request
+    reads the user table. In exchange a deactivated user keeps access until
+    their tokens expire unless those tokens are revoked, which
+    ``revoke_user_tokens`` does when a user is deactivated, deleted or changes
+    password.
+    """
+
+    def get_user(self, validated_token: Token) -> TokenUser:
+        user = super().get_user(validated_token)
+        if dependencies.get_token_revocation_list().is_revoked(
+            user_id=str(user.id),
+            jti=validated_token.get(api_settings.JTI_CLAIM),
+            issued_at=validated_token.get("iat"),
+        ):
+            raise AuthenticationFailed("El token fue revocado.", code="token_revoked")
+        return user
+
+
+def revoke_user_tokens(user: AbstractBaseUser) -> None:
+    """Revokes every access token issued to ``user`` so far."""
+    dependencies.get_token_revocation_list().revoke_user(
+        user_id=str(user.pk),
+        expires_at=datetime.now(UTC) + api_settings.ACCESS_TOKEN_LIFETIME,
+    )
+
+
+def revoke_on_credentials_change(sender, instance, **kwargs) -> None:
+    """pre_save receiver: a new password or a deactivation revokes the tokens
+    issued with the previous credentials."""
+    if instance.pk is None:
+        return
+    previous = (
+        sender.objects.filter(pk=instance.pk).values("password", "is_active").first()
+    )
+    if previous is not None and (
+        previous["password"] != instance.password
+        or (previous["is_active"] and not instance.is_active)
+    ):
+        revoke_user_tokens(instance)
+
+
+def revoke_on_delete(sender, instance, **kwargs) -> None:
+    """post_delete receiver."""
+    revoke_user_tokens(instance)
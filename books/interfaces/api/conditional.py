@@ -0,0 +1,111 @@
+"""Conditional requests on the books.
+
+Collection responses are tagged from the change counter, the rendered format
+and the full path, so the ETag is known before any book is read and a request
+whose ``If-None-Match`` still matches is answered with an empty 304. A single
+book is tagged with its own version, which ``If-Match`` on a write must carry,
+followed by a hash of the representation (rendered format and fields), so each
+sparse fieldset or format of a book has its own tag: ``"3-1f0c..."``.
+"""
+
+import hashlib
+import inspect
+from collections.abc import Callable
+from functools import wraps
+
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from pydantic import BaseModel
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from books.domain import exceptions
+
+
+def build_etag(request: Request, version: int) -> str:
+    key = f"{version}:{request.accepted_renderer.format}:{request.get_full_path()}"
+    return quote_etag(hashlib.sha256(key.encode()).hexdigest()[:32])
+
+
+def conditional_get(handler: Callable) -> Callable:
+    """Adds ETag/If-None-Match handling to a GET handler of a books view."""
+    if inspect.iscoroutinefunction(handler):
+
+        @wraps(handler)
+        async def async_wrapper(view, request: Request, *args, **kwargs) -> Response:
+            etag = build_etag(request, await view.service.get_version())
+            if _matches(request, etag):
+                return _not_modified(etag)
+            return _tag(await handler(view, request, *args, **kwargs), etag)
+
+        return async_wrapper
+
+    @wraps(handler)
+    def wrapper(view, request: Request, *args, **kwargs) -> Response:
+        etag = build_etag(request, view.service.get_version())
+        if _matches(request, etag):
+            return _not_modified(etag)
+        return _tag(handler(view, request, *args, **kwargs), etag)
+
+    return wrapper
+
+
+def build_book_etag(request: Request, book: BaseModel) -> str:
+    representation = (
+        f"{request.accepted_renderer.format}:{','.join(type(book).model_fields)}"
+    )
+    digest = hashlib.sha256(representation.encode()).hexdigest()[:12]
+    return quote_etag(f"{book.version or 0}-{digest}")
+
+
+def book_response(request: Request, book: BaseModel) -> Response:
+    """A book tagged with its version, or an empty 304 if a GET already has it."""
+    etag = build_book_etag(request, book)
+    if request.method in ("GET", "HEAD") and _matches(request, etag):
+        return _not_modified(etag)
+    return _tag(Response(book, status=status.HTTP_200_OK), etag)
+
+
+def expected_version(request: Request, book_id: str) -> int | None:
+    """The book version required by ``If-Match``, or None if any will do.
+
+    Raises:
+        BookVersionMismatchError: If the header holds a tag no version can match.
+    """
+    header = request.headers.get("If-Match")
+    if not header:
+        return None
+    tags = parse_etags(header)
+    if tags == ["*"]:
+        return None
+    # The version is what precedes the representation hash; a bare version
+    # (the tags of earlier releases) is accepted too.
+    versions = {tag.removeprefix("W/").strip('"').partition("-")[0] for tag in tags}
+    if len(versions) == 1 and (version := versions.pop()).isdigit():
+        return int(version)
+    raise exceptions.BookVersionMismatchError(book_id=book_id)
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    # Weak comparison (RFC 9110 §13.1.2), so a W/ added by GZip still matches.
+    return any(
+        tag == "*" or tag.removeprefix("W/") == etag for tag in parse_etags(header)
+    )
+
+
+def _not_modified(etag: str) -> Response:
+    response = Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _tag(response: Response, etag: str) -> Response:
+    if response.status_code == status.HTTP_200_OK:
+        response["ETag"] = etag
+        # Clients may keep the body but must revalidate it before each use.
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -33,6 +33,11 @@ def custom_exception_handler(exc, context):
         serializer.is_valid(raise_exception=False)
         return Response(serializer.data, status=status.HTTP_409_CONFLICT)
 
+    if isinstance(exc, exceptions.BookVersionMismatchError):
+        serializer = serializers.ErrorResponse(data={"detail": str(exc)})
+        serializer.is_valid(raise_exception=False)
+        return Response(serializer.data, status=status.HTTP_412_PRECONDITION_FAILED)
+
     serializer = serializers.ErrorResponse(data={"detail": "Internal server error"})
     serializer.is_valid(raise_exception=False)
     return Response(serializer.data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,89 @@
+import base64
+import binascii
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from itertools import chain
+
+from bson import ObjectId
+
+from books.application.dto import output_dto
+
+CHUNK_SIZE = 64 * 1024
+CSV_FIELDS = list(output_dto.BookOutputDTO.model_fields)
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the row instead of storing it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def ndjson_chunks(books: Iterable[output_dto.BookOutputDTO]) -> Iterator[bytes]:
+    return _chunked(book.model_dump_json().encode() + b"\n" for book in books)
+
+
+def csv_chunks(books: Iterable[output_dto.BookOutputDTO]) -> Iterator[bytes]:
+    writer = csv.DictWriter(_Echo(), fieldnames=CSV_FIELDS)
+    rows = chain(
+        [writer.writeheader()],
+        (writer.writerow(book.model_dump(mode="json")) for book in books),
+    )
+    return _chunked(row.encode() for row in rows)
+
+
+def changes_chunks(
+    changes: Iterable[output_dto.BookChangeOutputDTO],
+    since: datetime | None,
+    after_id: str | None,
+) -> Iterator[bytes]:
+    """NDJSON changes, then a ``resume_token`` line positioned after the last."""
+
+    def lines() -> Iterator[bytes]:
+        position = since, after_id
+        for change in changes:
+            position = change.changed_at, change.id
+            yield change.model_dump_json(exclude_none=True).encode() + b"\n"
+        token = encode_resume_token(*position)
+        yield json.dumps({"resume_token": token}).encode() + b"\n"
+
+    return _chunked(lines())
+
+
+def encode_resume_token(since: datetime | None, after_id: str | None) -> str:
+    if since is not None and since.tzinfo is not None:
+        since = since.astimezone(UTC).replace(tzinfo=None)
+    position = {"s": since and since.isoformat(), "i": after_id}
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_resume_token(token: str) -> tuple[datetime | None, str | None]:
+    """The ``(since, after_id)`` position of a token; ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        position = json.loads(raw)
+        since = position["s"] and datetime.fromisoformat(position["s"])
+        after_id = position["i"]
+        if after_id is not None and not ObjectId.is_valid(after_id):
+            raise ValueError(after_id)
+        return since, after_id
+    except (binascii.Error, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(token) from e
+
+
+def _chunked(lines: Iterable[bytes]) -> Iterator[bytes]:
+    # Grouping lines keeps the number of writes to the socket low while memory
+    # stays bounded by CHUNK_SIZE, whatever the size of the catalog.
+    buffer: list[bytes] = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
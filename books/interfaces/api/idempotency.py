@@ -0,0 +1,115 @@
+"""Replay of create responses under an ``Idempotency-Key`` header.
+
+The first request with a key runs and its response is stored; a retry with
+the same key and body gets that response back without creating anything
+again. The key is scoped to the user, method and path that used it.
+"""
+
+import hashlib
+import inspect
+import json
+from collections.abc import Callable
+from functools import wraps
+from typing import Any
+
+from django.utils.encoding import force_str
+from pydantic_core import to_jsonable_python
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from books.infraestructure.idempotency import IdempotencyRecord
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyInUse(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Otra petición con esta Idempotency-Key aún está en curso."
+    default_code = "idempotency_key_in_use"
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "La Idempotency-Key ya se usó con un cuerpo distinto."
+    default_code = "idempotency_key_reused"
+
+
+def idempotent(handler: Callable) -> Callable:
+    """Adds Idempotency-Key handling to a POST handler of a books view."""
+    if inspect.iscoroutinefunction(handler):
+
+        @wraps(handler)
+        async def async_wrapper(view, request: Request, *args, **kwargs) -> Response:
+            key = _scoped_key(request)
+            if key is None:
+                return await handler(view, request, *args, **kwargs)
+
+            fingerprint = _fingerprint(request)
+            store = view.idempotency_store
+            record = await store.reserve(key, fingerprint)
+            if record is not None:
+                return _replay(record, fingerprint)
+            try:
+                response = await handler(view, request, *args, **kwargs)
+            except BaseException:
+                await store.release(key)
+                raise
+            await store.complete(key, response.status_code, _stored_body(response))
+            return response
+
+        return async_wrapper
+
+    @wraps(handler)
+    def wrapper(view, request: Request, *args, **kwargs) -> Response:
+        key = _scoped_key(request)
+        if key is None:
+            return handler(view, request, *args, **kwargs)
+
+        fingerprint = _fingerprint(request)
+        store = view.idempotency_store
+        record = store.reserve(key, fingerprint)
+        if record is not None:
+            return _replay(record, fingerprint)
+        try:
+            response = handler(view, request, *args, **kwargs)
+        except BaseException:
+            # Nothing was created, so a retry may run the request again.
+            store.release(key)
+            raise
+        store.complete(key, response.status_code, _stored_body(response))
+        return response
+
+    return wrapper
+
+
+def _scoped_key(request: Request) -> str | None:
+    key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if not key:
+        return None
+    if len(key) > MAX_KEY_LENGTH:
+        raise ValidationError(
+            {IDEMPOTENCY_KEY_HEADER: f"Máximo {MAX_KEY_LENGTH} caracteres."}
+        )
+    return f"{request.user.pk}:{request.method}:{request.path}:{key}"
+
+
+def _fingerprint(request: Request) -> str:
+    body = json.dumps(request.data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def _stored_body(response: Response) -> Any:
+    return to_jsonable_python(response.data, fallback=force_str)
+
+
+def _replay(record: IdempotencyRecord, fingerprint: str) -> Response:
+    if record.status_code is None:
+        raise IdempotencyKeyInUse()
+    if record.fingerprint != fingerprint:
+        raise IdempotencyKeyReused()
+    return Response(
+        record.body, status=record.status_code, headers={"Idempotent-Replayed": "true"}
+    )
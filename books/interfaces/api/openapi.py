@@ -0,0 +1,100 @@
+"""The OpenAPI schema, rendered once and served as bytes with an ETag.
+
+``manage.py build_schema`` writes the rendered schema to BOOKS_SCHEMA_DIR when
+the image is built. A worker serves those files, or generates the schema on
+its first schema request if they are missing, and answers every later request
+from memory; a client that sends the ETag back gets an empty 304.
+"""
+
+import hashlib
+import logging
+from functools import cache
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+from pydantic import BaseModel
+from rest_framework.request import Request
+
+logger = logging.getLogger(__name__)
+
+# Renderer format -> file written by build_schema.
+SCHEMA_FILES = {"yaml": "schema.yaml", "json": "schema.json"}
+
+
+class RenderedSchema(BaseModel):
+    content: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, content: bytes) -> "RenderedSchema":
+        return cls(
+            content=content,
+            etag=quote_etag(hashlib.sha256(content).hexdigest()[:32]),
+        )
+
+
+def render_schema() -> dict[str, bytes]:
+    """The public schema rendered in each served format."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return {
+        "yaml": OpenApiYamlRenderer().render(schema, renderer_context={}),
+        "json": OpenApiJsonRenderer().render(schema, renderer_context={}),
+    }
+
+
+@cache
+def get_rendered_schema() -> dict[str, RenderedSchema]:
+    """The files written by ``build_schema`` if BOOKS_SCHEMA_DIR has them,
+    otherwise the schema generated in this process."""
+    if settings.BOOKS_SCHEMA_DIR:
+        directory = Path(settings.BOOKS_SCHEMA_DIR)
+        try:
+            return {
+                fmt: RenderedSchema.of((directory / name).read_bytes())
+                for fmt, name in SCHEMA_FILES.items()
+            }
+        except FileNotFoundError:
+            logger.warning(
+                "Esquema OpenAPI no encontrado en %s; se genera en este proceso.",
+                directory,
+            )
+    return {fmt: RenderedSchema.of(content) for fmt, content in render_schema().items()}
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """``SpectacularAPIView`` answered from the rendered schema.
+
+    Content negotiation is unchanged (YAML by default, JSON by ``Accept`` or
+    ``?format=json``). Requests for a language or an API version are rare and
+    still generated on each request.
+    """
+
+    def _get_schema_response(self, request: Request) -> HttpResponse:
+        version = (
+            self.api_version or request.version or self._get_version_parameter(request)
+        )
+        if version or request.GET.get("lang"):
+            return super()._get_schema_response(request)
+
+        renderer = request.accepted_renderer
+        schema = get_rendered_schema()[renderer.format]
+        response = get_conditional_response(request, etag=schema.etag)
+        if response is None:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f"{content_type}; charset={renderer.charset}"
+            response = HttpResponse(schema.content, content_type=content_type)
+            response["Content-Disposition"] = (
+                f'inline; filename="{self._get_filename(request, version)}"'
+            )
+        response["ETag"] = schema.etag
+        # Caches may keep the schema but must revalidate it before each use.
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
@@ -0,0 +1,188 @@
+import base64
+import binascii
+import json
+import math
+
+from bson import ObjectId
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from books.application.dto import input_dto, output_dto
+
+
+class CustomPagination(PageNumberPagination):
+    page_size = 10
+    page_query_param = "page"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    invalid_page_message = "Página inválida."
+
+    def get_page_params(self, request: Request) -> tuple[int, int]:
+        """Reads page number and page size so the query can be paged in Mongo."""
+        self.request = request
+        self.current_page_size = self.get_page_size(request)
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            raise NotFound(self.invalid_page_message)
+        if self.page_number < 1:
+            raise NotFound(self.invalid_page_message)
+        return self.page_number, self.current_page_size
+
+    def get_paginated_response(self, data, count: int) -> Response:
+        self.count = count
+        self.total_pages = max(1, math.ceil(count / self.current_page_size))
+        if self.page_number > self.total_pages:
+            raise NotFound(self.invalid_page_message)
+
+        return Response(
+            {
+                "count": self.count,
+                "page_size": self.current_page_size,
+                "current_page": self.page_number,
+                "total_pages": self.total_pages,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self) -> str | None:
+        if self.page_number >= self.total_pages:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self) -> str | None:
+        if self.page_number <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+
+class BookCursorPagination(BasePagination):
+    """Keyset pagination over an indexed sort key, opted into with ``?cursor=``
+    or ``?pagination=cursor``. Cursors are opaque base64 tokens holding the
+    sort key and ``_id`` of the last (or first) book of the current page."""
+
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    sort_query_param = "sort"
+    sort_fields = ("id", "title", "price")
+    # Types a cursor's sort value may have besides None (a book without the
+    # field). An id cursor positions by "i" alone.
+    sort_value_types = {"id": (), "title": (str,), "price": (int, float)}
+    invalid_cursor_message = "Cursor inválido."
+
+    @classmethod
+    def is_requested(cls, request: Request) -> bool:
+        params = request.query_params
+        return (
+            cls.cursor_query_param in params
+            or params.get(cls.mode_query_param) == "cursor"
+        )
+
+    def get_cursor_params(self, request: Request) -> dict:
+        """Decodes the request into page size, sort key and cursor position."""
+        self.request = request
+        self.current_page_size = PageNumberPagination.get_page_size(self, request)
+
+        sort = request.query_params.get(self.sort_query_param, "id")
+        self.sort_field = sort.lstrip("-")
+        self.descending = sort.startswith("-")
+        if self.sort_field not in self.sort_fields:
+            raise ValidationError(
+                {
+                    self.sort_query_param: [
+                        "El modo cursor solo ordena por: "
+                        f"{', '.join(self.sort_fields)}."
+                    ]
+                }
+            )
+
+        cursor, backwards = None, False
+        token = request.query_params.get(self.cursor_query_param)
+        if token:
+            position = self.decode_cursor(token, sort)
+            cursor = input_dto.BookCursorInputDTO(
+                sort_value=position["v"], id=position["i"]
+            )
+            backwards = position["b"]
+
+        return {
+            "page_size": self.current_page_size,
+            "sort_field": self.sort_field,
+            "descending": self.descending,
+            "cursor": cursor,
+            "backwards": backwards,
+        }
+
+    def get_paginated_response(
+        self, data, page: output_dto.BookCursorPageOutputDTO
+    ) -> Response:
+        return Response(
+            {
+                "page_size": self.current_page_size,
+                "next": self._get_link(page.next_cursor, backwards=False),
+                "previous": self._get_link(page.previous_cursor, backwards=True),
+                "results": data,
+            }
+        )
+
+    def encode_cursor(
+        self, cursor: output_dto.BookCursorOutputDTO, backwards: bool
+    ) -> str:
+        sort = f"-{self.sort_field}" if self.descending else self.sort_field
+        sort_value = None if self.sort_field == "id" else cursor.sort_value
+        position = {"s": sort, "v": sort_value, "i": cursor.id, "b": backwards}
+        raw = json.dumps(position, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, token: str, sort: str) -> dict:
+        """The position in a cursor issued for ``sort``.
+
+        Every value goes into the Mongo query, so anything a cursor encoded by
+        this class could not hold is rejected rather than passed through.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            position = json.loads(raw)
+            if not (
+                {"s", "v", "i", "b"} <= position.keys()
+                and position["s"] == sort
+                and isinstance(position["i"], str)
+                and ObjectId.is_valid(position["i"])
+                and isinstance(position["b"], bool)
+                and self._is_sort_value(position["v"], position["i"])
+            ):
+                raise ValueError
+            return position
+        except (binascii.Error, ValueError, TypeError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _is_sort_value(self, value, book_id: str) -> bool:
+        if value is None:
+            return True
+        if self.sort_field == "id":
+            # Cursors issued before id cursors stopped carrying the value.
+            return value == book_id
+        types = self.sort_value_types[self.sort_field]
+        return isinstance(value, types) and not isinstance(value, bool)
+
+    def _get_link(
+        self, cursor: output_dto.BookCursorOutputDTO | None, backwards: bool
+    ) -> str | None:
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(cursor, backwards)
+        )
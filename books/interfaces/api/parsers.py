@@ -0,0 +1,30 @@
+from typing import Any
+
+from django.conf import settings
+from pydantic_core import from_json
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+
+class PydanticJSONParser(JSONParser):
+    """Parses JSON request bodies with pydantic-core.
+
+    Accepts and rejects the same documents as ``JSONParser`` (NaN and
+    Infinity included), but decodes the bytes in one call instead of through
+    a text stream and the ``json`` module.
+    """
+
+    def parse(
+        self,
+        stream,
+        media_type: str | None = None,
+        parser_context: dict | None = None,
+    ) -> Any:
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read()
+            if encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+                body = body.decode(encoding)
+            return from_json(body, allow_inf_nan=False)
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,24 @@
+from typing import Any
+
+from django.utils.encoding import force_str
+from pydantic_core import to_json
+from rest_framework.renderers import JSONRenderer
+
+
+class PydanticJSONRenderer(JSONRenderer):
+    """Renders response data straight to bytes with pydantic-core.
+
+    Pydantic models (the output DTOs) are serialized by their compiled
+    serializer, so views can hand DTOs to ``Response`` without an intermediate
+    ``model_dump()`` or DRF serializer pass.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: dict | None = None,
+    ) -> bytes:
+        if data is None:
+            return b""
+        return to_json(data, fallback=force_str)
@@ -0,0 +1,577 @@
+"""OpenAPI metadata of the books views.
+
+Kept out of ``views`` so that starting a worker neither imports drf-spectacular
+nor builds these structures. The ``register`` preprocessing hook loads this
+module on the first schema generation, and its extensions then annotate a
+subclass of each view (async variants included) instead of the view itself.
+"""
+
+from collections.abc import Callable
+
+from drf_spectacular.extensions import OpenApiViewExtension
+from drf_spectacular.utils import (
+    OpenApiExample,
+    OpenApiParameter,
+    OpenApiResponse,
+    extend_schema,
+    extend_schema_view,
+)
+from rest_framework.views import APIView
+
+from books.interfaces.api import serializers
+from books.interfaces.api.idempotency import IDEMPOTENCY_KEY_HEADER
+
+IF_MATCH_PARAMETER = OpenApiParameter(
+    name="If-Match",
+    location=OpenApiParameter.HEADER,
+    description=(
+        "ETag del libro leído (su versión). Si el libro cambió desde entonces, "
+        "responde 412 sin modificarlo."
+    ),
+    required=False,
+    type=str,
+)
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name=IDEMPOTENCY_KEY_HEADER,
+    location=OpenApiParameter.HEADER,
+    description=(
+        "Clave única del cliente para reintentar la creación sin duplicarla: un "
+        "reintento con la misma clave y cuerpo devuelve la respuesta original."
+    ),
+    required=False,
+    type=str,
+)
+
+
+def register(endpoints: list) -> list:
+    """Preprocessing hook; importing this module registers the extensions."""
+    return endpoints
+
+
+class _BookViewSchema(OpenApiViewExtension):
+    match_subclasses = True
+    # View method name -> extend_schema(...) decorator.
+    methods: dict[str, Callable] = {}
+
+    def view_replacement(self) -> type[APIView]:
+        class AnnotatedView(self.target):
+            pass
+
+        return extend_schema_view(**self.methods)(AnnotatedView)
+
+
+class BookListCreateSchema(_BookViewSchema):
+    target_class = "books.interfaces.api.views.BookListCreateAPIView"
+    methods = {
+        "get": extend_schema(
+            operation_id="books_list",
+            responses=serializers.PaginatedBookResponse,
+            description="Listar los libros con paginación, filtros y ordenamiento",
+            parameters=[
+                OpenApiParameter(
+                    name="page",
+                    description="Número de página",
+                    required=False,
+                    type=int,
+                ),
+                OpenApiParameter(
+                    name="page_size",
+                    description="Tamaño de página (máximo 100)",
+                    required=False,
+                    type=int,
+                ),
+                OpenApiParameter(
+                    name="sort",
+                    description=(
+                        "Campos de ordenamiento separados por coma, '-' para orden "
+                        "descendente. Ej: -price,title"
+                    ),
+                    required=False,
+                    type=str,
+                ),
+                OpenApiParameter(name="author", description="Autor", type=str),
+                OpenApiParameter(name="genre", description="Género", type=str),
+                OpenApiParameter(
+                    name="min_price", description="Precio mínimo", type=float
+                ),
+                OpenApiParameter(
+                    name="max_price", description="Precio máximo", type=float
+                ),
+                OpenApiParameter(
+                    name="published_year", description="Año de publicación", type=int
+                ),
+                OpenApiParameter(
+                    name="pagination",
+                    description=(
+                        "'cursor' activa la paginación por cursor (keyset), ordenando "
+                        "solo por id, title o price"
+                    ),
+                    type=str,
+                ),
+                OpenApiParameter(
+                    name="cursor",
+                    description="Cursor opaco devuelto en los enlaces next/previous",
+                    type=str,
+                ),
+                OpenApiParameter(
+                    name="fields",
+                    description=(
+                        "Campos a devolver separados por coma (id siempre se incluye). "
+                        "Ej: title,price"
+                    ),
+                    type=str,
+                ),
+            ],
+        ),
+        "post": extend_schema(
+            description="Crear un libro.",
+            request=serializers.CreateBookRequest,
+            parameters=[IDEMPOTENCY_KEY_PARAMETER],
+            responses={
+                201: OpenApiResponse(
+                    response=serializers.CreateBookResponse,
+                    description="Libro creado exitosamente",
+                    examples=[
+                        OpenApiExample(
+                            "Respuesta exitosa",
+                            value={
+                                "id": "123e4567-e89b-12d3-a456-426614174000",
+                                "title": "Cien años de soledad",
+                                "author": "Gabriel García Márquez",
+                                "published_date": "1967-05-30",
+                                "genre": "Realismo mágico",
+                                "price": 19.99,
+                            },
+                        )
+                    ],
+                ),
+                400: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="Error de validación",
+                    examples=[
+                        OpenApiExample(
+                            "Error de validación",
+                            value={"detail": "El campo 'title' es obligatorio."},
+                        )
+                    ],
+                ),
+                401: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="No autorizado",
+                    examples=[
+                        OpenApiExample(
+                            "No autorizado",
+                            value={"detail": "Token inválido o expirado."},
+                        )
+                    ],
+                ),
+                409: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="Conflicto: libro ya existe",
+                    examples=[
+                        OpenApiExample(
+                            "Conflicto",
+                            value={"detail": "El libro con ese título ya existe."},
+                        )
+                    ],
+                ),
+                500: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="Internal server error",
+                    examples=[
+                        OpenApiExample(
+                            "Internal server error",
+                            value={"detail": "Internal server error."},
+                        )
+                    ],
+                ),
+            },
+        ),
+    }
+
+
+class BookBulkSchema(_BookViewSchema):
+    target_class = "books.interfaces.api.views.BookBulkAPIView"
+    methods = {
+        "post": extend_schema(
+            operation_id="books_bulk_create",
+            description=(
+                "Crear varios libros en una sola escritura. Cada libro recibe su propio "
+                "resultado: created, duplicate_title o invalid."
+            ),
+            request=serializers.BulkCreateBooksRequest,
+            parameters=[IDEMPOTENCY_KEY_PARAMETER],
+            responses={200: serializers.BulkBooksResponse},
+        ),
+        "patch": extend_schema(
+            operation_id="books_bulk_update",
+            description=(
+                "Actualizar varios libros por ID en una sola escritura. Resultados: "
+                "updated, not_found, duplicate_title o invalid."
+            ),
+            request=serializers.BulkUpdateBooksRequest,
+            responses={200: serializers.BulkBooksResponse},
+        ),
+        "delete": extend_schema(
+            operation_id="books_bulk_delete",
+            description="Eliminar varios libros por ID. Resultados: deleted o not_found.",
+            request=serializers.BulkDeleteBooksRequest,
+            responses={200: serializers.BulkBooksResponse},
+        ),
+    }
+
+
+class BookBatchSchema(_BookViewSchema):
+    target_class = "books.interfaces.api.views.BookBatchAPIView"
+    methods = {
+        "post": extend_schema(
+            operation_id="books_batch_get",
+            description=(
+                "Obtener varios libros por ID en una sola consulta. Devuelve los libros "
+                "encontrados en el orden pedido y los IDs que no existen."
+            ),
+            request=serializers.BatchGetBooksRequest,
+            responses={200: serializers.BookBatchResponse},
+        ),
+    }
+
+
+class BookSearchSchema(_BookViewSchema):
+    target_class = "books.interfaces.api.views.BookSearchAPIView"
+    methods = {
+        "get": extend_schema(
+            operation_id="books_search",
+            responses=serializers.PaginatedBookResponse,
+            description=(
+                "Buscar libros por título o autor. El modo text ordena por relevancia; "
+                "el modo prefix (autocompletado) busca libros cuyo título o autor "
+                "empiezan por q, sin distinguir mayúsculas ni tildes."
+            ),
+            parameters=[
+                OpenApiParameter(
+                    name="q", description="Texto a buscar", required=True, type=str
+                ),
+                OpenApiParameter(
+                    name="mode",
+                    description="text (por defecto) o prefix",
+                    type=str,
+                    enum=["text", "prefix"],
+                ),
+                OpenApiParameter(
+                    name="page",
+                    description="Número de página",
+                    required=False,
+                    type=int,
+                ),
+                OpenApiParameter(
+                    name="page_size",
+                    description="Tamaño de página (máximo 100)",
+                    required=False,
+                    type=int,
+                ),
+            ],
+        ),
+    }
+
+
+class BookAutocompleteSchema(_BookViewSchema):
+    target_class = "books.interfaces.api.views.BookAutocompleteAPIView"
+    methods = {
+        "get": extend_schema(
+            operation_id="books_autocomplete",
+            description=(
+                "Sugerencias para autocompletar: libros cuyo título o autor empiezan "
+                "por q, sin distinguir mayúsculas ni tildes. Con "
+                "BOOKS_AUTOCOMPLETE_ENABLED se responden desde un índice en memoria."
+            ),
+            parameters=[
+                OpenApiParameter(
+                    name="q", description="Texto a completar", required=True, type=str
+                ),
+                OpenApiParameter(
+                    name="limit",
+                    description="Número de sugerencias (máximo 50)",
+                    required=False,
+                    type=int,
+                ),
+            ],
+            responses={200: serializers.BookSuggestionsResponse},
+        ),
+    }
+
+
+class BookExportSchema(_BookViewSchema):
+    target_class = "books.interfaces.api.views.BookExportAPIView"
+    methods = {
+        "get": extend_schema(
+            operation_id="books_export",
+            description=(
+                "Exporta el catálogo completo (o filtrado) en streaming como NDJSON "
+                "o CSV, con memoria constante en el servidor."
+            ),
+            parameters=[
+                OpenApiParameter(
+                    name="output",
+                    description="Formato de salida: ndjson (por defecto) o csv",
+                    type=str,
+                    enum=["ndjson", "csv"],
+                ),
+                OpenApiParameter(name="author", description="Autor", type=str),
+                OpenApiParameter(name="genre", description="Género", type=str),
+                OpenApiParameter(
+                    name="min_price", description="Precio mínimo", type=float
+                ),
+                OpenApiParameter(
+                    name="max_price", description="Precio máximo", type=float
+                ),
+                OpenApiParameter(
+                    name="published_year", description="Año de publicación", type=int
+                ),
+            ],
+            responses={
+                200: OpenApiResponse(description="Archivo NDJSON o CSV en streaming"),
+            },
+        ),
+    }
+
+
+class BookChangesSchema(_BookViewSchema):
+    target_class = "books.interfaces.api.views.BookChangesAPIView"
+    methods = {
+        "get": extend_schema(
+            operation_id="books_changes",
+            description=(
+                "Libros creados, modificados o eliminados desde una fecha o un token, "
+                "en streaming como NDJSON ordenado por fecha de cambio. Cada línea es "
+                '{"type": "upsert", "id", "changed_at", "book"} o {"type": "delete", '
+                '"id", "changed_at"}; la última es {"resume_token"}, que continúa '
+                "justo después del último cambio. Sin parámetros devuelve el catálogo "
+                "completo."
+            ),
+            parameters=[
+                OpenApiParameter(
+                    name="since",
+                    description="Fecha ISO 8601 desde la que leer los cambios (incluida)",
+                    type=str,
+                ),
+                OpenApiParameter(
+                    name="token",
+                    description="resume_token de la respuesta anterior",
+                    type=str,
+                ),
+            ],
+            responses={
+                200: OpenApiResponse(description="Cambios en NDJSON y resume_token"),
+                400: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="Error de validación",
+                ),
+            },
+        ),
+    }
+
+
+class BookDetailSchema(_BookViewSchema):
+    target_class = "books.interfaces.api.views.BookDetailAPIView"
+    methods = {
+        "get": extend_schema(
+            operation_id="book_by_id",
+            description="Obtener un libro por ID",
+            parameters=[
+                OpenApiParameter(
+                    name="fields",
+                    description=(
+                        "Campos a devolver separados por coma (id siempre se incluye). "
+                        "Ej: title,price"
+                    ),
+                    type=str,
+                ),
+            ],
+            responses={
+                200: OpenApiResponse(
+                    response=serializers.BookResponse,
+                    description="Libro encontrado",
+                    examples=[
+                        OpenApiExample(
+                            "Ejemplo",
+                            value={
+                                "id": "123e4567-e89b-12d3-a456-426614174000",
+                                "title": "Cien años de soledad",
+                                "author": "Gabriel García Márquez",
+                                "published_date": "1967-05-30",
+                                "genre": "Realismo mágico",
+                                "price": 19.99,
+                            },
+                        )
+                    ],
+                ),
+                404: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="Libro no encontrado",
+                    examples=[
+                        OpenApiExample(
+                            "No encontrado", value={"detail": "Libro no encontrado"}
+                        )
+                    ],
+                ),
+                401: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="No autorizado",
+                    examples=[
+                        OpenApiExample(
+                            "No autorizado",
+                            value={"detail": "Token inválido o expirado"},
+                        )
+                    ],
+                ),
+            },
+        ),
+        "patch": extend_schema(
+            description="Actualizar un libro por ID",
+            request=serializers.UpdateBookRequest,
+            parameters=[IF_MATCH_PARAMETER],
+            responses={
+                200: serializers.UpdateBookResponse,
+                400: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="Error de validación",
+                ),
+                401: OpenApiResponse(
+                    response=serializers.ErrorResponse, description="No autorizado"
+                ),
+                404: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="Libro no encontrado",
+                ),
+                409: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="Conflicto: libro ya existe",
+                ),
+                412: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="El libro cambió desde la versión de If-Match",
+                ),
+            },
+        ),
+        "delete": extend_schema(
+            description="Eliminar un libro por ID",
+            parameters=[IF_MATCH_PARAMETER],
+            responses={
+                204: OpenApiResponse(
+                    response=None, description="Libro eliminado exitosamente"
+                ),
+                404: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="Libro no encontrado",
+                    examples=[
+                        OpenApiExample(
+                            "No encontrado", value={"detail": "Libro no encontrado"}
+                        )
+                    ],
+                ),
+                401: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="No autorizado",
+                    examples=[
+                        OpenApiExample(
+                            "No autorizado",
+                            value={"detail": "Token inválido o expirado"},
+                        )
+                    ],
+                ),
+                412: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="El libro cambió desde la versión de If-Match",
+                ),
+            },
+        ),
+    }
+
+
+class AveragePriceSchema(_BookViewSchema):
+    target_class = "books.interfaces.api.views.AveragePriceAPIView"
+    methods = {
+        "get": extend_schema(
+            parameters=[
+                OpenApiParameter(
+                    name="year",
+                    type=int,
+                    location=OpenApiParameter.QUERY,
+                    description="Año de publicación (excluyente con genre)",
+                ),
+                OpenApiParameter(
+                    name="genre",
+                    type=str,
+                    location=OpenApiParameter.QUERY,
+                    description="Género (excluyente con year)",
+                ),
+            ],
+            responses={
+                200: serializers.GetAveragePriceResponse,
+                404: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="Libros no encontrados para el año o género.",
+                    examples=[
+                        OpenApiExample(
+                            "No encontrado", value={"detail": "Libros no encontrados"}
+                        )
+                    ],
+                ),
+            },
+            description=(
+                "Obtiene el precio promedio, mínimo, máximo y la cantidad de libros "
+                "de un año de publicación o de un género. Lee estadísticas "
+                "mantenidas en cada escritura, sin recorrer la colección."
+            ),
+        ),
+    }
+
+
+class PriceAnalyticsSchema(_BookViewSchema):
+    target_class = "books.interfaces.api.views.PriceAnalyticsAPIView"
+    methods = {
+        "get": extend_schema(
+            parameters=[
+                OpenApiParameter(
+                    name="from_year",
+                    type=int,
+                    location=OpenApiParameter.QUERY,
+                    description="Primer año de publicación del rango",
+                    required=True,
+                ),
+                OpenApiParameter(
+                    name="to_year",
+                    type=int,
+                    location=OpenApiParameter.QUERY,
+                    description="Último año de publicación del rango (incluido)",
+                    required=True,
+                ),
+                OpenApiParameter(
+                    name="group_by",
+                    type=str,
+                    enum=["genre", "author"],
+                    location=OpenApiParameter.QUERY,
+                    description="Agrupa además cada año por género o autor",
+                ),
+                OpenApiParameter(
+                    name="percentiles",
+                    type=str,
+                    location=OpenApiParameter.QUERY,
+                    description="Percentiles separados por coma (por defecto 50,90,95)",
+                ),
+            ],
+            responses={
+                200: serializers.PriceAnalyticsResponse,
+                400: OpenApiResponse(
+                    response=serializers.ErrorResponse,
+                    description="Parámetros inválidos",
+                ),
+            },
+            description=(
+                "Cantidad, promedio, mínimo, máximo y percentiles de precio por año "
+                "(y por género o autor) en un rango de años, más los totales del "
+                "rango, calculados en una sola agregación."
+            ),
+        ),
+    }
@@ -1,5 +1,10 @@
+from datetime import UTC
+
+from django.conf import settings
 from rest_framework import serializers
 
+from books.interfaces.api import exporters
+
 # REQUEST
 
 
@@ -19,8 +24,168 @@ class UpdateBookRequest(serializers.Serializer):
     price = serializers.FloatField(required=False)
 
 
+class BulkUpdateBookItemRequest(UpdateBookRequest):
+    id = serializers.CharField()
+
+
+class BulkCreateBooksRequest(serializers.Serializer):
+    books = serializers.ListField(
+        child=serializers.DictField(),
+        min_length=1,
+        max_length=settings.BOOKS_BULK_MAX_ITEMS,
+    )
+
+
+class BulkUpdateBooksRequest(BulkCreateBooksRequest): ...
+
+
+class BulkDeleteBooksRequest(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.CharField(),
+        min_length=1,
+        max_length=settings.BOOKS_BULK_MAX_ITEMS,
+    )
+
+
+class BatchGetBooksRequest(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.CharField(),
+        min_length=1,
+        max_length=settings.BOOKS_BATCH_MAX_IDS,
+    )
+
+
+class BookFiltersRequest(serializers.Serializer):
+    author = serializers.CharField(max_length=255, required=False)
+    genre = serializers.CharField(max_length=100, required=False)
+    min_price = serializers.FloatField(min_value=0, required=False)
+    max_price = serializers.FloatField(min_value=0, required=False)
+    published_year = serializers.IntegerField(
+        min_value=1900, max_value=2100, required=False
+    )
+
+    def validate(self, attrs: dict) -> dict:
+        min_price, max_price = attrs.get("min_price"), attrs.get("max_price")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise serializers.ValidationError(
+                "min_price no puede ser mayor que max_price."
+            )
+        return attrs
+
+
+class BookFieldsRequest(serializers.Serializer):
+    BOOK_FIELDS = (
+        "id",
+        "title",
+        "author",
+        "genre",
+        "price",
+        "published_date",
+        "created_at",
+        "updated_at",
+    )
+
+    fields = serializers.CharField(required=False)
+
+    def validate_fields(self, value: str) -> list[str]:
+        fields = list(dict.fromkeys(f.strip() for f in value.split(",") if f.strip()))
+        invalid = [field for field in fields if field not in self.BOOK_FIELDS]
+        if invalid:
+            raise serializers.ValidationError(
+                f"Campos inválidos: {', '.join(invalid)}."
+            )
+        return fields
+
+
+class ListBooksRequest(BookFieldsRequest, BookFiltersRequest):
+    SORT_FIELDS = ("id", "title", "author", "genre", "price", "published_date")
+
+    sort = serializers.CharField(required=False)
+
+    def validate_sort(self, value: str) -> list[str]:
+        keys = [key.strip() for key in value.split(",") if key.strip()]
+        invalid = [key for key in keys if key.lstrip("-") not in self.SORT_FIELDS]
+        if invalid:
+            raise serializers.ValidationError(
+                f"Campos de ordenamiento inválidos: {', '.join(invalid)}."
+            )
+        return keys
+
+
+class ExportBooksRequest(BookFiltersRequest):
+    output = serializers.ChoiceField(choices=("ndjson", "csv"), default="ndjson")
+
+
+class BookChangesRequest(serializers.Serializer):
+    since = serializers.DateTimeField(required=False)
+    token = serializers.CharField(required=False)
+
+    def validate(self, attrs: dict) -> dict:
+        if "since" in attrs and "token" in attrs:
+            raise serializers.ValidationError("Use since o token, no ambos.")
+        if "token" in attrs:
+            try:
+                since, after_id = exporters.decode_resume_token(attrs["token"])
+            except ValueError:
+                raise serializers.ValidationError({"token": "Token inválido."})
+            return {"since": since, "after_id": after_id}
+
+        since = attrs.get("since")
+        if since is not None:
+            # Documents are stamped in naive UTC.
+            since = since.astimezone(UTC).replace(tzinfo=None)
+        return {"since": since, "after_id": None}
+
+
+class SearchBooksRequest(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    mode = serializers.ChoiceField(choices=("text", "prefix"), default="text")
+
+
+class SuggestBooksRequest(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
 class GetAveragePriceRequest(serializers.Serializer):
-    year = serializers.IntegerField(min_value=1900, max_value=2100)
+    year = serializers.IntegerField(min_value=1900, max_value=2100, required=False)
+    genre = serializers.CharField(max_length=100, required=False)
+
+    def validate(self, attrs: dict) -> dict:
+        if ("year" in attrs) == ("genre" in attrs):
+            raise serializers.ValidationError("Indique year o genre, pero no ambos.")
+        return attrs
+
+
+class PriceAnalyticsRequest(serializers.Serializer):
+    MAX_PERCENTILES = 10
+
+    from_year = serializers.IntegerField(min_value=1900, max_value=2100)
+    to_year = serializers.IntegerField(min_value=1900, max_value=2100)
+    group_by = serializers.ChoiceField(choices=("genre", "author"), required=False)
+    percentiles = serializers.CharField(required=False)
+
+    def validate_percentiles(self, value: str) -> list[int]:
+        try:
+            percentiles = sorted({int(p) for p in value.split(",") if p.strip()})
+        except ValueError:
+            percentiles = []
+        if (
+            not percentiles
+            or len(percentiles) > self.MAX_PERCENTILES
+            or not all(1 <= p <= 100 for p in percentiles)
+        ):
+            raise serializers.ValidationError(
+                "Indique hasta 10 percentiles entre 1 y 100 separados por coma."
+            )
+        return percentiles
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs["from_year"] > attrs["to_year"]:
+            raise serializers.ValidationError(
+                "from_year no puede ser mayor que to_year."
+            )
+        return attrs
 
 
 # RESPONSE
@@ -33,6 +198,9 @@ class BookResponse(serializers.Serializer):
     published_date = serializers.DateField()
     genre = serializers.CharField()
     price = serializers.FloatField()
+    version = serializers.IntegerField()
+    created_at = serializers.DateTimeField()
+    updated_at = serializers.DateTimeField()
 
 
 class PaginatedBookResponse(serializers.Serializer):
@@ -45,14 +213,78 @@ class PaginatedBookResponse(serializers.Serializer):
     results = BookResponse(many=True)
 
 
+class CursorPaginatedBookResponse(serializers.Serializer):
+    page_size = serializers.IntegerField()
+    next = serializers.CharField(allow_null=True)
+    previous = serializers.CharField(allow_null=True)
+    results = BookResponse(many=True)
+
+
+class BookSuggestionResponse(serializers.Serializer):
+    id = serializers.CharField()
+    title = serializers.CharField(allow_null=True)
+    author = serializers.CharField(allow_null=True)
+
+
+class BookSuggestionsResponse(serializers.Serializer):
+    results = BookSuggestionResponse(many=True)
+
+
+class BookBatchResponse(serializers.Serializer):
+    results = BookResponse(many=True)
+    missing_ids = serializers.ListField(child=serializers.CharField())
+
+
 class CreateBookResponse(BookResponse): ...
 
 
 class UpdateBookResponse(BookResponse): ...
 
 
+class BulkItemResponse(serializers.Serializer):
+    index = serializers.IntegerField()
+    status = serializers.ChoiceField(
+        choices=(
+            "created",
+            "updated",
+            "deleted",
+            "duplicate_title",
+            "not_found",
+            "invalid",
+        )
+    )
+    id = serializers.CharField(allow_null=True)
+    detail = serializers.CharField(allow_null=True)
+
+
+class BulkBooksResponse(serializers.Serializer):
+    summary = serializers.DictField(child=serializers.IntegerField())
+    results = BulkItemResponse(many=True)
+
+
 class GetAveragePriceResponse(serializers.Serializer):
     average_price = serializers.FloatField()
+    count = serializers.IntegerField()
+    min_price = serializers.FloatField()
+    max_price = serializers.FloatField()
+
+
+class PriceSummaryResponse(serializers.Serializer):
+    year = serializers.IntegerField(allow_null=True)
+    group = serializers.CharField(allow_null=True)
+    count = serializers.IntegerField()
+    average_price = serializers.FloatField()
+    min_price = serializers.FloatField()
+    max_price = serializers.FloatField()
+    percentiles = serializers.DictField(child=serializers.FloatField())
+
+
+class PriceAnalyticsResponse(serializers.Serializer):
+    from_year = serializers.IntegerField()
+    to_year = serializers.IntegerField()
+    group_by = serializers.CharField(allow_null=True)
+    series = PriceSummaryResponse(many=True)
+    totals = PriceSummaryResponse(many=True)
 
 
 class ErrorResponse(serializers.Serializer):
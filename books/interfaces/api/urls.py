@@ -1,13 +1,35 @@
+from django.conf import settings
 from django.urls import path
 
 from books.interfaces.api.views import (
     AveragePriceAPIView,
+    BookAutocompleteAPIView,
+    BookBatchAPIView,
+    BookBulkAPIView,
+    BookChangesAPIView,
     BookDetailAPIView,
+    BookExportAPIView,
     BookListCreateAPIView,
+    BookSearchAPIView,
+    PriceAnalyticsAPIView,
 )
 
+if settings.BOOKS_ASYNC_VIEWS:
+    from books.interfaces.api.async_views import (
+        AsyncAveragePriceAPIView as AveragePriceAPIView,
+        AsyncBookDetailAPIView as BookDetailAPIView,
+        AsyncBookListCreateAPIView as BookListCreateAPIView,
+    )
+
 urlpatterns = [
     path("", BookListCreateAPIView.as_view(), name="book_list_create"),
+    path("bulk/", BookBulkAPIView.as_view(), name="book-bulk"),
+    path("batch/", BookBatchAPIView.as_view(), name="book-batch"),
+    path("export/", BookExportAPIView.as_view(), name="book-export"),
+    path("changes/", BookChangesAPIView.as_view(), name="book-changes"),
+    path("search/", BookSearchAPIView.as_view(), name="book-search"),
+    path("autocomplete/", BookAutocompleteAPIView.as_view(), name="book-autocomplete"),
     path("average-price/", AveragePriceAPIView.as_view(), name="average-price"),
+    path("analytics/", PriceAnalyticsAPIView.as_view(), name="price-analytics"),
     path("<str:book_id>/", BookDetailAPIView.as_view(), name="book-detail"),
 ]
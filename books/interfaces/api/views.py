@@ -1,286 +1,334 @@
+from collections import Counter
+from collections.abc import Callable
 from typing import Any
 
-from drf_spectacular.utils import (
-    OpenApiExample,
-    OpenApiParameter,
-    OpenApiResponse,
-    extend_schema,
-)
-from rest_framework import status
-from rest_framework.pagination import PageNumberPagination
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from pydantic import ValidationError
+from rest_framework import exceptions as drf_exceptions, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from books.application.services import BookService
-from books.infraestructure.repositories.book_repository_mongo import MongoBookRepository
-from books.interfaces import mappers
-from books.interfaces.api import serializers
-
-
-class CustomPagination(PageNumberPagination):
-    page_size = 10
-    page_query_param = "page"
-
-    def get_paginated_response(self, data):
-        return Response(
-            {
-                "count": self.page.paginator.count,
-                "page_size": self.get_page_size(self.request),
-                "current_page": self.page.number,
-                "total_pages": self.page.paginator.num_pages,
-                "next": self.get_next_link(),
-                "previous": self.get_previous_link(),
-                "results": data,
-            }
-        )
+from books.application.dto import output_dto
+from books.interfaces import dependencies, mappers
+from books.interfaces.api import exporters, serializers
+from books.interfaces.api.conditional import (
+    book_response,
+    conditional_get,
+    expected_version,
+)
+from books.interfaces.api.idempotency import idempotent
+from books.interfaces.api.pagination import BookCursorPagination, CustomPagination
 
 
 class _BookAPIView(APIView):
     permission_classes = [IsAuthenticated]
     pagination_class = CustomPagination
+    cursor_pagination_class = BookCursorPagination
 
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
-        self.service = BookService(MongoBookRepository())
+        self.service = dependencies.get_book_service()
+        self.idempotency_store = dependencies.get_idempotency_store()
 
 
 class BookListCreateAPIView(_BookAPIView):
-    @extend_schema(
-        operation_id="books_list",
-        responses=serializers.PaginatedBookResponse,
-        description="Listar todos los libros con paginación",
-        parameters=[
-            OpenApiParameter(
-                name="page", description="Número de página", required=False, type=int
-            ),
-        ],
-    )
+    @conditional_get
     def get(self, request: Request) -> Response:
+        if self.cursor_pagination_class.is_requested(request):
+            paginator = self.cursor_pagination_class()
+            list_books_dto = self._get_list_books_cursor_dto(request, paginator)
+            books_page = self.service.list_books_by_cursor(list_books_dto)
+            return paginator.get_paginated_response(books_page.results, page=books_page)
+
         paginator = self.pagination_class()
-        books = self.service.list_books()
-        results = paginator.paginate_queryset(books, request)
-        serialized = [b.model_dump() for b in results]
-        return paginator.get_paginated_response(serialized)
-
-    @extend_schema(
-        description="Crear un libro.",
-        request=serializers.CreateBookRequest,
-        responses={
-            201: OpenApiResponse(
-                response=serializers.CreateBookResponse,
-                description="Libro creado exitosamente",
-                examples=[
-                    OpenApiExample(
-                        "Respuesta exitosa",
-                        value={
-                            "id": "123e4567-e89b-12d3-a456-426614174000",
-                            "title": "Cien años de soledad",
-                            "author": "Gabriel García Márquez",
-                            "published_date": "1967-05-30",
-                            "genre": "Realismo mágico",
-                            "price": 19.99,
-                        },
-                    )
-                ],
-            ),
-            400: OpenApiResponse(
-                response=serializers.ErrorResponse,
-                description="Error de validación",
-                examples=[
-                    OpenApiExample(
-                        "Error de validación",
-                        value={"detail": "El campo 'title' es obligatorio."},
-                    )
-                ],
-            ),
-            401: OpenApiResponse(
-                response=serializers.ErrorResponse,
-                description="No autorizado",
-                examples=[
-                    OpenApiExample(
-                        "No autorizado",
-                        value={"detail": "Token inválido o expirado."},
-                    )
-                ],
-            ),
-            409: OpenApiResponse(
-                response=serializers.ErrorResponse,
-                description="Conflicto: libro ya existe",
-                examples=[
-                    OpenApiExample(
-                        "Conflicto",
-                        value={"detail": "El libro con ese título ya existe."},
-                    )
-                ],
-            ),
-            500: OpenApiResponse(
-                response=serializers.ErrorResponse,
-                description="Internal server error",
-                examples=[
-                    OpenApiExample(
-                        "Internal server error",
-                        value={"detail": "Internal server error."},
-                    )
-                ],
-            ),
-        },
-    )
+        books_page = self.service.list_books(
+            self._get_list_books_dto(request, paginator)
+        )
+        return paginator.get_paginated_response(
+            books_page.results, count=books_page.count
+        )
+
+    @staticmethod
+    def _get_list_books_dto(request: Request, paginator: CustomPagination):
+        page, page_size = paginator.get_page_params(request)
+        serializer = serializers.ListBooksRequest(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        return mappers.map_list_books_request_to_input_dto(
+            request_data=serializer.validated_data, page=page, page_size=page_size
+        )
+
+    @staticmethod
+    def _get_list_books_cursor_dto(request: Request, paginator: BookCursorPagination):
+        cursor_params = paginator.get_cursor_params(request)
+        serializer = serializers.ListBooksRequest(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        return mappers.map_list_books_cursor_request_to_input_dto(
+            request_data=serializer.validated_data, **cursor_params
+        )
+
+    @idempotent
     def post(self, request: Request) -> Response:
+        book = self.service.create_book(self._get_create_book_dto(request))
+        return Response(book, status=status.HTTP_201_CREATED)
+
+    @staticmethod
+    def _get_create_book_dto(request: Request):
         serializer = serializers.CreateBookRequest(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        book_dto = mappers.map_create_book_request_to_input_dto(
+        return mappers.map_create_book_request_to_input_dto(
             request_data=serializer.validated_data
         )
-        book = self.service.create_book(book_dto)
-        response_serializer = serializers.CreateBookResponse(book.model_dump())
-        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
 
-class BookDetailAPIView(_BookAPIView):
-    @extend_schema(
-        operation_id="book_by_id",
-        description="Obtener un libro por ID",
-        responses={
-            200: OpenApiResponse(
-                response=serializers.BookResponse,
-                description="Libro encontrado",
-                examples=[
-                    OpenApiExample(
-                        "Ejemplo",
-                        value={
-                            "id": "123e4567-e89b-12d3-a456-426614174000",
-                            "title": "Cien años de soledad",
-                            "author": "Gabriel García Márquez",
-                            "published_date": "1967-05-30",
-                            "genre": "Realismo mágico",
-                            "price": 19.99,
-                        },
-                    )
-                ],
-            ),
-            404: OpenApiResponse(
-                response=serializers.ErrorResponse,
-                description="Libro no encontrado",
-                examples=[
-                    OpenApiExample(
-                        "No encontrado", value={"detail": "Libro no encontrado"}
-                    )
-                ],
-            ),
-            401: OpenApiResponse(
-                response=serializers.ErrorResponse,
-                description="No autorizado",
-                examples=[
-                    OpenApiExample(
-                        "No autorizado", value={"detail": "Token inválido o expirado"}
-                    )
-                ],
-            ),
-        },
-    )
-    def get(self, _: Request, book_id: str) -> Response:
-        book = self.service.get_book(book_id=book_id)
-        response_serializer = serializers.BookResponse(book.model_dump())
-        return Response(response_serializer.data, status=status.HTTP_200_OK)
-
-    @extend_schema(
-        description="Actualizar un libro por ID",
-        request=serializers.UpdateBookRequest,
-        responses={
-            200: serializers.UpdateBookResponse,
-            400: OpenApiResponse(
-                response=serializers.ErrorResponse, description="Error de validación"
-            ),
-            401: OpenApiResponse(
-                response=serializers.ErrorResponse, description="No autorizado"
-            ),
-            404: OpenApiResponse(
-                response=serializers.ErrorResponse, description="Libro no encontrado"
+class BookBulkAPIView(_BookAPIView):
+    @idempotent
+    def post(self, request: Request) -> Response:
+        serializer = serializers.BulkCreateBooksRequest(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        dtos, positions, invalid = self._validate_items(
+            serializer.validated_data["books"],
+            serializers.CreateBookRequest,
+            lambda data: mappers.map_create_book_request_to_input_dto(
+                request_data=data
             ),
-            409: OpenApiResponse(
-                response=serializers.ErrorResponse,
-                description="Conflicto: libro ya existe",
+        )
+        results = self.service.bulk_create_books(dtos) if dtos else []
+        return self._bulk_response(results, positions, invalid)
+
+    def patch(self, request: Request) -> Response:
+        serializer = serializers.BulkUpdateBooksRequest(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        def to_input_dto(data: dict[str, Any]):
+            data = dict(data)
+            book_id = data.pop("id")
+            return mappers.map_update_book_request_to_input_dto(
+                request_data=data, book_id=book_id
+            )
+
+        dtos, positions, invalid = self._validate_items(
+            serializer.validated_data["books"],
+            serializers.BulkUpdateBookItemRequest,
+            to_input_dto,
+        )
+        results = self.service.bulk_update_books(dtos) if dtos else []
+        return self._bulk_response(results, positions, invalid)
+
+    def delete(self, request: Request) -> Response:
+        serializer = serializers.BulkDeleteBooksRequest(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        book_ids = serializer.validated_data["ids"]
+        results = self.service.bulk_delete_books(book_ids)
+        return self._bulk_response(results, list(range(len(book_ids))), [])
+
+    @staticmethod
+    def _validate_items(
+        items: list[dict[str, Any]],
+        serializer_class: type,
+        to_input_dto: Callable[[dict[str, Any]], Any],
+    ) -> tuple[list[Any], list[int], list[output_dto.BulkItemOutputDTO]]:
+        """Validates each item on its own so one bad row does not reject the
+        batch. Returns the valid DTOs, their positions and the invalid items."""
+        dtos, positions, invalid = [], [], []
+        for index, item in enumerate(items):
+            serializer = serializer_class(data=item)
+            try:
+                serializer.is_valid(raise_exception=True)
+                dtos.append(to_input_dto(serializer.validated_data))
+            except drf_exceptions.ValidationError as exc:
+                detail = "; ".join(
+                    f"{field}: {' '.join(str(m) for m in messages)}"
+                    for field, messages in exc.detail.items()
+                )
+            except ValidationError as exc:
+                detail = "; ".join(
+                    f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                    for error in exc.errors()
+                )
+            else:
+                positions.append(index)
+                continue
+            invalid.append(
+                mappers.map_invalid_bulk_item_to_output_dto(index=index, detail=detail)
+            )
+        return dtos, positions, invalid
+
+    @staticmethod
+    def _bulk_response(
+        results: list[output_dto.BulkItemOutputDTO],
+        positions: list[int],
+        invalid: list[output_dto.BulkItemOutputDTO],
+    ) -> Response:
+        for result in results:
+            result.index = positions[result.index]
+        results = sorted([*results, *invalid], key=lambda result: result.index)
+        summary = Counter(result.status for result in results)
+        return Response(
+            {"summary": dict(summary), "results": results}, status=status.HTTP_200_OK
+        )
+
+
+class BookBatchAPIView(_BookAPIView):
+    def post(self, request: Request) -> Response:
+        serializer = serializers.BatchGetBooksRequest(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        books = self.service.get_books(serializer.validated_data["ids"])
+        return Response(books, status=status.HTTP_200_OK)
+
+
+class BookSearchAPIView(_BookAPIView):
+    def get(self, request: Request) -> Response:
+        paginator = self.pagination_class()
+        page, page_size = paginator.get_page_params(request)
+        serializer = serializers.SearchBooksRequest(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        books_page = self.service.search_books(
+            mappers.map_search_books_request_to_input_dto(
+                request_data=serializer.validated_data,
+                page=page,
+                page_size=page_size,
+                max_results=settings.BOOKS_SEARCH_MAX_RESULTS,
+            )
+        )
+        return paginator.get_paginated_response(
+            books_page.results, count=books_page.count
+        )
+
+
+class BookAutocompleteAPIView(_BookAPIView):
+    def get(self, request: Request) -> Response:
+        serializer = serializers.SuggestBooksRequest(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        suggestions = self.service.suggest_books(
+            mappers.map_suggest_books_request_to_input_dto(
+                request_data=serializer.validated_data
+            )
+        )
+        return Response(suggestions, status=status.HTTP_200_OK)
+
+
+class BookExportAPIView(_BookAPIView):
+    formats = {
+        "ndjson": ("application/x-ndjson", exporters.ndjson_chunks),
+        "csv": ("text/csv; charset=utf-8", exporters.csv_chunks),
+    }
+
+    def perform_content_negotiation(self, request, force=False):
+        # The export media type is chosen with ?output=, not with Accept.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request: Request) -> StreamingHttpResponse:
+        serializer = serializers.ExportBooksRequest(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        output = serializer.validated_data["output"]
+        export_books_dto = mappers.map_export_books_request_to_input_dto(
+            request_data=serializer.validated_data,
+            batch_size=settings.BOOKS_EXPORT_BATCH_SIZE,
+        )
+        content_type, encode = self.formats[output]
+        response = StreamingHttpResponse(
+            encode(self.service.export_books(export_books_dto)),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="books.{output}"'
+        return response
+
+
+class BookChangesAPIView(_BookAPIView):
+    def perform_content_negotiation(self, request, force=False):
+        # Always NDJSON, whatever the Accept header.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request: Request) -> StreamingHttpResponse:
+        serializer = serializers.BookChangesRequest(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        book_changes_dto = mappers.map_book_changes_request_to_input_dto(
+            request_data=serializer.validated_data,
+            batch_size=settings.BOOKS_EXPORT_BATCH_SIZE,
+            settle_seconds=settings.BOOKS_CHANGES_SETTLE_SECONDS,
+        )
+        return StreamingHttpResponse(
+            exporters.changes_chunks(
+                self.service.list_changes(book_changes_dto),
+                since=book_changes_dto.since,
+                after_id=book_changes_dto.after_id,
             ),
-        },
-    )
+            content_type="application/x-ndjson",
+        )
+
+
+class BookDetailAPIView(_BookAPIView):
+    def get(self, request: Request, book_id: str) -> Response:
+        book = self.service.get_book(
+            book_id=book_id, fields=self._get_book_fields(request)
+        )
+        return book_response(request, book)
+
+    @staticmethod
+    def _get_book_fields(request: Request) -> list[str] | None:
+        serializer = serializers.BookFieldsRequest(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data.get("fields")
+
     def patch(self, request: Request, book_id: str) -> Response:
+        book = self.service.update_book(
+            self._get_update_book_dto(request, book_id),
+            expected_version=expected_version(request, book_id),
+        )
+        return book_response(request, book)
+
+    @staticmethod
+    def _get_update_book_dto(request: Request, book_id: str):
         serializer = serializers.UpdateBookRequest(data=request.data)
         serializer.is_valid(raise_exception=True)
-        book_dto = mappers.map_update_book_request_to_input_dto(
+        return mappers.map_update_book_request_to_input_dto(
             request_data=serializer.validated_data, book_id=book_id
         )
-        book = self.service.update_book(book_dto)
-        response_serializer = serializers.UpdateBookResponse(book.model_dump())
-        return Response(response_serializer.data, status=status.HTTP_200_OK)
-
-    @extend_schema(
-        description="Eliminar un libro por ID",
-        responses={
-            204: OpenApiResponse(
-                response=None, description="Libro eliminado exitosamente"
-            ),
-            404: OpenApiResponse(
-                response=serializers.ErrorResponse,
-                description="Libro no encontrado",
-                examples=[
-                    OpenApiExample(
-                        "No encontrado", value={"detail": "Libro no encontrado"}
-                    )
-                ],
-            ),
-            401: OpenApiResponse(
-                response=serializers.ErrorResponse,
-                description="No autorizado",
-                examples=[
-                    OpenApiExample(
-                        "No autorizado", value={"detail": "Token inválido o expirado"}
-                    )
-                ],
-            ),
-        },
-    )
-    def delete(self, _: Request, book_id: str) -> Response:
-        self.service.delete_book(book_id)
+
+    def delete(self, request: Request, book_id: str) -> Response:
+        self.service.delete_book(book_id, expected_version(request, book_id))
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class AveragePriceAPIView(_BookAPIView):
-    @extend_schema(
-        parameters=[
-            OpenApiParameter(
-                name="year",
-                type=int,
-                location=OpenApiParameter.QUERY,
-                description="Año",
-                required=True,
-            )
-        ],
-        responses={
-            200: serializers.GetAveragePriceResponse,
-            404: OpenApiResponse(
-                response=serializers.ErrorResponse,
-                description="Libros no encontrados para el año.",
-                examples=[
-                    OpenApiExample(
-                        "No encontrado", value={"detail": "Libros no encontrados"}
-                    )
-                ],
-            ),
-        },
-        description="Obtiene el promedio de precio de los libros publicados en un año especifico.",
-    )
+    @conditional_get
     def get(self, request: Request) -> Response:
-        print(request)
+        price_stats = self.service.get_price_stats(self._get_price_stats_dto(request))
+        return Response(price_stats, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _get_price_stats_dto(request: Request):
         serializer = serializers.GetAveragePriceRequest(data=request.query_params)
         serializer.is_valid(raise_exception=True)
+        return mappers.map_average_price_request_to_input_dto(
+            request_data=serializer.validated_data
+        )
+
 
-        year = serializer.validated_data["year"]
-        average_price = self.service.get_average_price_by_year(year)
+class PriceAnalyticsAPIView(_BookAPIView):
+    def get(self, request: Request) -> Response:
+        price_analytics = self.service.get_price_analytics(
+            self._get_price_analytics_dto(request)
+        )
+        return Response(price_analytics, status=status.HTTP_200_OK)
 
-        response_serializer = serializers.GetAveragePriceResponse(
-            {"average_price": average_price}
+    @staticmethod
+    def _get_price_analytics_dto(request: Request):
+        serializer = serializers.PriceAnalyticsRequest(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return mappers.map_price_analytics_request_to_input_dto(
+            request_data=serializer.validated_data
         )
-        return Response(response_serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,118 @@
+from functools import cache
+
+from django.conf import settings
+from django.core.cache import caches
+
+from books.application.services import AsyncBookService, BookService
+from books.domain.ports import AsyncBookRepository, BookRepository
+from books.infraestructure.autocomplete import PrefixIndex
+from books.infraestructure.cache import LRUTTLCache
+from books.infraestructure.idempotency import (
+    AsyncMongoIdempotencyStore,
+    MongoIdempotencyStore,
+)
+from books.infraestructure.repositories.book_repository_autocomplete import (
+    AsyncAutocompleteBookRepository,
+    AutocompleteBookRepository,
+)
+from books.infraestructure.repositories.book_repository_cached import (
+    AsyncCachedBookRepository,
+    CachedBookRepository,
+)
+from books.infraestructure.repositories.book_repository_mongo import MongoBookRepository
+from books.infraestructure.repositories.book_repository_mongo_async import (
+    AsyncMongoBookRepository,
+)
+from books.infraestructure.revocations import TokenRevocationList
+
+
+@cache
+def get_autocomplete_index() -> PrefixIndex:
+    """The index built by the sync repository and updated by both paths."""
+    return PrefixIndex()
+
+
+@cache
+def get_autocomplete_book_repository() -> AutocompleteBookRepository:
+    """The repository serving autocomplete from the in-process index.
+
+    Nothing is read until the index build starts: in a serving process, on
+    ASGI lifespan startup or on the first suggestion, never in management
+    commands.
+    """
+    return AutocompleteBookRepository(
+        MongoBookRepository(),
+        get_autocomplete_index(),
+        refresh_interval=settings.BOOKS_AUTOCOMPLETE_REFRESH_SECONDS,
+    )
+
+
+@cache
+def get_book_cache_tiers() -> dict:
+    """The cache tiers shared by the sync and async repositories, so a write
+    on either path evicts the book for both."""
+    return {
+        "local": LRUTTLCache(
+            max_entries=settings.BOOKS_CACHE_MAX_ENTRIES,
+            ttl=settings.BOOKS_CACHE_TTL_SECONDS,
+        ),
+        "shared": (
+            caches[settings.BOOKS_CACHE_BACKEND]
+            if settings.BOOKS_CACHE_BACKEND
+            else None
+        ),
+        "shared_timeout": settings.BOOKS_CACHE_BACKEND_TTL_SECONDS,
+    }
+
+
+@cache
+def get_book_repository() -> BookRepository:
+    repository = MongoBookRepository()
+    if settings.BOOKS_AUTOCOMPLETE_ENABLED:
+        repository = get_autocomplete_book_repository()
+    if not settings.BOOKS_CACHE_ENABLED:
+        return repository
+
+    return CachedBookRepository(repository, **get_book_cache_tiers())
+
+
+@cache
+def get_book_service() -> BookService:
+    return BookService(get_book_repository())
+
+
+@cache
+def get_async_book_repository() -> AsyncBookRepository:
+    repository = AsyncMongoBookRepository()
+    if settings.BOOKS_AUTOCOMPLETE_ENABLED:
+        repository = AsyncAutocompleteBookRepository(
+            repository, get_autocomplete_index()
+        )
+    if not settings.BOOKS_CACHE_ENABLED:
+        return repository
+
+    return AsyncCachedBookRepository(repository, **get_book_cache_tiers())
+
+
+@cache
+def get_async_book_service() -> AsyncBookService:
+    return AsyncBookService(get_async_book_repository())
+
+
+@cache
+def get_idempotency_store() -> MongoIdempotencyStore:
+    return MongoIdempotencyStore(ttl_seconds=settings.BOOKS_IDEMPOTENCY_TTL_SECONDS)
+
+
+@cache
+def get_async_idempotency_store() -> AsyncMongoIdempotencyStore:
+    return AsyncMongoIdempotencyStore(
+        ttl_seconds=settings.BOOKS_IDEMPOTENCY_TTL_SECONDS
+    )
+
+
+@cache
+def get_token_revocation_list() -> TokenRevocationList:
+    return TokenRevocationList(
+        refresh_interval=settings.BOOKS_AUTH_REVOCATION_REFRESH_SECONDS
+    )
@@ -0,0 +1,252 @@
+"""Streaming import of book catalogs from CSV or NDJSON files.
+
+Records are read and validated one batch at a time and written through
+``BookService.bulk_create_books`` (an unordered ``insert_many`` that keeps the
+price statistics and search fields current), so memory stays constant for any
+file size. Up to ``workers`` batches are written concurrently while the next
+ones are validated.
+
+Batches are completed in file order: after each one, its rejected records are
+appended to the rejects file and the number of the last record handled is
+saved to the checkpoint, which is where a resumed import starts. The batches
+in flight when an import stops may have been written, so on resume their
+duplicate titles are counted as already imported rather than rejected.
+"""
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, TextIO
+
+from pydantic import BaseModel, ValidationError
+from rest_framework import exceptions as drf_exceptions
+
+from books.application.dto import input_dto, output_dto
+from books.application.services import BookService
+from books.domain.models import BulkItemStatus
+from books.interfaces import mappers
+from books.interfaces.api import serializers
+
+FORMATS = ("csv", "ndjson")
+
+# (record number, counting from 1, and the row as read)
+Record = tuple[int, Any]
+
+
+class ImportCheckpoint(BaseModel):
+    source: str
+    # Last record of the completed batches.
+    record: int = 0
+    # Last record handed to the writers; batches after ``record`` may be in
+    # the database even though they were never completed.
+    submitted: int = 0
+    inserted: int = 0
+    rejected: int = 0
+
+    @classmethod
+    def load(cls, path: Path, source: str) -> "ImportCheckpoint":
+        """The saved checkpoint of ``source``, or a new one."""
+        try:
+            checkpoint = cls.model_validate_json(path.read_bytes())
+        except FileNotFoundError:
+            return cls(source=source)
+        if checkpoint.source != source:
+            raise ValueError(f"El checkpoint {path} es de otro archivo.")
+        return checkpoint
+
+    def save(self, path: Path) -> None:
+        # Replaced atomically, so an interruption leaves the old or new one.
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(self.model_dump_json())
+        os.replace(tmp_path, path)
+
+
+class ImportStats(BaseModel):
+    read: int = 0
+    inserted: int = 0
+    rejected: int = 0
+    already_imported: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+
+class _Batch(BaseModel):
+    last_record: int
+    records: list[Record] = []
+    dtos: list[input_dto.CreateBookInputDTO] = []
+    rejects: list[tuple[Record, str]] = []
+
+
+def detect_format(path: Path) -> str:
+    fmt = path.suffix.lower().lstrip(".")
+    if fmt == "jsonl":
+        return "ndjson"
+    if fmt not in FORMATS:
+        raise ValueError(f"No se reconoce el formato de {path}; use --format.")
+    return fmt
+
+
+def iter_records(file: TextIO, fmt: str) -> Iterator[Record]:
+    """CSV rows as dicts (the header names the fields) or NDJSON lines as
+    strings; blank NDJSON lines are not records."""
+    if fmt == "csv":
+        yield from enumerate(csv.DictReader(file), start=1)
+        return
+    lines = (line for line in file if line.strip())
+    yield from enumerate((line.rstrip("\r\n") for line in lines), start=1)
+
+
+def validate_record(fmt: str, row: Any) -> input_dto.CreateBookInputDTO:
+    """Validates the record with the rules of ``POST /api/books/``.
+
+    Raises:
+        ValueError: If the record is not a valid book (a pydantic
+            ``ValidationError`` for fields the DTO rejects).
+    """
+    if fmt == "csv":
+        if None in row:
+            raise ValueError("La fila tiene más columnas que el encabezado.")
+    else:
+        try:
+            row = json.loads(row)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"JSON inválido: {exc}") from None
+        if not isinstance(row, dict):
+            raise ValueError("El registro no es un objeto JSON.")
+
+    serializer = serializers.CreateBookRequest(data=row)
+    try:
+        serializer.is_valid(raise_exception=True)
+    except drf_exceptions.ValidationError as exc:
+        raise ValueError(
+            "; ".join(
+                f"{field}: {' '.join(str(m) for m in messages)}"
+                for field, messages in exc.detail.items()
+            )
+        ) from None
+    return mappers.map_create_book_request_to_input_dto(
+        request_data=serializer.validated_data
+    )
+
+
+class BookImporter:
+    def __init__(
+        self,
+        service: BookService,
+        fmt: str,
+        batch_size: int,
+        workers: int,
+        rejects: TextIO,
+        checkpoint_path: Path,
+        on_batch: Callable[[ImportStats], None] | None = None,
+    ) -> None:
+        self.service = service
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.workers = workers
+        self.rejects = rejects
+        self.checkpoint_path = checkpoint_path
+        self.on_batch = on_batch
+        # Records up to here may already be in the database (see the module).
+        self._written_before = 0
+
+    def run(
+        self, records: Iterable[Record], checkpoint: ImportCheckpoint
+    ) -> ImportStats:
+        """Imports the records after ``checkpoint.record``, updating it."""
+        stats = ImportStats()
+        start = time.perf_counter()
+        self._written_before = checkpoint.submitted
+        pending: deque[tuple[_Batch, Future]] = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for batch in self._batches(records, checkpoint.record):
+                checkpoint.submitted = max(checkpoint.submitted, batch.last_record)
+                checkpoint.save(self.checkpoint_path)
+                pending.append((batch, executor.submit(self._write, batch)))
+                if len(pending) > self.workers:
+                    self._complete(*pending.popleft(), checkpoint, stats, start)
+            while pending:
+                self._complete(*pending.popleft(), checkpoint, stats, start)
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    def _batches(self, records: Iterable[Record], after: int) -> Iterator[_Batch]:
+        batch = None
+        for number, row in records:
+            if number <= after:
+                continue
+            if batch is None:
+                batch = _Batch(last_record=number)
+            batch.last_record = number
+            try:
+                batch.dtos.append(validate_record(self.fmt, row))
+                batch.records.append((number, row))
+            except ValueError as exc:
+                batch.rejects.append(((number, row), _describe(exc)))
+            if len(batch.dtos) + len(batch.rejects) >= self.batch_size:
+                yield batch
+                batch = None
+        if batch is not None:
+            yield batch
+
+    def _write(self, batch: _Batch) -> list[output_dto.BulkItemOutputDTO]:
+        return self.service.bulk_create_books(batch.dtos) if batch.dtos else []
+
+    def _complete(
+        self,
+        batch: _Batch,
+        future: Future,
+        checkpoint: ImportCheckpoint,
+        stats: ImportStats,
+        start: float,
+    ) -> None:
+        rejects = list(batch.rejects)
+        inserted = already_imported = 0
+        for result in future.result():
+            record = batch.records[result.index]
+            if result.status == BulkItemStatus.CREATED:
+                inserted += 1
+            elif (
+                result.status == BulkItemStatus.DUPLICATE_TITLE
+                and record[0] <= self._written_before
+            ):
+                already_imported += 1
+            else:
+                rejects.append((record, result.detail))
+        for (number, row), error in sorted(rejects, key=lambda reject: reject[0][0]):
+            self.rejects.write(
+                json.dumps(
+                    {"record": number, "error": error, "row": row}, ensure_ascii=False
+                )
+                + "\n"
+            )
+        self.rejects.flush()
+
+        stats.read += len(batch.records) + len(batch.rejects)
+        stats.inserted += inserted
+        stats.rejected += len(rejects)
+        stats.already_imported += already_imported
+        stats.elapsed = time.perf_counter() - start
+        checkpoint.record = batch.last_record
+        checkpoint.inserted += inserted + already_imported
+        checkpoint.rejected += len(rejects)
+        checkpoint.save(self.checkpoint_path)
+        if self.on_batch is not None:
+            self.on_batch(stats)
+
+
+def _describe(exc: ValueError) -> str:
+    if not isinstance(exc, ValidationError):
+        return str(exc)
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
@@ -0,0 +1,39 @@
+"""ASGI lifespan for the async request path.
+
+Django's ASGI handler only serves HTTP, so ``bookmanager.asgi`` wraps it with
+``with_lifespan``: the worker opens its ``AsyncMongoClient`` on startup, on the
+loop that will serve its requests, and closes it on shutdown. Startup also
+begins building the autocomplete index, which WSGI workers build on their first
+suggestion instead.
+"""
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from django.conf import settings
+
+from books.infraestructure import mongodb
+from books.interfaces import dependencies
+
+ASGIApp = Callable[[dict, Callable, Callable], Awaitable[None]]
+
+
+def with_lifespan(application: ASGIApp) -> ASGIApp:
+    async def app(scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "lifespan":
+            await application(scope, receive, send)
+            return
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                mongodb.get_async_mongo_client()
+                if settings.BOOKS_AUTOCOMPLETE_ENABLED:
+                    dependencies.get_autocomplete_book_repository().start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await mongodb.close_async_mongo_client()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    return app
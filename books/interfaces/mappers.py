@@ -1,6 +1,7 @@
 from typing import Any
 
-from books.application.dto import input_dto
+from books.application.dto import input_dto, output_dto
+from books.domain.models import BulkItemStatus
 
 
 def map_create_book_request_to_input_dto(
@@ -14,3 +15,65 @@ def map_update_book_request_to_input_dto(
     *, request_data: dict[str, Any], book_id: str
 ) -> input_dto.UpdateBookInputDTO:
     return input_dto.UpdateBookInputDTO(id=book_id, **request_data)
+
+
+def map_list_books_request_to_input_dto(
+    *, request_data: dict[str, Any], page: int, page_size: int
+) -> input_dto.ListBooksInputDTO:
+    return input_dto.ListBooksInputDTO(page=page, page_size=page_size, **request_data)
+
+
+def map_list_books_cursor_request_to_input_dto(
+    *, request_data: dict[str, Any], **cursor_params: Any
+) -> input_dto.ListBooksCursorInputDTO:
+    request_data = {k: v for k, v in request_data.items() if k != "sort"}
+    return input_dto.ListBooksCursorInputDTO(**cursor_params, **request_data)
+
+
+def map_search_books_request_to_input_dto(
+    *, request_data: dict[str, Any], page: int, page_size: int, max_results: int
+) -> input_dto.SearchBooksInputDTO:
+    return input_dto.SearchBooksInputDTO(
+        page=page, page_size=page_size, max_results=max_results, **request_data
+    )
+
+
+def map_suggest_books_request_to_input_dto(
+    *, request_data: dict[str, Any]
+) -> input_dto.SuggestBooksInputDTO:
+    return input_dto.SuggestBooksInputDTO(**request_data)
+
+
+def map_export_books_request_to_input_dto(
+    *, request_data: dict[str, Any], batch_size: int
+) -> input_dto.ExportBooksInputDTO:
+    request_data = {k: v for k, v in request_data.items() if k != "output"}
+    return input_dto.ExportBooksInputDTO(batch_size=batch_size, **request_data)
+
+
+def map_book_changes_request_to_input_dto(
+    *, request_data: dict[str, Any], batch_size: int, settle_seconds: float
+) -> input_dto.BookChangesInputDTO:
+    return input_dto.BookChangesInputDTO(
+        batch_size=batch_size, settle_seconds=settle_seconds, **request_data
+    )
+
+
+def map_average_price_request_to_input_dto(
+    *, request_data: dict[str, Any]
+) -> input_dto.PriceStatsInputDTO:
+    return input_dto.PriceStatsInputDTO(**request_data)
+
+
+def map_price_analytics_request_to_input_dto(
+    *, request_data: dict[str, Any]
+) -> input_dto.PriceAnalyticsInputDTO:
+    return input_dto.PriceAnalyticsInputDTO(**request_data)
+
+
+def map_invalid_bulk_item_to_output_dto(
+    *, index: int, detail: str
+) -> output_dto.BulkItemOutputDTO:
+    return output_dto.BulkItemOutputDTO(
+        index=index, status=BulkItemStatus.INVALID.value, detail=detail
+    )
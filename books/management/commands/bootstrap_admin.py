@@ -0,0 +1,25 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Crea el usuario administrador definido por DEFAULT_ADMIN_USER, "
+        "DEFAULT_ADMIN_EMAIL y DEFAULT_ADMIN_PASSWORD si aún no existe. "
+        "Es idempotente: ejecútelo tras migrate en cada despliegue."
+    )
+
+    def handle(self, *args, **options):
+        username = os.getenv("DEFAULT_ADMIN_USER", "admin")
+        email = os.getenv("DEFAULT_ADMIN_EMAIL", "admin@example.com")
+        password = os.getenv("DEFAULT_ADMIN_PASSWORD", "admin123")
+
+        User = get_user_model()
+        if User.objects.filter(username=username).exists():
+            self.stdout.write(f"El usuario admin '{username}' ya existe.")
+            return
+
+        User.objects.create_superuser(username=username, email=email, password=password)
+        self.stdout.write(self.style.SUCCESS(f"Usuario admin '{username}' creado."))
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from books.interfaces.api.openapi import SCHEMA_FILES, RenderedSchema, render_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera el esquema OpenAPI (YAML y JSON) en BOOKS_SCHEMA_DIR para que "
+        "los workers lo sirvan sin generarlo. Ejecútelo al construir la imagen."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-dir",
+            default=settings.BOOKS_SCHEMA_DIR,
+            help="Directorio de salida (por defecto BOOKS_SCHEMA_DIR).",
+        )
+
+    def handle(self, *args, **options):
+        if not options["output_dir"]:
+            raise CommandError("Defina BOOKS_SCHEMA_DIR o pase --output-dir.")
+
+        directory = Path(options["output_dir"])
+        directory.mkdir(parents=True, exist_ok=True)
+        for fmt, content in render_schema().items():
+            path = directory / SCHEMA_FILES[fmt]
+            path.write_bytes(content)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{path}: {len(content)} bytes, ETag {RenderedSchema.of(content).etag}"
+                )
+            )
@@ -0,0 +1,116 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from books.interfaces import dependencies
+from books.interfaces.importers import (
+    FORMATS,
+    BookImporter,
+    ImportCheckpoint,
+    ImportStats,
+    detect_format,
+    iter_records,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa libros desde un archivo CSV o NDJSON (campos title, author, "
+        "published_date, genre, price) en lotes. Las filas rechazadas se "
+        "escriben en un archivo aparte y, con --resume, una importación "
+        "interrumpida continúa desde el último lote completado."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path)
+        parser.add_argument("--format", choices=FORMATS, help="Por la extensión.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers", type=int, default=1, help="Lotes escritos en paralelo."
+        )
+        parser.add_argument(
+            "--rejects", type=Path, help="Por defecto <path>.rejects.ndjson."
+        )
+        parser.add_argument(
+            "--checkpoint", type=Path, help="Por defecto <path>.checkpoint.json."
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continúa desde el checkpoint en vez de empezar de cero.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if options["batch_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--batch-size y --workers deben ser mayores que 0.")
+        try:
+            fmt = options["format"] or detect_format(path)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        rejects_path = options["rejects"] or path.with_name(
+            f"{path.name}.rejects.ndjson"
+        )
+        checkpoint_path = options["checkpoint"] or path.with_name(
+            f"{path.name}.checkpoint.json"
+        )
+
+        checkpoint = ImportCheckpoint(source=str(path.resolve()))
+        if options["resume"]:
+            try:
+                checkpoint = ImportCheckpoint.load(checkpoint_path, checkpoint.source)
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(f"Continuando tras el registro {checkpoint.record}.")
+
+        last_report = time.monotonic()
+
+        def report(stats: ImportStats) -> None:
+            nonlocal last_report
+            if time.monotonic() - last_report >= 5 or options["verbosity"] > 1:
+                last_report = time.monotonic()
+                self.stdout.write(self._summary(stats))
+
+        try:
+            with (
+                path.open(newline="", encoding="utf-8-sig") as file,
+                rejects_path.open(
+                    "a" if options["resume"] else "w", encoding="utf-8"
+                ) as rejects,
+            ):
+                importer = BookImporter(
+                    service=dependencies.get_book_service(),
+                    fmt=fmt,
+                    batch_size=options["batch_size"],
+                    workers=options["workers"],
+                    rejects=rejects,
+                    checkpoint_path=checkpoint_path,
+                    on_batch=report,
+                )
+                stats = importer.run(iter_records(file, fmt), checkpoint)
+        except FileNotFoundError as exc:
+            raise CommandError(f"No existe el archivo {exc.filename}.")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Importación completa. {self._summary(stats)}")
+        )
+        if checkpoint.rejected:
+            self.stdout.write(
+                f"{checkpoint.rejected} filas rechazadas en total: {rejects_path}"
+            )
+        checkpoint_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _summary(stats: ImportStats) -> str:
+        return (
+            f"{stats.read} leídos, {stats.inserted} insertados, "
+            f"{stats.rejected} rechazados"
+            + (
+                f", {stats.already_imported} ya importados antes de la interrupción"
+                if stats.already_imported
+                else ""
+            )
+            + f" en {stats.elapsed:.1f} s "
+            f"({stats.rows_per_second:,.0f} filas/s)."
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from books.interfaces import dependencies
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula desde cero las estadísticas de precio por año y por género. "
+        "Las escrituras concurrentes pueden quedar fuera del recálculo; "
+        "ejecútelo en una ventana de baja escritura."
+    )
+
+    def handle(self, *args, **options):
+        groups = dependencies.get_book_service().rebuild_price_stats()
+        self.stdout.write(
+            self.style.SUCCESS(f"Estadísticas de precio recalculadas: {groups} grupos.")
+        )
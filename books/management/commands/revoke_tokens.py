@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from books.interfaces.api.authentication import revoke_user_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Revoca todos los tokens de acceso emitidos hasta ahora a un usuario. "
+        "Con BOOKS_AUTH_STATELESS, cada worker lo aplica en menos de "
+        "BOOKS_AUTH_REVOCATION_REFRESH_SECONDS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"El usuario '{options['username']}' no existe.")
+
+        revoke_user_tokens(user)
+        self.stdout.write(
+            self.style.SUCCESS(f"Tokens de '{user.get_username()}' revocados.")
+        )
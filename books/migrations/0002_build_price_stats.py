@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def build_price_stats(apps, schema_editor):
+    """
+    Builds the price statistics for the books already stored, including the
+    ones seeded by 0001 which bypass the repository.
+    """
+    from books.infraestructure.repositories.book_repository_mongo import (
+        MongoBookRepository,
+    )
+
+    try:
+        groups = MongoBookRepository().rebuild_price_stats()
+        print(f"✅ Built price stats for {groups} groups.")
+    except Exception as e:
+        print(f"Failed to build price stats: {e}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [("books", "0001_seed_books_mongo")]
+
+    operations = [
+        migrations.RunPython(build_price_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from django.db import migrations
+from pymongo import ASCENDING, UpdateOne
+
+BATCH_SIZE = 1000
+
+
+def normalize_published_date(apps, schema_editor):
+    """
+    Rewrites "%Y-%m-%d" string dates (written by 0001) as BSON dates in batches,
+    drops the redundant 'year' field, creates the index plan and rebuilds the
+    price statistics, so year filters are index range scans over one type.
+    """
+    from books.infraestructure import indexes, mongodb
+    from books.infraestructure.repositories.book_repository_mongo import (
+        MongoBookRepository,
+    )
+
+    try:
+        books = mongodb.get_mongo_database()[indexes.BOOKS_COLLECTION]
+
+        converted, last_id = 0, None
+        while True:
+            query = {"published_date": {"$type": "string"}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            docs = list(
+                books.find(query, {"published_date": 1})
+                .sort("_id", ASCENDING)
+                .limit(BATCH_SIZE)
+            )
+            if not docs:
+                break
+
+            operations = []
+            for doc in docs:
+                try:
+                    published_date = datetime.strptime(
+                        doc["published_date"], "%Y-%m-%d"
+                    )
+                except ValueError:
+                    print(f"Skipping book {doc['_id']}: {doc['published_date']!r}")
+                    continue
+                operations.append(
+                    UpdateOne(
+                        {"_id": doc["_id"]},
+                        {
+                            "$set": {"published_date": published_date},
+                            "$unset": {"year": ""},
+                        },
+                    )
+                )
+            if operations:
+                converted += books.bulk_write(operations, ordered=False).modified_count
+            last_id = docs[-1]["_id"]
+
+        books.update_many({"year": {"$exists": True}}, {"$unset": {"year": ""}})
+        indexes.create_indexes(mongodb.get_mongo_database())
+        # Year statistics only count BSON dates, so they need the new values.
+        MongoBookRepository().rebuild_price_stats()
+        print(f"✅ Normalized published_date on {converted} books.")
+    except Exception as e:
+        print(f"Failed to normalize published_date: {e}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [("books", "0002_build_price_stats")]
+
+    operations = [
+        migrations.RunPython(normalize_published_date, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+from pymongo import ASCENDING, UpdateOne
+
+BATCH_SIZE = 1000
+
+
+def backfill_search_fields(apps, schema_editor):
+    """
+    Writes title_normalized/author_normalized on the books created before the
+    search, in batches, and creates the text and prefix indexes.
+    """
+    from books.infraestructure import indexes, mongodb
+    from books.infraestructure.repositories import search
+
+    try:
+        books = mongodb.get_mongo_database()[indexes.BOOKS_COLLECTION]
+        fields = {field: 1 for field in search.NORMALIZED_FIELDS}
+        missing = {
+            "$or": [
+                {normalized: {"$exists": False}}
+                for normalized in search.NORMALIZED_FIELDS.values()
+            ]
+        }
+
+        updated, last_id = 0, None
+        while True:
+            query = dict(missing)
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            docs = list(
+                books.find(query, fields).sort("_id", ASCENDING).limit(BATCH_SIZE)
+            )
+            if not docs:
+                break
+
+            operations = [
+                UpdateOne({"_id": doc["_id"]}, {"$set": search.normalized_fields(doc)})
+                for doc in docs
+                if search.normalized_fields(doc)
+            ]
+            if operations:
+                updated += books.bulk_write(operations, ordered=False).modified_count
+            last_id = docs[-1]["_id"]
+
+        indexes.create_indexes(mongodb.get_mongo_database())
+        print(f"✅ Backfilled search fields on {updated} books.")
+    except Exception as e:
+        print(f"Failed to backfill search fields: {e}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [("books", "0003_normalize_published_date")]
+
+    operations = [
+        migrations.RunPython(backfill_search_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def backfill_book_version(apps, schema_editor):
+    """
+    Gives the books created before optimistic concurrency their first version,
+    so If-Match can be used on them.
+    """
+    from books.infraestructure import indexes, mongodb
+
+    try:
+        books = mongodb.get_mongo_database()[indexes.BOOKS_COLLECTION]
+        result = books.update_many(
+            {"version": {"$exists": False}}, {"$set": {"version": 1}}
+        )
+        print(f"✅ Backfilled version on {result.modified_count} books.")
+    except Exception as e:
+        print(f"Failed to backfill book versions: {e}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [("books", "0004_backfill_search_fields")]
+
+    operations = [
+        migrations.RunPython(backfill_book_version, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+def backfill_book_timestamps(apps, schema_editor):
+    """
+    Dates the books created before delta sync with the creation time held in
+    their ObjectId, in one server-side update, and creates the change indexes.
+    """
+    from books.infraestructure import indexes, mongodb
+
+    try:
+        database = mongodb.get_mongo_database()
+        result = database[indexes.BOOKS_COLLECTION].update_many(
+            {"updated_at": {"$exists": False}},
+            [
+                {
+                    "$set": {
+                        "created_at": {"$ifNull": ["$created_at", {"$toDate": "$_id"}]},
+                        "updated_at": {"$toDate": "$_id"},
+                    }
+                }
+            ],
+        )
+        indexes.create_indexes(database)
+        print(f"✅ Backfilled timestamps on {result.modified_count} books.")
+    except Exception as e:
+        print(f"Failed to backfill book timestamps: {e}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [("books", "0005_backfill_book_version")]
+
+    operations = [
+        migrations.RunPython(backfill_book_timestamps, migrations.RunPython.noop),
+    ]
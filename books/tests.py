@@ -1,10 +1,93 @@
+import asyncio
+import base64
+import io
+import json
+import tempfile
 import unittest
-from datetime import date
-from unittest.mock import MagicMock, patch
+from datetime import date, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from books.application.dto import input_dto
-from books.application.services import BookService
+import mongomock
+from bson import ObjectId
+from django.core.management import call_command
+from django.test import Client, override_settings
+from mongomock.collection import BulkOperationBuilder
+from rest_framework.exceptions import AuthenticationFailed, ParseError
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.application.dto import input_dto, output_dto
+from books.application.services import AsyncBookService, BookService
 from books.domain import exceptions
+from books.domain.models import (
+    Book,
+    BookChangesQuery,
+    BookSearchMode,
+    BookSearchQuery,
+    BulkItemResult,
+    BulkItemStatus,
+    PriceAnalytics,
+    PriceAnalyticsGroupBy,
+    PriceStats,
+    PriceStatsDimension,
+    PriceSummary,
+)
+from books.infraestructure import mongodb
+from books.infraestructure.autocomplete import PrefixIndex
+from books.infraestructure.cache import LRUTTLCache
+from books.infraestructure.idempotency import IdempotencyRecord
+from books.infraestructure.indexes import BOOK_TOMBSTONE_INDEXES
+from books.infraestructure.repositories import (
+    documents,
+    price_stats,
+    queries,
+    search,
+)
+from books.infraestructure.repositories.book_repository_autocomplete import (
+    AsyncAutocompleteBookRepository,
+    AutocompleteBookRepository,
+)
+from books.infraestructure.repositories.book_repository_cached import (
+    AsyncCachedBookRepository,
+    CachedBookRepository,
+)
+from books.infraestructure.repositories.book_repository_mongo import (
+    MongoBookRepository,
+)
+from books.infraestructure.repositories.book_repository_mongo_async import (
+    AsyncMongoBookRepository,
+)
+from books.infraestructure.revocations import TokenRevocationList
+from books.interfaces import dependencies
+from books.interfaces.api import exporters, openapi
+from books.interfaces.api.authentication import StatelessJWTAuthentication
+from books.interfaces.api.conditional import (
+    book_response,
+    build_book_etag,
+    build_etag,
+    conditional_get,
+    expected_version,
+)
+from books.interfaces.api.idempotency import IdempotencyKeyReused, idempotent
+from books.interfaces.api.parsers import PydanticJSONParser
+from books.interfaces.api.renderers import PydanticJSONRenderer
+from books.interfaces.api.views import BookListCreateAPIView
+from books.interfaces.importers import BookImporter, ImportCheckpoint
+from books.interfaces.lifespan import with_lifespan
+
+
+def _book_output_dto(book_id: str) -> output_dto.BookOutputDTO:
+    return output_dto.BookOutputDTO(
+        id=book_id,
+        title=f"Book {book_id}",
+        author="John",
+        published_date=date(2024, 1, 1),
+        genre="Fiction",
+        price=10,
+    )
 
 
 class TestBookService(unittest.TestCase):
@@ -15,14 +98,92 @@ class TestBookService(unittest.TestCase):
     @patch("books.application.services.mappers.map_books_to_output_dto")
     def test_list_books(self, mock_mapper):
         books = ["book1", "book2"]
+        mapped = [_book_output_dto("1"), _book_output_dto("2")]
+        self.repository.count_books.return_value = 12
         self.repository.list_books.return_value = books
-        mock_mapper.return_value = ["mapped1", "mapped2"]
+        mock_mapper.return_value = mapped
+        dto = input_dto.ListBooksInputDTO(
+            page=2, page_size=5, sort=["-price"], genre="AI", published_year=2020
+        )
+
+        result = self.service.list_books(dto)
+
+        query = self.repository.list_books.call_args.kwargs["query"]
+        self.assertEqual(query.skip, 5)
+        self.assertEqual(query.limit, 5)
+        self.assertEqual(query.sort, ["-price"])
+        self.assertEqual(query.filters.genre, "AI")
+        self.assertEqual(query.filters.published_year, 2020)
+        self.repository.count_books.assert_called_once_with(filters=query.filters)
+        mock_mapper.assert_called_once_with(books=books, fields=None)
+        self.assertEqual(result.count, 12)
+        self.assertEqual(result.results, mapped)
+
+    def test_list_books_out_of_range_skips_query(self):
+        self.repository.count_books.return_value = 3
+
+        result = self.service.list_books(input_dto.ListBooksInputDTO(page=2))
+
+        self.repository.list_books.assert_not_called()
+        self.assertEqual(result.count, 3)
+        self.assertEqual(result.results, [])
+
+    def test_list_books_by_cursor_forward(self):
+        books = [MagicMock(id=str(i), price=float(i)) for i in range(3)]
+        self.repository.list_books_after.return_value = books
+        dto = input_dto.ListBooksCursorInputDTO(
+            page_size=2,
+            sort_field="price",
+            cursor=input_dto.BookCursorInputDTO(sort_value=0.5, id="0"),
+        )
 
-        result = self.service.list_books()
+        with patch(
+            "books.application.services.mappers.map_books_to_output_dto",
+            return_value=[],
+        ) as mock_mapper:
+            result = self.service.list_books_by_cursor(dto)
 
-        self.repository.list_books.assert_called_once()
-        mock_mapper.assert_called_once_with(books=books)
-        self.assertEqual(result, ["mapped1", "mapped2"])
+        query = self.repository.list_books_after.call_args.kwargs["query"]
+        self.assertEqual(query.limit, 3)
+        self.assertEqual((query.after_value, query.after_id), (0.5, "0"))
+        mock_mapper.assert_called_once_with(books=books[:2], fields=None)
+        self.assertEqual(result.next_cursor.id, "1")
+        self.assertEqual(result.next_cursor.sort_value, 1.0)
+        self.assertEqual(result.previous_cursor.id, "0")
+
+    def test_list_books_by_cursor_backwards_reverses_page(self):
+        books = [MagicMock(id=str(i), price=float(i)) for i in (5, 4)]
+        self.repository.list_books_after.return_value = books
+        dto = input_dto.ListBooksCursorInputDTO(
+            page_size=2,
+            sort_field="price",
+            cursor=input_dto.BookCursorInputDTO(sort_value=6.0, id="6"),
+            backwards=True,
+        )
+
+        with patch(
+            "books.application.services.mappers.map_books_to_output_dto",
+            return_value=[],
+        ) as mock_mapper:
+            result = self.service.list_books_by_cursor(dto)
+
+        mock_mapper.assert_called_once_with(books=[books[1], books[0]], fields=None)
+        self.assertEqual(result.next_cursor.id, "5")
+        self.assertIsNone(result.previous_cursor)
+
+    @patch("books.application.services.mappers.map_book_to_output_dto")
+    def test_export_books_streams_repository_iterator(self, mock_mapper):
+        self.repository.iter_books.return_value = iter(["book1", "book2"])
+        mock_mapper.side_effect = lambda book: f"mapped-{book}"
+        dto = input_dto.ExportBooksInputDTO(genre="AI", batch_size=500)
+
+        result = self.service.export_books(dto)
+
+        self.repository.iter_books.assert_not_called()
+        self.assertEqual(list(result), ["mapped-book1", "mapped-book2"])
+        kwargs = self.repository.iter_books.call_args.kwargs
+        self.assertEqual(kwargs["batch_size"], 500)
+        self.assertEqual(kwargs["filters"].genre, "AI")
 
     @patch("books.application.services.mappers.map_book_to_output_dto")
     def test_get_book_success(self, mock_mapper):
@@ -32,10 +193,35 @@ class TestBookService(unittest.TestCase):
 
         result = self.service.get_book("123")
 
-        self.repository.get_book.assert_called_once_with(book_id="123")
-        mock_mapper.assert_called_once_with(book=book)
+        self.repository.get_book.assert_called_once_with(book_id="123", fields=None)
+        mock_mapper.assert_called_once_with(book=book, fields=None)
         self.assertEqual(result, "book_dto")
 
+    def test_get_book_with_fields_returns_only_those_fields(self):
+        self.repository.get_book.return_value = Book(
+            id="123", title="A", price=10, version=2
+        )
+
+        result = self.service.get_book("123", fields=["title", "price"])
+
+        self.repository.get_book.assert_called_once_with(
+            book_id="123", fields=["title", "price"]
+        )
+        self.assertEqual(
+            result.model_dump(), {"id": "123", "title": "A", "price": 10, "version": 2}
+        )
+
+    def test_get_books_keeps_request_order_and_reports_missing(self):
+        self.repository.get_books.return_value = [
+            Book(**_book_output_dto(book_id).model_dump()) for book_id in ("1", "3")
+        ]
+
+        result = self.service.get_books(["3", "2", "1", "3"])
+
+        self.repository.get_books.assert_called_once_with(["3", "2", "1", "3"])
+        self.assertEqual([book.id for book in result.results], ["3", "1"])
+        self.assertEqual(result.missing_ids, ["2"])
+
     def test_get_book_not_found(self):
         self.repository.get_book.return_value = None
 
@@ -94,7 +280,9 @@ class TestBookService(unittest.TestCase):
         result = self.service.update_book(dto)
 
         mock_input_mapper.assert_called_once_with(update_book_input_dto=dto)
-        self.repository.update_book.assert_called_once_with(data=mapped_data)
+        self.repository.update_book.assert_called_once_with(
+            data=mapped_data, expected_version=None
+        )
         mock_output_mapper.assert_called_once_with(book=updated_book)
         self.assertEqual(result, "updated_dto")
 
@@ -119,7 +307,9 @@ class TestBookService(unittest.TestCase):
     def test_delete_book_success(self):
         self.repository.delete_book.return_value = True
         self.service.delete_book("1")
-        self.repository.delete_book.assert_called_once_with("1")
+        self.repository.delete_book.assert_called_once_with(
+            book_id="1", expected_version=None
+        )
 
     def test_delete_book_not_found(self):
         self.repository.delete_book.return_value = False
@@ -127,17 +317,1228 @@ class TestBookService(unittest.TestCase):
         with self.assertRaises(exceptions.BookNotFoundError):
             self.service.delete_book("1")
 
-    def test_get_average_price_by_year_success(self):
-        self.repository.get_average_price_by_year.return_value = 42.5
-        result = self.service.get_average_price_by_year(2020)
-        self.assertEqual(result, 42.5)
-        self.repository.get_average_price_by_year.assert_called_once_with(2020)
+    def test_bulk_create_books_reports_duplicates(self):
+        dtos = [
+            input_dto.CreateBookInputDTO(
+                title=title,
+                author="John",
+                price=10,
+                published_date=date(2024, 1, 1),
+                genre="Fiction",
+            )
+            for title in ("Book A", "Book B")
+        ]
+        self.repository.bulk_create.return_value = [
+            BulkItemResult(index=0, status=BulkItemStatus.CREATED, id="1"),
+            BulkItemResult(index=1, status=BulkItemStatus.DUPLICATE_TITLE),
+        ]
+
+        result = self.service.bulk_create_books(dtos)
+
+        books = self.repository.bulk_create.call_args.args[0]
+        self.assertEqual([book.title for book in books], ["Book A", "Book B"])
+        self.assertEqual([r.status for r in result], ["created", "duplicate_title"])
+        self.assertEqual(result[0].id, "1")
+        self.assertIn("Book B", result[1].detail)
+
+    def test_bulk_delete_books_reports_not_found(self):
+        self.repository.bulk_delete.return_value = [
+            BulkItemResult(index=0, status=BulkItemStatus.DELETED, id="1"),
+            BulkItemResult(index=1, status=BulkItemStatus.NOT_FOUND, id="2"),
+        ]
+
+        result = self.service.bulk_delete_books(["1", "2"])
+
+        self.repository.bulk_delete.assert_called_once_with(["1", "2"])
+        self.assertEqual([r.status for r in result], ["deleted", "not_found"])
+        self.assertIn("'2'", result[1].detail)
+
+    def test_search_books_counts_up_to_max_results(self):
+        self.repository.count_search_results.return_value = 1000
+        self.repository.search_books.return_value = [
+            Book(**_book_output_dto("1").model_dump())
+        ]
+        dto = input_dto.SearchBooksInputDTO(
+            q="ga", mode="prefix", page=3, page_size=5, max_results=1000
+        )
+
+        result = self.service.search_books(dto)
+
+        query = self.repository.search_books.call_args.kwargs["query"]
+        self.assertEqual((query.text, query.mode), ("ga", BookSearchMode.PREFIX))
+        self.assertEqual((query.skip, query.limit), (10, 5))
+        self.repository.count_search_results.assert_called_once_with(
+            query=query, limit=1000
+        )
+        self.assertEqual(result.count, 1000)
+
+    def test_get_price_stats_by_year_success(self):
+        self.repository.get_price_stats.return_value = PriceStats(
+            dimension=PriceStatsDimension.YEAR,
+            key=2020,
+            count=4,
+            total=170,
+            min_price=10,
+            max_price=80,
+        )
+
+        result = self.service.get_price_stats(input_dto.PriceStatsInputDTO(year=2020))
+
+        self.assertEqual(result.average_price, 42.5)
+        self.assertEqual((result.min_price, result.max_price), (10, 80))
+        self.repository.get_price_stats.assert_called_once_with(
+            PriceStatsDimension.YEAR, 2020
+        )
+
+    def test_get_price_stats_by_genre(self):
+        self.service.get_price_stats(input_dto.PriceStatsInputDTO(genre="AI"))
 
-    def test_get_average_price_by_year_not_found(self):
-        self.repository.get_average_price_by_year.return_value = None
+        self.repository.get_price_stats.assert_called_once_with(
+            PriceStatsDimension.GENRE, "AI"
+        )
+
+    def test_get_price_analytics_maps_percentiles(self):
+        summary = PriceSummary(
+            year=2020,
+            group="AI",
+            count=3,
+            average_price=20,
+            min_price=10,
+            max_price=30,
+            percentiles={50: 20, 90: 30},
+        )
+        self.repository.get_price_analytics.return_value = PriceAnalytics(
+            series=[summary], totals=[summary.model_copy(update={"year": None})]
+        )
+        dto = input_dto.PriceAnalyticsInputDTO(
+            from_year=2019, to_year=2020, group_by="genre", percentiles=[50, 90]
+        )
+
+        result = self.service.get_price_analytics(dto)
+
+        query = self.repository.get_price_analytics.call_args.args[0]
+        self.assertEqual((query.from_year, query.to_year), (2019, 2020))
+        self.assertEqual(query.group_by, PriceAnalyticsGroupBy.GENRE)
+        self.assertEqual(result.series[0].percentiles, {"p50": 20, "p90": 30})
+        self.assertIsNone(result.totals[0].year)
+
+    def test_get_price_stats_not_found(self):
+        self.repository.get_price_stats.return_value = None
 
         with self.assertRaises(exceptions.BooksArentNotFound):
-            self.service.get_average_price_by_year(2020)
+            self.service.get_price_stats(input_dto.PriceStatsInputDTO(year=2020))
+
+
+class TestAsyncBookService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.repository = AsyncMock()
+        self.service = AsyncBookService(repository=self.repository)
+
+    @patch("books.application.services.mappers.map_books_to_output_dto")
+    async def test_list_books(self, mock_mapper):
+        mapped = [_book_output_dto("1")]
+        self.repository.count_books.return_value = 1
+        self.repository.list_books.return_value = ["book1"]
+        mock_mapper.return_value = mapped
+
+        result = await self.service.list_books(input_dto.ListBooksInputDTO())
+
+        self.repository.list_books.assert_awaited_once()
+        self.assertEqual(result.count, 1)
+        self.assertEqual(result.results, mapped)
+
+    async def test_get_book_not_found(self):
+        self.repository.get_book.return_value = None
+
+        with self.assertRaises(exceptions.BookNotFoundError):
+            await self.service.get_book("1")
+
+    async def test_delete_book_not_found(self):
+        self.repository.delete_book.return_value = False
+
+        with self.assertRaises(exceptions.BookNotFoundError):
+            await self.service.delete_book("1")
+
+
+def _without_sort(method):
+    # pymongo 4.15 passes sort= to the bulk builder; mongomock does not take it.
+    def add(self, *args, sort=None, **kwargs):
+        return method(self, *args, **kwargs)
+
+    return add
+
+
+class TestMongoBookRepository(unittest.TestCase):
+    """The repository against mongomock, indexes included."""
+
+    def setUp(self):
+        mongodb._reset_after_fork()
+        self.addCleanup(mongodb._reset_after_fork)
+        client = mongomock.MongoClient()
+        for target, name, new in [
+            (mongodb, "MongoClient", lambda *args, **kwargs: client),
+            *(
+                (
+                    BulkOperationBuilder,
+                    name,
+                    _without_sort(getattr(BulkOperationBuilder, name)),
+                )
+                for name in ("add_update", "add_replace")
+            ),
+        ]:
+            patcher = patch.object(target, name, new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.repository = MongoBookRepository()
+        self.books = self.repository.collection
+        self.tombstones = self.repository.tombstones_collection
+
+    def _book(self, title, price=10.0, genre="Novela"):
+        return Book(
+            title=title,
+            author="Autor",
+            published_date=datetime(2001, 5, 1),
+            genre=genre,
+            price=price,
+        )
+
+    def _stats(self, genre="Novela"):
+        return self.repository.get_price_stats(PriceStatsDimension.GENRE, genre)
+
+    def test_create_book_rejects_a_duplicate_title(self):
+        service = BookService(self.repository)
+        dto = input_dto.CreateBookInputDTO(**self._book("A").model_dump())
+        service.create_book(dto)
+
+        with self.assertRaises(exceptions.BookAlreadyExistsError):
+            service.create_book(dto)
+
+        self.assertEqual(self.repository.get_version(), 1)
+        self.assertEqual(self._stats().count, 1)
+
+    def test_bulk_create_reports_each_book(self):
+        self.repository.create_book(self._book("A"))
+
+        results = self.repository.bulk_create(
+            [self._book("B", 20), self._book("A"), self._book("C", 30)]
+        )
+
+        self.assertEqual(
+            [result.status for result in results],
+            [
+                BulkItemStatus.CREATED,
+                BulkItemStatus.DUPLICATE_TITLE,
+                BulkItemStatus.CREATED,
+            ],
+        )
+        self.assertEqual(self.books.count_documents({}), 3)
+        stats = self._stats()
+        self.assertEqual((stats.count, stats.total), (3, 60))
+
+    def test_bulk_update_reports_missing_and_duplicate_titles(self):
+        a = self.repository.create_book(self._book("A"))
+        b = self.repository.create_book(self._book("B"))
+
+        results = self.repository.bulk_update(
+            [
+                {"id": a.id, "price": 15.0},
+                {"id": b.id, "title": "A"},
+                {"id": "nope", "price": 1.0},
+            ]
+        )
+
+        self.assertEqual(
+            [result.status for result in results],
+            [
+                BulkItemStatus.UPDATED,
+                BulkItemStatus.DUPLICATE_TITLE,
+                BulkItemStatus.NOT_FOUND,
+            ],
+        )
+        self.assertEqual(self.repository.get_book(a.id).version, 2)
+        self.assertEqual(self.repository.get_book(b.id).title, "B")
+        self.assertEqual(self._stats().total, 25)
+
+    def test_conditional_update_checks_the_version(self):
+        book = self.repository.create_book(self._book("A"))
+
+        updated = self.repository.update_book({"id": book.id, "price": 12.0}, 1)
+        with self.assertRaises(exceptions.BookVersionMismatchError):
+            self.repository.update_book({"id": book.id, "price": 13.0}, 1)
+        with self.assertRaises(exceptions.BookVersionMismatchError):
+            self.repository.delete_book(book.id, 1)
+
+        self.assertEqual((updated.version, updated.price), (2, 12.0))
+        self.assertEqual(self.repository.get_book(book.id).price, 12.0)
+        self.assertIsNone(
+            self.repository.update_book({"id": str(ObjectId()), "price": 1.0}, 1)
+        )
+
+    def test_bulk_delete_reports_only_the_books_it_removed(self):
+        a = self.repository.create_book(self._book("A"))
+        b = self.repository.create_book(self._book("B", 30))
+        missing = str(ObjectId())
+
+        results = self.repository.bulk_delete([a.id, "nope", a.id, missing, b.id])
+
+        self.assertEqual(
+            [result.status for result in results],
+            [
+                BulkItemStatus.DELETED,
+                BulkItemStatus.NOT_FOUND,
+                BulkItemStatus.NOT_FOUND,
+                BulkItemStatus.NOT_FOUND,
+                BulkItemStatus.DELETED,
+            ],
+        )
+        self.assertEqual(
+            {doc["_id"] for doc in self.tombstones.find()},
+            {ObjectId(a.id), ObjectId(b.id)},
+        )
+        self.assertIsNone(self._stats())
+        self.assertEqual(self.repository.bulk_delete([a.id])[0].status, "not_found")
+
+    def test_changes_merge_books_and_tombstones(self):
+        clock = (datetime(2024, 1, 1, 0, 0, second) for second in range(60))
+        with patch.object(documents, "now", side_effect=clock):
+            a = self.repository.create_book(self._book("A"))
+            b = self.repository.create_book(self._book("B"))
+            self.repository.delete_book(a.id)
+
+        changes = list(
+            self.repository.iter_changes(
+                BookChangesQuery(until=datetime(2100, 1, 1), batch_size=10)
+            )
+        )
+
+        self.assertEqual(
+            [(change.type, change.id) for change in changes],
+            [("upsert", b.id), ("delete", a.id)],
+        )
+
+
+class TestAsyncMongoBookRepository(unittest.IsolatedAsyncioTestCase):
+    @patch.object(mongodb, "ensure_indexes_async", new_callable=AsyncMock)
+    @patch.object(mongodb, "get_async_mongo_collection")
+    async def test_tombstones_collection_is_indexed(self, get_collection, ensure):
+        collection = await AsyncMongoBookRepository().get_tombstones_collection()
+
+        self.assertIs(collection, get_collection.return_value)
+        ensure.assert_awaited_once_with(collection, BOOK_TOMBSTONE_INDEXES)
+
+
+class TestPriceStats(unittest.TestCase):
+    def test_build_deltas_groups_by_year_and_genre(self):
+        docs = [
+            {"price": 10, "published_date": datetime(2020, 5, 1), "genre": "AI"},
+            {"price": 30, "published_date": datetime(2020, 1, 31), "genre": "DB"},
+            {"price": None, "published_date": datetime(2020, 1, 31), "genre": "AI"},
+            {"price": 99, "published_date": "2020-01-31"},
+        ]
+
+        deltas = price_stats.build_deltas(docs)
+
+        year = deltas[(PriceStatsDimension.YEAR, 2020)]
+        self.assertEqual((year.count, year.total), (2, 40))
+        self.assertNotIn((PriceStatsDimension.GENRE, None), deltas)
+        self.assertEqual((year.min_price, year.max_price), (10, 30))
+        self.assertEqual(deltas[(PriceStatsDimension.GENRE, "AI")].count, 1)
+
+    def test_removing_an_extremum_needs_recompute(self):
+        delta = price_stats.GroupDelta()
+        delta.add(10)
+        stats_doc = {"count": 3, "min_price": 10, "max_price": 50}
+
+        self.assertTrue(price_stats.needs_recompute(stats_doc, delta))
+        self.assertFalse(
+            price_stats.needs_recompute({**stats_doc, "min_price": 5}, delta)
+        )
+        self.assertTrue(price_stats.needs_recompute({**stats_doc, "count": 0}, delta))
+
+
+class TestBookSearch(unittest.TestCase):
+    def test_documents_store_normalized_title_and_author(self):
+        doc = documents.to_document(
+            Book(title="  Cien Años  de Soledad", author="Gabriel García Márquez")
+        )
+
+        self.assertEqual(doc["title_normalized"], "cien anos de soledad")
+        self.assertEqual(doc["author_normalized"], "gabriel garcia marquez")
+        self.assertEqual(
+            documents.build_update({"id": "1", "price": 5}).keys(),
+            {"price", "updated_at"},
+        )
+
+    def test_prefix_branch_is_anchored_and_escaped(self):
+        query = BookSearchQuery(text="C++ Avanzádo", mode=BookSearchMode.PREFIX)
+
+        self.assertEqual(
+            search.build_prefix_branch("title_normalized", query),
+            {"title_normalized": {"$regex": r"^c\+\+\ avanzado"}},
+        )
+
+    def test_merge_prefix_matches_pages_without_duplicates(self):
+        branches = {
+            "title_normalized": [
+                {"_id": 1, "title_normalized": "gabo"},
+                {"_id": 2, "title_normalized": "gato"},
+            ],
+            "author_normalized": [
+                {"_id": 3, "author_normalized": "gabriel"},
+                {"_id": 1, "author_normalized": "gaby"},
+            ],
+        }
+
+        self.assertEqual(
+            [doc["_id"] for doc in search.merge_prefix_matches(branches, 0, 2)],
+            [1, 3],
+        )
+        self.assertEqual(
+            [doc["_id"] for doc in search.merge_prefix_matches(branches, 2, 2)], [2]
+        )
+
+
+class TestBookChanges(unittest.TestCase):
+    def test_position_with_id_resumes_right_after_it(self):
+        since, until = datetime(2024, 1, 1), datetime(2024, 2, 1)
+        book_id = "64b7f0c2a1b2c3d4e5f60718"
+
+        self.assertEqual(
+            queries.build_changes_filter(
+                BookChangesQuery(since=since, until=until), "updated_at"
+            ),
+            {"updated_at": {"$gte": since, "$lte": until}},
+        )
+        self.assertEqual(
+            queries.build_changes_filter(
+                BookChangesQuery(since=since, after_id=book_id, until=until),
+                "deleted_at",
+            ),
+            {
+                "$and": [
+                    {"deleted_at": {"$lte": until}},
+                    {
+                        "$or": [
+                            {"deleted_at": {"$gt": since}},
+                            {"deleted_at": since, "_id": {"$gt": ObjectId(book_id)}},
+                        ]
+                    },
+                ]
+            },
+        )
+
+    def test_stream_ends_with_a_token_after_the_last_change(self):
+        change = output_dto.BookChangeOutputDTO(
+            type="delete",
+            id="64b7f0c2a1b2c3d4e5f60718",
+            changed_at=datetime(2024, 1, 2),
+        )
+
+        lines = b"".join(exporters.changes_chunks([change], None, None)).splitlines()
+
+        self.assertEqual(len(lines), 2)
+        token = json.loads(lines[-1])["resume_token"]
+        self.assertEqual(
+            exporters.decode_resume_token(token),
+            (datetime(2024, 1, 2), "64b7f0c2a1b2c3d4e5f60718"),
+        )
+        with self.assertRaises(ValueError):
+            exporters.decode_resume_token("not-a-token")
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.index.build(
+            [
+                ("1", "Cien años de soledad", "Gabriel García Márquez"),
+                ("2", "Gabo y yo", "Zeta"),
+                ("3", "Ficciones", "Jorge Luis Borges"),
+            ]
+        )
+
+    def test_search_matches_titles_and_authors_by_normalized_prefix(self):
+        self.assertEqual(
+            [book_id for book_id, *_ in self.index.search("GA", 10)], ["2", "1"]
+        )
+        self.assertEqual(
+            self.index.search("cien AÑ", 10)[0][1:],
+            (
+                "Cien años de soledad",
+                "Gabriel García Márquez",
+            ),
+        )
+        self.assertEqual(len(self.index.search("", 2)), 2)
+
+    def test_writes_replace_and_remove_keys(self):
+        self.index.add("3", "Gatos", "Jorge Luis Borges")
+        self.index.remove("2")
+
+        self.assertEqual([r[0] for r in self.index.search("ga", 10)], ["1", "3"])
+        self.assertEqual(self.index.search("ficc", 10), [])
+
+    def test_writes_made_during_a_build_are_replayed(self):
+        def suggestions():
+            yield ("1", "Cien años de soledad", "Gabriel García Márquez")
+            self.index.remove("1")
+            self.index.add("4", "Gatopardo", "Lampedusa")
+
+        self.index.build(suggestions())
+
+        self.assertEqual([r[0] for r in self.index.search("ga", 10)], ["4"])
+        self.assertEqual(len(self.index), 1)
+
+
+class TestAutocompleteBookRepository(unittest.TestCase):
+    def setUp(self):
+        self.inner = MagicMock()
+        self.index = PrefixIndex()
+        self.repository = AutocompleteBookRepository(
+            self.inner, self.index, refresh_interval=60
+        )
+
+    def test_falls_back_to_the_wrapped_repository_until_built(self):
+        with patch.object(self.repository, "start") as start:
+            self.repository.suggest_books("ga", 5)
+
+        start.assert_called_once()
+        self.inner.suggest_books.assert_called_once_with("ga", 5)
+
+    def test_writes_keep_the_index_current(self):
+        self.index.build([])
+        self.inner.create_book.side_effect = lambda book: book.model_copy(
+            update={"id": "1"}
+        )
+
+        self.repository.create_book(Book(title="Gatopardo", author="Lampedusa"))
+
+        self.assertEqual(
+            self.repository.suggest_books("lamp", 5),
+            [Book(id="1", title="Gatopardo", author="Lampedusa")],
+        )
+        self.inner.suggest_books.assert_not_called()
+
+
+class TestAsyncAutocompleteBookRepository(unittest.IsolatedAsyncioTestCase):
+    async def test_async_writes_keep_the_index_current(self):
+        index = PrefixIndex()
+        index.build([("1", "Gatopardo", "Lampedusa")])
+        inner = AsyncMock()
+        inner.create_book.side_effect = lambda book: book.model_copy(update={"id": "2"})
+        inner.update_book.return_value = Book(id="1", title="El gatopardo")
+        inner.delete_book.return_value = True
+        repository = AsyncAutocompleteBookRepository(inner, index)
+
+        await repository.create_book(Book(title="Rayuela", author="Cortázar"))
+        await repository.update_book({"id": "1", "title": "El gatopardo"})
+
+        self.assertEqual(index.search("cort", 5), [("2", "Rayuela", "Cortázar")])
+        self.assertEqual(index.search("el gato", 5), [("1", "El gatopardo", None)])
+        await repository.delete_book("2")
+        self.assertEqual(index.search("cort", 5), [])
+
+
+class TestLRUTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.cache = LRUTTLCache(max_entries=2, ttl=10, clock=lambda: self.now)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.stats.evictions, 1)
+
+    def test_expires_entries_after_ttl(self):
+        self.cache.set("a", 1)
+        self.now = 10
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats.expirations, 1)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_set_is_skipped_after_concurrent_invalidation(self):
+        generation = self.cache.generation
+        self.cache.delete("a")
+        self.cache.set("a", "stale", generation=generation)
+
+        self.assertIsNone(self.cache.get("a"))
+
+
+class TestCachedBookRepository(unittest.TestCase):
+    def setUp(self):
+        self.inner = MagicMock()
+        self.shared = MagicMock()
+        self.shared.get.return_value = None
+        self.shared.get_many.return_value = {}
+        self.repository = CachedBookRepository(
+            self.inner, local=LRUTTLCache(max_entries=10, ttl=60), shared=self.shared
+        )
+
+    def test_get_book_reads_through_once(self):
+        self.inner.get_book.return_value = "book"
+
+        self.assertEqual(self.repository.get_book("1"), "book")
+        self.assertEqual(self.repository.get_book("1"), "book")
+
+        self.inner.get_book.assert_called_once_with("1")
+        self.shared.set.assert_called_once_with("books:book:1", "book", None)
+        stats = self.repository.stats()
+        self.assertEqual((stats["local"]["hits"], stats["local"]["misses"]), (1, 1))
+
+    def test_get_book_uses_shared_tier(self):
+        self.shared.get.return_value = "book"
+
+        self.assertEqual(self.repository.get_book("1"), "book")
+
+        self.inner.get_book.assert_not_called()
+
+    def test_get_books_only_fetches_uncached_ids(self):
+        self.inner.get_book.return_value = SimpleNamespace(id="1")
+        self.repository.get_book("1")
+        self.inner.get_books.return_value = [SimpleNamespace(id="2")]
+
+        books = self.repository.get_books(["1", "2", "3"])
+
+        self.inner.get_books.assert_called_once_with(["2", "3"])
+        self.assertEqual([book.id for book in books], ["1", "2"])
+        self.assertEqual(self.repository.get_books(["2"])[0].id, "2")
+        self.inner.get_books.assert_called_once()
+
+    def test_partial_book_is_not_cached(self):
+        self.inner.get_book.return_value = "partial"
+
+        self.assertEqual(self.repository.get_book("1", ["title"]), "partial")
+
+        self.inner.get_book.assert_called_once_with("1", ["title"])
+        self.shared.set.assert_not_called()
+        self.assertEqual(len(self.repository.local), 0)
+
+    def test_missing_book_is_not_cached(self):
+        self.inner.get_book.return_value = None
+
+        self.repository.get_book("1")
+        self.repository.get_book("1")
+
+        self.assertEqual(self.inner.get_book.call_count, 2)
+
+    def test_writes_invalidate_both_tiers(self):
+        self.inner.get_book.return_value = "book"
+        self.repository.get_book("1")
+        self.repository.get_book("2")
+        self.inner.bulk_delete.return_value = [
+            BulkItemResult(index=0, status=BulkItemStatus.DELETED, id="2")
+        ]
+
+        self.repository.update_book({"id": "1", "title": "New"})
+        self.repository.bulk_delete(["2"])
+        self.repository.get_book("1")
+
+        self.shared.delete_many.assert_any_call(["books:book:1"])
+        self.shared.delete_many.assert_any_call(["books:book:2"])
+        self.assertEqual(self.inner.get_book.call_count, 3)
+
+    def test_version_mismatch_drops_the_stale_book(self):
+        self.inner.get_book.return_value = "book"
+        self.repository.get_book("1")
+        self.inner.update_book.side_effect = exceptions.BookVersionMismatchError(
+            book_id="1"
+        )
+
+        with self.assertRaises(exceptions.BookVersionMismatchError):
+            self.repository.update_book({"id": "1", "title": "New"}, 3)
+        self.repository.get_book("1")
+
+        self.assertEqual(self.inner.get_book.call_count, 2)
+
+
+class TestAsyncCachedBookRepository(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        local = LRUTTLCache(max_entries=10, ttl=60)
+        self.inner = MagicMock()
+        self.inner.get_book.return_value = "book"
+        self.async_inner = AsyncMock()
+        self.shared = MagicMock()
+        self.shared.get.return_value = None
+        self.shared.aget = AsyncMock(return_value=None)
+        self.shared.adelete_many = AsyncMock()
+        self.repository = CachedBookRepository(
+            self.inner, local=local, shared=self.shared
+        )
+        self.async_repository = AsyncCachedBookRepository(
+            self.async_inner, local=local, shared=self.shared
+        )
+
+    async def test_reads_the_cache_of_the_sync_path(self):
+        self.repository.get_book("1")
+
+        self.assertEqual(await self.async_repository.get_book("1"), "book")
+
+        self.async_inner.get_book.assert_not_called()
+
+    async def test_async_write_evicts_the_cached_book(self):
+        self.repository.get_book("1")
+        self.repository.get_book("2")
+
+        await self.async_repository.update_book({"id": "1", "title": "New"})
+        await self.async_repository.delete_book("2")
+        self.repository.get_book("1")
+        self.repository.get_book("2")
+
+        self.shared.adelete_many.assert_any_await(["books:book:1"])
+        self.shared.adelete_many.assert_any_await(["books:book:2"])
+        self.assertEqual(self.inner.get_book.call_count, 4)
+
+    async def test_failed_async_write_drops_the_stale_book(self):
+        self.repository.get_book("1")
+        self.async_inner.delete_book.side_effect = exceptions.BookVersionMismatchError(
+            book_id="1"
+        )
+
+        with self.assertRaises(exceptions.BookVersionMismatchError):
+            await self.async_repository.delete_book("1", 3)
+        self.repository.get_book("1")
+
+        self.assertEqual(self.inner.get_book.call_count, 2)
+
+
+def _cursor(position) -> str:
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+@patch("books.interfaces.dependencies.get_idempotency_store")
+@patch("books.interfaces.dependencies.get_book_service")
+class TestCursorPagination(unittest.TestCase):
+    book_id = "64b7f0c2a1b2c3d4e5f60718"
+
+    def _get(self, service, query):
+        service.return_value.get_version.return_value = 1
+        service.return_value.list_books_by_cursor.return_value = (
+            output_dto.BookCursorPageOutputDTO(results=[])
+        )
+        request = APIRequestFactory().get("/api/books/", query)
+        force_authenticate(request, user=SimpleNamespace(is_authenticated=True))
+        return BookListCreateAPIView.as_view()(request)
+
+    def test_cursor_resumes_at_its_position(self, service, _store):
+        position = {"s": "price", "v": 9.5, "i": self.book_id, "b": True}
+
+        response = self._get(service, {"sort": "price", "cursor": _cursor(position)})
+
+        self.assertEqual(response.status_code, 200)
+        dto = service.return_value.list_books_by_cursor.call_args.args[0]
+        self.assertEqual((dto.cursor.sort_value, dto.cursor.id), (9.5, self.book_id))
+        self.assertTrue(dto.backwards)
+
+    def test_tampered_cursor_is_not_found(self, service, _store):
+        tampered = [
+            ("id", {"s": "id", "v": None, "i": {"$gt": ""}, "b": False}),
+            ("id", {"s": "id", "v": None, "i": "not-an-id", "b": False}),
+            ("id", {"s": "id", "v": "x", "i": self.book_id, "b": False}),
+            ("title", {"s": "title", "v": {"$ne": None}, "i": self.book_id, "b": 0}),
+            (
+                "title",
+                {"s": "title", "v": {"$ne": None}, "i": self.book_id, "b": False},
+            ),
+            ("price", {"s": "price", "v": "9", "i": self.book_id, "b": False}),
+            ("price", {"s": "price", "v": True, "i": self.book_id, "b": False}),
+            ("price", {"s": "price", "v": 9, "i": self.book_id, "b": "yes"}),
+            ("price", {"s": "title", "v": 9, "i": self.book_id, "b": False}),
+            ("id", ["id", None, self.book_id, False]),
+        ]
+        for sort, position in tampered:
+            with self.subTest(position=position):
+                response = self._get(
+                    service, {"sort": sort, "cursor": _cursor(position)}
+                )
+
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.data["detail"], "Cursor inválido.")
+        service.return_value.list_books_by_cursor.assert_not_called()
+
+
+class TestConditionalRequests(unittest.TestCase):
+    def setUp(self):
+        self.view = SimpleNamespace(service=MagicMock())
+        self.view.service.get_version.return_value = 7
+        self.handler = MagicMock(return_value=Response({"id": "1"}))
+        self.get = conditional_get(self.handler)
+
+    def _request(self, **headers):
+        return SimpleNamespace(
+            headers=headers,
+            accepted_renderer=SimpleNamespace(format="json"),
+            get_full_path=lambda: "/api/books/?page=2",
+        )
+
+    def test_tags_the_response_with_the_version(self):
+        response = self.get(self.view, self._request())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], build_etag(self._request(), 7))
+
+    def test_matching_etag_skips_the_handler(self):
+        etag = build_etag(self._request(), 7)
+
+        response = self.get(self.view, self._request(**{"If-None-Match": etag}))
+
+        self.assertEqual(response.status_code, 304)
+        self.handler.assert_not_called()
+
+    def test_a_write_changes_the_etag(self):
+        etag = build_etag(self._request(), 6)
+
+        response = self.get(self.view, self._request(**{"If-None-Match": etag}))
+
+        self.assertEqual(response.status_code, 200)
+        self.handler.assert_called_once()
+
+    def test_if_match_carries_the_book_version(self):
+        self.assertIsNone(expected_version(self._request(), "1"))
+        self.assertIsNone(expected_version(self._request(**{"If-Match": "*"}), "1"))
+        self.assertEqual(
+            expected_version(self._request(**{"If-Match": 'W/"3"'}), "1"), 3
+        )
+
+    def test_each_representation_of_a_book_has_its_own_tag(self):
+        book = _book_output_dto("1").model_copy(update={"version": 3})
+        partial = output_dto.partial_book_output_dto(frozenset({"title"}))(
+            id="1", version=3, title="Book 1"
+        )
+        browsable = self._request()
+        browsable.accepted_renderer = SimpleNamespace(format="api")
+
+        tags = {
+            build_book_etag(self._request(), book),
+            build_book_etag(self._request(), partial),
+            build_book_etag(browsable, book),
+        }
+
+        self.assertEqual(len(tags), 3)
+        for tag in tags:
+            self.assertEqual(
+                expected_version(self._request(**{"If-Match": tag}), "1"), 3
+            )
+
+    def test_book_tag_matches_only_its_representation(self):
+        book = _book_output_dto("1").model_copy(update={"version": 3})
+        etag = build_book_etag(self._request(), book)
+        request = self._request(**{"If-None-Match": etag})
+        request.method = "GET"
+
+        self.assertEqual(book_response(request, book).status_code, 304)
+        partial = output_dto.partial_book_output_dto(frozenset({"title"}))(
+            id="1", version=3, title="Book 1"
+        )
+        self.assertEqual(book_response(request, partial).status_code, 200)
+
+    def test_unknown_if_match_tag_fails_the_precondition(self):
+        with self.assertRaises(exceptions.BookVersionMismatchError):
+            expected_version(self._request(**{"If-Match": '"abc"'}), "1")
+
+    def test_conditional_write_filters_on_the_version(self):
+        book_id = "64b7f0c2a1b2c3d4e5f60718"
+
+        self.assertEqual(documents.by_id(book_id), {"_id": ObjectId(book_id)})
+        self.assertEqual(
+            documents.by_id(book_id, 4), {"_id": ObjectId(book_id), "version": 4}
+        )
+
+
+class TestIdempotentCreate(unittest.TestCase):
+    def setUp(self):
+        self.view = SimpleNamespace(idempotency_store=MagicMock())
+        self.handler = MagicMock(return_value=Response({"id": "1"}, status=201))
+        self.post = idempotent(self.handler)
+
+    def _request(self, data, key="k1"):
+        return SimpleNamespace(
+            headers={"Idempotency-Key": key},
+            data=data,
+            user=SimpleNamespace(pk=7),
+            method="POST",
+            path="/api/books/",
+        )
+
+    def test_first_request_runs_and_stores_the_response(self):
+        self.view.idempotency_store.reserve.return_value = None
+
+        response = self.post(self.view, self._request({"title": "A"}))
+
+        self.assertEqual(response.status_code, 201)
+        self.handler.assert_called_once()
+        self.view.idempotency_store.complete.assert_called_once_with(
+            "7:POST:/api/books/:k1", 201, {"id": "1"}
+        )
+
+    def test_retry_replays_the_stored_response(self):
+        self.view.idempotency_store.reserve.return_value = None
+        first = self.post(self.view, self._request({"title": "A"}))
+        fingerprint = self.view.idempotency_store.reserve.call_args.args[1]
+        self.view.idempotency_store.reserve.return_value = IdempotencyRecord(
+            fingerprint=fingerprint, status_code=201, body={"id": "1"}
+        )
+
+        retry = self.post(self.view, self._request({"title": "A"}))
+
+        self.assertEqual((retry.status_code, retry.data), (201, first.data))
+        self.handler.assert_called_once()
+        with self.assertRaises(IdempotencyKeyReused):
+            self.post(self.view, self._request({"title": "B"}))
+
+    def test_failed_request_releases_the_key(self):
+        self.view.idempotency_store.reserve.return_value = None
+        self.handler.side_effect = exceptions.BookAlreadyExistsError(title="A")
+
+        with self.assertRaises(exceptions.BookAlreadyExistsError):
+            self.post(self.view, self._request({"title": "A"}))
+
+        self.view.idempotency_store.release.assert_called_once_with(
+            "7:POST:/api/books/:k1"
+        )
+        self.view.idempotency_store.complete.assert_not_called()
+
+
+class TestTokenRevocationList(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.collection = MagicMock()
+        self.collection.find.return_value = [
+            {"_id": "jti:abc"},
+            {"_id": "user:7", "revoked_until": 1000},
+        ]
+        patch.object(
+            mongodb, "get_mongo_collection", return_value=self.collection
+        ).start()
+        patch.object(mongodb, "ensure_indexes").start()
+        self.addCleanup(patch.stopall)
+        self.revocations = TokenRevocationList(
+            refresh_interval=30, clock=lambda: self.now
+        )
+
+    def test_revoked_tokens_and_users(self):
+        self.assertTrue(self.revocations.is_revoked("1", "abc", 2000))
+        self.assertTrue(self.revocations.is_revoked("7", "def", 999))
+        self.assertFalse(self.revocations.is_revoked("7", "def", 1001))
+        self.assertFalse(self.revocations.is_revoked("1", "def", 2000))
+
+    def test_reloads_only_after_the_interval(self):
+        self.revocations.is_revoked("1", "abc", 0)
+        self.collection.find.return_value = []
+
+        self.now = 29
+        self.assertTrue(self.revocations.is_revoked("1", "abc", 0))
+        self.now = 30
+        self.assertFalse(self.revocations.is_revoked("1", "abc", 0))
+        self.assertEqual(self.collection.find.call_count, 2)
+
+    def test_failed_reload_keeps_the_last_snapshot(self):
+        self.revocations.is_revoked("1", "abc", 0)
+        self.collection.find.side_effect = RuntimeError("down")
+        self.now = 30
+
+        with self.assertLogs("books.infraestructure.revocations", "ERROR"):
+            self.assertTrue(self.revocations.is_revoked("1", "abc", 0))
+
+    def test_stateless_authentication_rejects_revoked_tokens(self):
+        token = AccessToken()
+        token["user_id"] = "7"
+        token["iat"] = 999
+        authentication = StatelessJWTAuthentication()
+        with patch(
+            "books.interfaces.dependencies.get_token_revocation_list",
+            return_value=self.revocations,
+        ):
+            with self.assertRaises(AuthenticationFailed):
+                authentication.get_user(token)
+            token["iat"] = 1001
+            self.assertEqual(authentication.get_user(token).id, "7")
+
+
+class TestJSONCodec(unittest.TestCase):
+    def test_renderer_encodes_dtos_dates_and_object_ids(self):
+        book_id = ObjectId()
+        data = {
+            "book": _book_output_dto("1"),
+            "id": book_id,
+            "at": datetime(2024, 1, 2, 3, 4, 5),
+        }
+
+        self.assertEqual(
+            json.loads(PydanticJSONRenderer().render(data)),
+            {
+                "book": _book_output_dto("1").model_dump(mode="json"),
+                "id": str(book_id),
+                "at": "2024-01-02T03:04:05",
+            },
+        )
+
+    def test_parser_matches_the_drf_parser(self):
+        parser = PydanticJSONParser()
+
+        self.assertEqual(
+            parser.parse(io.BytesIO('{"title": "Señor", "price": 1.5}'.encode())),
+            {"title": "Señor", "price": 1.5},
+        )
+        self.assertEqual(
+            parser.parse(
+                io.BytesIO('{"title": "Señor"}'.encode("latin-1")),
+                parser_context={"encoding": "latin-1"},
+            ),
+            {"title": "Señor"},
+        )
+        for body in (b'{"price": NaN}', b"{bad", b""):
+            with self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(body))
+
+
+class TestBookImporter(unittest.TestCase):
+    def setUp(self):
+        self.service = MagicMock()
+        self.service.bulk_create_books.side_effect = lambda dtos: [
+            output_dto.BulkItemOutputDTO(
+                index=i,
+                status="duplicate_title" if dto.title == "Dup" else "created",
+                detail="duplicado" if dto.title == "Dup" else None,
+            )
+            for i, dto in enumerate(dtos)
+        ]
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint_path = Path(directory.name, "feed.checkpoint.json")
+        self.rejects = io.StringIO()
+        self.importer = BookImporter(
+            service=self.service,
+            fmt="ndjson",
+            batch_size=2,
+            workers=2,
+            rejects=self.rejects,
+            checkpoint_path=self.checkpoint_path,
+        )
+
+    def _records(self, *titles):
+        return [
+            (
+                i,
+                json.dumps(
+                    {
+                        "title": title,
+                        "author": "A",
+                        "published_date": "2001-01-01",
+                        "genre": "G",
+                        "price": 1,
+                    }
+                ),
+            )
+            for i, title in enumerate(titles, start=1)
+        ]
+
+    def test_imports_in_batches_and_reports_rejected_records(self):
+        records = self._records("A", "Dup", "B", "C", "D")
+        records[3] = (4, "{bad")
+
+        stats = self.importer.run(records, ImportCheckpoint(source="feed"))
+
+        self.assertEqual((stats.read, stats.inserted, stats.rejected), (5, 3, 2))
+        self.assertEqual(self.service.bulk_create_books.call_count, 3)
+        rejected = [json.loads(line) for line in self.rejects.getvalue().splitlines()]
+        self.assertEqual([reject["record"] for reject in rejected], [2, 4])
+        self.assertEqual(rejected[0]["error"], "duplicado")
+        self.assertEqual(
+            ImportCheckpoint.load(self.checkpoint_path, "feed"),
+            ImportCheckpoint(
+                source="feed", record=5, submitted=5, inserted=3, rejected=2
+            ),
+        )
+
+    def test_records_are_validated_like_the_api(self):
+        records = self._records("A", "T" * 256, "B")
+        records[2] = (3, records[2][1].replace('"2001-01-01"', '"2001-01-01T00:00Z"'))
+
+        stats = self.importer.run(records, ImportCheckpoint(source="feed"))
+
+        self.assertEqual((stats.inserted, stats.rejected), (1, 2))
+        rejected = [json.loads(line) for line in self.rejects.getvalue().splitlines()]
+        self.assertEqual([reject["record"] for reject in rejected], [2, 3])
+        self.assertTrue(rejected[0]["error"].startswith("title: "))
+        self.assertTrue(rejected[1]["error"].startswith("published_date: "))
+
+    def test_resume_skips_completed_batches(self):
+        checkpoint = ImportCheckpoint(source="feed", record=2, submitted=4, inserted=2)
+
+        stats = self.importer.run(
+            self._records("A", "B", "Dup", "C", "Dup"), checkpoint
+        )
+
+        # Record 3 may have been written before the interruption; 5 was not.
+        self.assertEqual(
+            (stats.read, stats.inserted, stats.already_imported, stats.rejected),
+            (3, 1, 1, 1),
+        )
+        self.assertEqual(json.loads(self.rejects.getvalue())["record"], 5)
+        self.assertEqual((checkpoint.record, checkpoint.inserted), (5, 4))
+
+
+class TestCachedSchema(unittest.TestCase):
+    def setUp(self):
+        openapi.get_rendered_schema.cache_clear()
+        self.addCleanup(openapi.get_rendered_schema.cache_clear)
+        self.client = Client()
+
+    def test_schema_is_rendered_once_and_revalidated_by_etag(self):
+        with patch.object(
+            openapi, "render_schema", wraps=openapi.render_schema
+        ) as render_schema:
+            first = self.client.get("/api/schema/", {"format": "json"})
+            again = self.client.get(
+                "/api/schema/", {"format": "json"}, HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+            yaml = self.client.get("/api/schema/")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("openapi", json.loads(first.content))
+        self.assertEqual((again.status_code, again.content), (304, b""))
+        self.assertEqual(again["ETag"], first["ETag"])
+        self.assertNotEqual(yaml["ETag"], first["ETag"])
+        render_schema.assert_called_once()
+
+    def test_serves_the_files_written_by_build_schema(self):
+        with tempfile.TemporaryDirectory() as directory:
+            call_command("build_schema", output_dir=directory, stdout=io.StringIO())
+            Path(directory, "schema.yaml").write_bytes(b"openapi: 3.0.3\n")
+
+            with override_settings(BOOKS_SCHEMA_DIR=directory):
+                response = self.client.get("/api/schema/")
+
+        self.assertEqual(response.content, b"openapi: 3.0.3\n")
+
+
+@patch(
+    "books.infraestructure.mongodb.settings",
+    SimpleNamespace(
+        MONGO_URI="mongodb://test:27017",
+        MONGO_DB_NAME="test",
+        MONGO_CLIENT_OPTIONS={"maxPoolSize": 5},
+    ),
+)
+@patch("books.infraestructure.mongodb.AsyncMongoClient")
+class TestAsyncMongoClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        mongodb._reset_after_fork()
+
+    def tearDown(self):
+        mongodb._reset_after_fork()
+
+    def test_client_is_shared_across_event_loops(self, mock_client):
+        async def get_client():
+            return mongodb.get_async_mongo_client()
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+
+        self.assertIs(first, second)
+        mock_client.assert_called_once_with(
+            "mongodb://test:27017", connect=False, maxPoolSize=5
+        )
+
+    async def test_indexes_are_created_once_per_process(self, mock_client):
+        collection = MagicMock(create_indexes=AsyncMock())
+        collection.name = "books"
+
+        await mongodb.ensure_indexes_async(collection, ["index"])
+        await mongodb.ensure_indexes_async(collection, ["index"])
+
+        collection.create_indexes.assert_awaited_once_with(["index"])
+
+    async def test_lifespan_opens_and_closes_the_client(self, mock_client):
+        mock_client.return_value.close = AsyncMock()
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        app = with_lifespan(AsyncMock())
+        await app({"type": "lifespan"}, receive, send)
+
+        self.assertEqual(
+            sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        )
+        mock_client.return_value.close.assert_awaited_once()
+        self.assertIsNone(mongodb._async_client)
+
+    @override_settings(BOOKS_AUTOCOMPLETE_ENABLED=True, BOOKS_CACHE_ENABLED=False)
+    async def test_only_serving_processes_build_the_autocomplete_index(
+        self, mock_client
+    ):
+        mock_client.return_value.close = AsyncMock()
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+
+        async def receive():
+            return next(messages)
+
+        dependencies.get_book_repository.cache_clear()
+        dependencies.get_autocomplete_book_repository.cache_clear()
+        self.addCleanup(dependencies.get_book_repository.cache_clear)
+        self.addCleanup(dependencies.get_autocomplete_book_repository.cache_clear)
+        with patch.object(AutocompleteBookRepository, "start") as start:
+            # What a management command resolves.
+            dependencies.get_book_repository()
+            start.assert_not_called()
+
+            await with_lifespan(AsyncMock())({"type": "lifespan"}, receive, AsyncMock())
+
+        start.assert_called_once()
+
+
+@patch(
+    "books.infraestructure.mongodb.settings",
+    SimpleNamespace(
+        MONGO_URI="mongodb://test:27017",
+        MONGO_DB_NAME="test",
+        MONGO_CLIENT_OPTIONS={"maxPoolSize": 5},
+    ),
+)
+@patch("books.infraestructure.mongodb.MongoClient")
+class TestMongoClientRegistry(unittest.TestCase):
+    def setUp(self):
+        mongodb._reset_after_fork()
+
+    def tearDown(self):
+        mongodb._reset_after_fork()
+
+    def test_client_is_shared_within_process(self, mock_client):
+        first = mongodb.get_mongo_client()
+        second = mongodb.get_mongo_client()
+
+        self.assertIs(first, second)
+        mock_client.assert_called_once_with(
+            "mongodb://test:27017", connect=False, maxPoolSize=5
+        )
+
+    def test_client_is_recreated_after_fork(self, mock_client):
+        mongodb.get_mongo_client()
+
+        with patch("books.infraestructure.mongodb.os.getpid", return_value=-1):
+            mongodb.get_mongo_client()
+
+        self.assertEqual(mock_client.call_count, 2)
+
+    def test_indexes_are_created_once(self, mock_client):
+        collection = MagicMock()
+        collection.name = "books"
+
+        mongodb.ensure_indexes(collection, ["index"])
+        mongodb.ensure_indexes(collection, ["index"])
+
+        collection.create_indexes.assert_called_once_with(["index"])
 
 
 if __name__ == "__main__":